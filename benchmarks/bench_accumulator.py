@@ -0,0 +1,48 @@
+#Frames of decoded points: concatenating decoded batches per frame against decoding into preallocated ring
+#Run from repo root: python -m benchmarks.bench_accumulator
+#std
+import timeit
+#proj
+from pylivox import data, points
+from pylivox.accumulator import FrameAccumulator
+from pylivox.control.frame import DeviceType
+
+NUMBER = 5
+WINDOW = 100000000 #ns
+
+
+def concatenated(batches:list)->list:
+    frames = []
+    pending = []
+    for batch in batches:
+        pending.append(points.decode(batch, DeviceType.HORIZON))
+        if len(pending) == 10:
+            frames.append(points.PointCloud.concatenate(pending))
+            pending = []
+    return frames
+
+
+def accumulated(accumulator:FrameAccumulator, batches:list)->list:
+    frames = []
+    for batch in batches:
+        frames += accumulator.append_packets(batch, DeviceType.HORIZON)
+    frames.append(accumulator.flush())
+    return frames
+
+
+def main():
+    data_type = data.DataType2
+    period = 1000000000 * data_type.N // data.POINT_RATE[DeviceType.HORIZON]
+    count = data.POINT_RATE[DeviceType.HORIZON] // data_type.N
+    block = data.PacketBlock(data_type, count).fill(0, period, data.default_points(data_type))
+    #10 ms of packets per batch as sent by emulator
+    per_batch = count // 100
+    batches = [bytes(block.buffer[i * per_batch * data_type.PACKET_LENGTH:(i + 1) * per_batch * data_type.PACKET_LENGTH]) for i in range(100)]
+    accumulator = FrameAccumulator.for_device(DeviceType.HORIZON, WINDOW)
+    joined = timeit.timeit(lambda: concatenated(batches), number=NUMBER) / NUMBER
+    ring = timeit.timeit(lambda: accumulated(accumulator, batches), number=NUMBER) / NUMBER
+    print(f'1 s of Horizon in 100 batches: decode + concatenate {joined * 1e3:7.2f} ms  accumulator {ring * 1e3:7.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+#Construction cost of restricted command with type restriction enabled
+#Run from repo root: python -m benchmarks.bench_capability
+#std
+import timeit
+#proj
+from pylivox.control.frame import DeviceType, set_ignore_type_restriction
+from pylivox.control import general as g
+from pylivox.control import lidar
+
+NUMBER = 200000
+
+
+def main():
+    cases = (
+        ('unrestricted', lambda: g.Handshake('192.168.1.1', 1, 2, 3, 1, DeviceType.MID_40, (3, 7, 0, 0))),
+        ('restricted', lambda: g.RebootDevice(100, 1, DeviceType.MID_40, (3, 7, 0, 0))),
+        ('restricted', lambda: lidar.TurnOnOffRainFogSuppression(True, 1, DeviceType.MID_40, (3, 7, 0, 0))),
+    )
+    for ignore in (True, False):
+        set_ignore_type_restriction(ignore)
+        for name, make in cases:
+            t = min(timeit.repeat(make, number=NUMBER, repeat=5))
+            print(f'ignore={ignore!s:<5} {name:<12} {make().__class__.__name__:<28} {t / NUMBER * 1e9:>6.0f} ns')
+    set_ignore_type_restriction(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#Capture of 1 s of Horizon datagrams: write and fsync per datagram against queued batches of writer thread
+#Run from repo root: python -m benchmarks.bench_capture
+#std
+import os
+import tempfile
+import time
+#proj
+from pylivox import capture, data
+from pylivox.control.frame import DeviceType
+
+
+def legacy_record(path:str, datagrams:list):
+    with open(path, 'ab') as f:
+        for datagram in datagrams:
+            f.write(capture.RECORD_STRUCT.pack(time.time_ns(), len(datagram), 60001, capture.RX))
+            f.write(datagram)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def main():
+    count = data.POINT_RATE[DeviceType.HORIZON] // data.DataType2.N
+    block = data.PacketBlock(data.DataType2, count).fill(0, 400000, data.default_points(data.DataType2))
+    datagrams = list(block)
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        recorder = capture.Recorder(directory)
+        for datagram in datagrams:
+            recorder.record(datagram, 60001)
+        queued = time.perf_counter() - started
+        recorder.close()
+        batched = time.perf_counter() - started
+        started = time.perf_counter()
+        legacy_record(os.path.join(directory, 'legacy'), datagrams[:200])
+        legacy = (time.perf_counter() - started) * len(datagrams) / 200
+        started = time.perf_counter()
+        with capture.CaptureReplay(directory, speed=None) as replay:
+            replayed = replay.play(lambda *record: None)
+        replay_time = time.perf_counter() - started
+    print(f'{len(datagrams)} datagrams: queued {queued * 1e3:7.2f} ms  written {batched * 1e3:7.2f} ms  '
+          f'fsync per datagram ~{legacy * 1e3:8.2f} ms  replay at max speed {replay_time * 1e3:7.2f} ms ({replayed})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#Compare legacy crcmod usage on joined byte strings with incremental, cached and batched CRC
+#Run from repo root: python -m benchmarks.bench_crc
+#std
+import timeit
+#proj
+from pylivox.control.frame import Frame, Crc32, crc_header_cached, frame_spans, verify_frames
+from benchmarks.samples import sample_frames
+
+REPEAT = 200
+
+
+def legacy_verify(frames:'list(bytes)')->'list(bool)':
+    #header crc over sliced header, frame crc over re-joined header + header crc + payload
+    result = []
+    for frame in frames:
+        header, header_crc, payload, frame_crc = frame[0:7], frame[7:9], frame[9:-4], frame[-4:]
+        result.append(Frame.crc_header(header) == int.from_bytes(header_crc, 'little')
+                      and Frame.crc(header + header_crc + payload) == int.from_bytes(frame_crc, 'little'))
+    return result
+
+
+def incremental_verify(frames:'list(bytes)')->'list(bool)':
+    result = []
+    for frame in frames:
+        view = memoryview(frame)
+        crc = Crc32().update(view[0:7]).update(view[7:9]).update(view[9:-4])
+        result.append(crc_header_cached(view) == int.from_bytes(view[7:9], 'little')
+                      and crc.value == int.from_bytes(view[-4:], 'little'))
+    return result
+
+
+def main():
+    frames = [frame.frame for frame in sample_frames()] * REPEAT
+    buffer = b''.join(frames)
+    spans = frame_spans(buffer)
+    assert all(legacy_verify(frames)) and all(incremental_verify(frames)) and all(verify_frames(buffer, spans))
+    count = len(frames)
+    for name, f in (('legacy crcmod on joined bytes', lambda: legacy_verify(frames)),
+                    ('incremental + cached header', lambda: incremental_verify(frames)),
+                    ('batch verify_frames', lambda: verify_frames(buffer, spans)),
+                    ('batch verify_frames + spans', lambda: verify_frames(buffer)),
+                    ):
+        t = min(timeit.repeat(f, number=5, repeat=3)) / 5
+        print(f'{name:<32} {t / count * 1e9:>8.0f} ns/frame {count / t / 1e6:>6.2f} Mframes/s')
+
+
+if __name__ == '__main__':
+    main()
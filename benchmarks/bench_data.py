@@ -0,0 +1,57 @@
+#Point packet generation: legacy per packet struct packing against PacketBlock
+#Run from repo root: python -m benchmarks.bench_data
+#std
+import struct
+import time
+import timeit
+#libs
+import numpy as np
+#proj
+from pylivox import data
+from pylivox.control.frame import DeviceType
+from pylivox.control.lidar import ReturnMode
+
+NUMBER = 20
+
+
+def flat(point)->list:
+    values = []
+    for value in point:
+        if isinstance(value, np.ndarray):
+            value = value.tolist()
+        if isinstance(value, (tuple, list)):
+            values += flat(value)
+        else:
+            values.append(value)
+    return values
+
+
+def legacy_packet(data_type:type, points:list)->bytes:
+    header = struct.pack('<BBBxIBBQ', 5, 1, 1, 0, 0, data_type.TYPE, time.time_ns())
+    return header + b''.join([struct.pack(data_type._PACK_FORMAT, *point) for point in points])
+
+
+def main():
+    for device_type, return_mode in ((DeviceType.MID_40, ReturnMode.SINGLE_RETURN_FIRST),
+                                     (DeviceType.HORIZON, ReturnMode.SINGLE_RETURN_FIRST),
+                                     (DeviceType.HORIZON, ReturnMode.DUAL_RETURN),
+                                     (DeviceType.HORIZON, ReturnMode.TRIPLE_RETURN)):
+        data_type = data.data_type_for(device_type, False, return_mode)
+        rate = data.POINT_RATE[device_type]
+        count = rate // data_type.N
+        points = data.default_points(data_type)
+        point_list = [flat(point) for point in points.tolist()]
+        block = data.PacketBlock(data_type, count)
+        block.fill(0, 0, points)
+        legacy = timeit.timeit(lambda: [legacy_packet(data_type, point_list) for _ in range(count)], number=NUMBER) / NUMBER
+        stamp = timeit.timeit(lambda: block.fill(time.time_ns(), 1000), number=NUMBER) / NUMBER
+        full = timeit.timeit(lambda: block.fill(time.time_ns(), 1000, points), number=NUMBER) / NUMBER
+        clocks = {timestamp_type: data.PacketClock(1000, timestamp_type) for timestamp_type in (data.TimestampType.PTP, data.TimestampType.GPS)}
+        stamps = {timestamp_type.name: timeit.timeit(lambda: block.stamp(clock), number=NUMBER) / NUMBER for timestamp_type, clock in clocks.items()}
+        print(f'{device_type.name:<8} type {data_type.TYPE} 1 s = {count:>4} packets x {data_type.N} points: '
+              f'legacy {legacy * 1e3:7.2f} ms  block stamp {stamp * 1e3:6.3f} ms  block points {full * 1e3:6.3f} ms  '
+              + '  '.join(f'clock {name} {elapsed * 1e3:6.3f} ms' for name, elapsed in stamps.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+#Compare eager FrameFrom decode with lazy FrameView decode
+#Run from repo root: python -m benchmarks.bench_decode
+#std
+import timeit
+#proj
+from pylivox.control.utils import FrameFrom
+from benchmarks.samples import sample_frames
+
+NUMBER = 20000
+
+
+def main():
+    print(f'{"class":<40} {"eager us":>9} {"lazy seq us":>12} {"lazy field us":>14}')
+    for frame in sample_frames():
+        data = frame.frame
+        device_type, device_version = frame.device_type, frame.device_version
+        fields = type(frame)._FIELDS
+        name = fields[0] if fields else 'seq'
+        eager = timeit.timeit(lambda: FrameFrom(data, device_type, device_version), number=NUMBER) / NUMBER * 1e6
+        lazy = timeit.timeit(lambda: FrameFrom(data, device_type, device_version, lazy=True).seq, number=NUMBER) / NUMBER * 1e6
+        lazy_field = timeit.timeit(lambda: getattr(FrameFrom(data, device_type, device_version, lazy=True), name),
+                                   number=NUMBER) / NUMBER * 1e6
+        print(f'{type(frame).__name__:<40} {eager:>9.2f} {lazy:>12.2f} {lazy_field:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+#Compare command dispatch through tuple keyed dict (old TypeDict) with registry table
+#Run from repo root: python -m benchmarks.bench_dispatch
+#std
+import timeit
+#proj
+from pylivox.control.frame import CMD_TABLE, registered_cmds
+import pylivox.control.utils
+
+NUMBER = 2000000
+
+
+def main():
+    type_dict = {(cls.CMD_SET.value, cls.CMD_TYPE.value, cls.CMD_ID.value): cls for cls in registered_cmds()}
+    baseline = min(timeit.repeat(lambda: None, number=NUMBER, repeat=5))
+    for name, (cmd_set, cmd_type, cmd_id) in (('hit', (1, 1, 6)), ('miss', (2, 0, 0x30)), ('garbage', (0xFF, 0x7F, 0xFF))):
+        by_dict = min(timeit.repeat(lambda: type_dict.get((cmd_set, cmd_type, cmd_id)), number=NUMBER, repeat=5))
+        by_table = min(timeit.repeat(lambda: CMD_TABLE[cmd_set][cmd_type][cmd_id], number=NUMBER, repeat=5))
+        print(f'{name:<8} dict {(by_dict - baseline) / NUMBER * 1e9:>6.0f} ns  '
+              f'table {(by_table - baseline) / NUMBER * 1e9:>6.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#Compare legacy property based frame build with single pass Frame.encode_into
+#Run from repo root: python -m benchmarks.bench_encode
+#std
+import struct
+import timeit
+#libs
+import crcmod
+#proj
+from pylivox.control import general as g
+from pylivox.control.frame import DeviceType, Frame
+from benchmarks.samples import sample_frames
+
+NUMBER = 20000
+
+#Copy of frame build before encode_into: every property packs payload again with format parsed
+#by struct.pack, header is rebuilt for both CRCs and frame is concatenated from the parts
+crc32 = crcmod.mkCrcFun(0x104C11DB7, rev=True, initCrc=0x564F580A, xorOut=0xFFFFFFFF)
+crc16 = crcmod.mkCrcFun(0x11021, rev=True, initCrc=0x4C49)
+
+
+def legacy_cmd_payload(frame:Frame, payload_body:bytes)->bytes:
+    format = f'<BB{len(payload_body)}B' #CMD_SET, CMD_ID, BODY
+    return struct.pack(format, frame.CMD_SET.value, frame.CMD_ID.value, *payload_body)
+
+
+def _param_payload(param:g.ConfigurationParameter)->bytes:
+    return struct.pack('<HHB', param.key.value, param.length, param.value)
+
+
+def _full_ip(frame:Frame)->bool:
+    return ((frame.device_type == DeviceType.HORIZON and frame.device_version >= (6, 4, 0, 0)) or
+            (frame.device_type == DeviceType.TELE_15 and frame.device_version >= (7, 3, 0, 0)) or
+            (frame.device_type == DeviceType.MID_70 and frame.device_version >= (10, 3, 0, 0)) or
+            (frame.device_type == DeviceType.AVIA and frame.device_version >= (11, 6, 0, 0)))
+
+
+def _handshake_body(frame:g.Handshake)->bytes:
+    if ((frame.device_type == DeviceType.HORIZON and frame.device_version >= (6, 4, 0, 0)) or
+        (frame.device_type == DeviceType.TELE_15 and frame.device_version >= (3, 7, 0, 0))):
+        return struct.pack('<4sHHH', frame.ip.packed, frame.point_port, frame.cmd_port, frame.imu_port)
+    return struct.pack('<4sHH', frame.ip.packed, frame.point_port, frame.cmd_port)
+
+
+def _ip_body(frame:g.ConfigureStaticDynamicIp)->bytes:
+    if _full_ip(frame):
+        return struct.pack('<?4s4s4s', frame.is_static, frame.ip.packed, frame.mask.packed, frame.gw.packed)
+    return struct.pack('<?4s', frame.is_static, frame.ip.packed)
+
+
+def _ip_response_body(frame:g.GetDeviceIpInformationResponse)->bytes:
+    if _full_ip(frame):
+        return struct.pack('<??4s4s4s', frame.is_error, frame.is_static, frame.ip.packed, frame.mask.packed, frame.gw.packed)
+    return struct.pack('<??4s', frame.is_error, frame.is_static, frame.ip.packed)
+
+
+#bodies that are not one flat _PACK_FORMAT
+LEGACY_BODIES = {
+    g.BroadcastMsg: lambda frame: (struct.pack('<14sBx', frame.broadcast.serial, frame.broadcast.ip_range)
+                                   + struct.pack('<B2x', frame.dev_type.value)),
+    g.Handshake: _handshake_body,
+    g.ConfigureStaticDynamicIp: _ip_body,
+    g.GetDeviceIpInformationResponse: _ip_response_body,
+    g.WriteConfigurationParameters: lambda frame: b''.join([_param_payload(param) for param in frame.param_list]),
+    g.ReadConfigurationParameters: lambda frame: struct.pack(f'<B{frame.keys_quantity}H', frame.keys_quantity,
+                                                             *[key.value for key in frame.keys]),
+    g.ReadConfigurationParametersResponse: lambda frame: (struct.pack('<?HB', frame.is_error, frame.error_key.value, frame.error_code.value)
+                                                          + b''.join([_param_payload(param) for param in frame.param_list])),
+}
+
+
+def legacy_payload(frame:Frame)->bytes:
+    body = LEGACY_BODIES.get(type(frame))
+    if body is not None:
+        payload_body = body(frame)
+    elif frame._PACK_FORMAT is not None:
+        payload_body = struct.pack(frame._PACK_FORMAT, *frame._body_values())
+    else:
+        payload_body = b''
+    return legacy_cmd_payload(frame, payload_body)
+
+
+def legacy_header(frame:Frame)->bytes:
+    length = len(legacy_payload(frame)) + frame.HEADER_LENGTH + frame.FRAME_CRC_LENGTH
+    if length > frame.FRAME_MAX_LENGTH:
+        raise ValueError(f"{frame} is too big. Max {frame.FRAME_MAX_LENGTH} but pack is {length}")
+    return (frame.START.to_bytes(1, 'little')
+        + frame.VERSION.to_bytes(1, 'little')
+        + length.to_bytes(2, 'little')
+        + frame.CMD_TYPE.value.to_bytes(1, 'little')
+        + frame.seq.to_bytes(2, 'little')
+    )
+
+
+def legacy_header_crc(frame:Frame)->bytes:
+    return crc16(legacy_header(frame)).to_bytes(2, 'little')
+
+
+def legacy_frame_crc(frame:Frame)->bytes:
+    return crc32(legacy_header(frame) + legacy_header_crc(frame) + legacy_payload(frame)).to_bytes(4, 'little')
+
+
+def legacy_frame(frame:Frame)->bytes:
+    return legacy_header(frame) + legacy_header_crc(frame) + legacy_payload(frame) + legacy_frame_crc(frame)
+
+
+def main():
+    buffer = bytearray(Frame.FRAME_MAX_LENGTH)
+    print(f'{"class":<40} {"legacy us":>10} {"encode_into us":>15} {"speedup":>8}')
+    for frame in sample_frames():
+        length = frame.encode_into(buffer)
+        assert legacy_frame(frame) == buffer[:length]
+        legacy = timeit.timeit(lambda: legacy_frame(frame), number=NUMBER) / NUMBER * 1e6
+        encode = timeit.timeit(lambda: frame.encode_into(buffer), number=NUMBER) / NUMBER * 1e6
+        print(f'{type(frame).__name__:<40} {legacy:>10.2f} {encode:>15.2f} {legacy / encode:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
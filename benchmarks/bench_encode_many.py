@@ -0,0 +1,30 @@
+#Compare per frame bytes objects with one contiguous buffer from encode_many
+#Run from repo root: python -m benchmarks.bench_encode_many
+#std
+import timeit
+#proj
+from pylivox.control import general as g
+from pylivox.control.frame import encode_many
+
+NUMBER = 200
+
+
+def main():
+    key = g.ConfigurationParameter.Key
+    frames = [g.WriteConfigurationParameters([g.ConfigurationParameter(key.HIGH_SENSITIVITY_FUNCTION, True),
+                                              g.ConfigurationParameter(key.SLOT_ID_CONFIGURATION, i % 7)], i)
+              for i in range(200)]
+    buffer = bytearray()
+    cases = (
+        ('frame list', lambda: [frame.frame for frame in frames]),
+        ('frame join', lambda: b''.join([frame.frame for frame in frames])),
+        ('encode_many', lambda: encode_many(frames)),
+        ('encode_many reuse', lambda: encode_many(frames, buffer)),
+    )
+    for name, f in cases:
+        t = min(timeit.repeat(f, number=NUMBER, repeat=5)) / NUMBER * 1e6
+        print(f'{name:<20} {t:>8.1f} us per 200 frames')
+
+
+if __name__ == '__main__':
+    main()
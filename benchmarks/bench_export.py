@@ -0,0 +1,41 @@
+#Export of decoded points: per point text lines against packed binary records
+#Run from repo root: python -m benchmarks.bench_export
+#std
+import os
+import tempfile
+import timeit
+#proj
+from pylivox import data, export, points
+from pylivox.control.frame import DeviceType
+
+NUMBER = 3
+
+
+def legacy_export(path:str, cloud:points.PointCloud):
+    with open(path, 'w') as f:
+        for (x, y, z), reflectivity in zip(cloud.xyz.tolist(), cloud.reflectivity.tolist()):
+            f.write(f'{x} {y} {z} {reflectivity}\n')
+
+
+def write(path:str, batches:list):
+    with export.PcdWriter(path) as f:
+        for batch in batches:
+            f.write(batch)
+
+
+def main():
+    count = data.POINT_RATE[DeviceType.HORIZON] // data.DataType2.N
+    block = data.PacketBlock(data.DataType2, count).fill(0, 400000, data.default_points(data.DataType2))
+    cloud = points.decode(block.buffer, DeviceType.HORIZON)
+    #100 ms batches
+    step = len(cloud) // 10
+    batches = [cloud[i:i + step] for i in range(0, len(cloud), step)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cloud')
+        binary = timeit.timeit(lambda: write(path, batches), number=NUMBER) / NUMBER
+        legacy = timeit.timeit(lambda: legacy_export(path, cloud), number=1)
+    print(f'1 s of Horizon = {len(cloud)} points: binary PCD {binary * 1e3:7.2f} ms  per point text {legacy * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
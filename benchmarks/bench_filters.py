@@ -0,0 +1,41 @@
+#Voxel grid of fused frame: dict of voxels filled per point against sorted integer keys
+#Run from repo root: python -m benchmarks.bench_filters
+#std
+import math
+import timeit
+#libs
+import numpy as np
+#proj
+from pylivox import filters, points
+
+NUMBER = 5
+POINTS = 6 * 24000 #100 ms of 6 Horizons
+VOXEL = 0.2
+
+
+def legacy_downsample(xyz:list, size:float)->list:
+    voxels = {}
+    for point in xyz:
+        key = tuple(math.floor(value / size) for value in point)
+        voxels.setdefault(key, point)
+    return list(voxels.values())
+
+
+def main():
+    rng = np.random.default_rng(0)
+    cloud = points.PointCloud.empty(POINTS)
+    cloud.xyz[...] = rng.uniform(-50, 50, (POINTS, 3))
+    cloud.reflectivity[...] = rng.integers(0, 256, POINTS)
+    cloud.tag[...] = rng.choice([0, 0, 0, 1, 4], POINTS)
+    cloud.timestamp[...] = np.arange(POINTS)
+    cloud.return_index[...] = 0
+    stage = filters.PointFilter(20000, VOXEL)
+    voxels = timeit.timeit(lambda: filters.voxel_downsample(cloud, VOXEL), number=NUMBER) / NUMBER
+    staged = timeit.timeit(lambda: stage(cloud), number=NUMBER) / NUMBER
+    listed = cloud.xyz.tolist()
+    legacy = timeit.timeit(lambda: legacy_downsample(listed, VOXEL), number=1)
+    print(f'{POINTS} points: voxel grid {voxels * 1e3:7.2f} ms  full filter {staged * 1e3:7.2f} ms  per point dict {legacy * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
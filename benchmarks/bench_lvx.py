@@ -0,0 +1,44 @@
+#Random access into lvx recording: walking frames from start against index lookup
+#Run from repo root: python -m benchmarks.bench_lvx
+#std
+import os
+import random
+import tempfile
+import timeit
+#proj
+from pylivox import data, lvx
+from pylivox.control.frame import DeviceType
+
+SECONDS = 60
+SEEKS = 100
+
+
+def linear_seek(reader:lvx.LvxReader, timestamp:int)->int:
+    #reader without index parses every package up to the frame
+    for i in range(len(reader)):
+        reader.packets(i)
+        if i + 1 == len(reader) or reader.timestamps[i + 1] > timestamp:
+            return i
+
+
+def main():
+    count = data.POINT_RATE[DeviceType.HORIZON] // data.DataType2.N
+    block = data.PacketBlock(data.DataType2, count).fill(0, 400000, data.default_points(data.DataType2))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rec.lvx')
+        with lvx.LvxWriter(path, [lvx.device_info('0TFDG3B006H2Z11', DeviceType.HORIZON)]) as writer:
+            for second in range(SECONDS):
+                block.header['timestamp'] = second * 1000000000 + block.header['timestamp'] % 1000000000
+                writer.write(block.buffer)
+        build = timeit.timeit(lambda: lvx.LvxReader(path, cache=False).close(), number=1)
+        with lvx.LvxReader(path) as reader:
+            targets = [random.randrange(SECONDS * 1000000000) for _ in range(SEEKS)]
+            indexed = timeit.timeit(lambda: [reader.packets(reader.seek(t)) for t in targets], number=1) / SEEKS
+            linear = timeit.timeit(lambda: [linear_seek(reader, t) for t in targets[:5]], number=1) / 5
+            frames = len(reader)
+    print(f'{SECONDS} s of Horizon, {frames} frames: index build {build * 1e3:7.2f} ms  '
+          f'seek + packets {indexed * 1e6:8.1f} us  linear walk {linear * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#Retained bytes and allocations per decoded frame measured with tracemalloc, plus decode time
+#Run from repo root: python -m benchmarks.bench_memory
+#std
+import gc
+import timeit
+import tracemalloc
+#proj
+from pylivox.control.utils import FrameFrom
+from benchmarks.samples import sample_frames
+
+COUNT = 2000
+NUMBER = 20000
+
+
+def measure(data:bytes, device_type, device_version)->'tuple(float,float)':
+    """Bytes retained and allocations made per decoded frame"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    decoded = [FrameFrom(data, device_type, device_version) for _ in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    count = sum(stat.count_diff for stat in stats)
+    del decoded
+    return size / COUNT, count / COUNT
+
+
+def main():
+    print(f'{"class":<40} {"bytes":>7} {"blocks":>7} {"decode us":>10}')
+    total = 0
+    frames = sample_frames()
+    for frame in frames:
+        data = frame.frame
+        device_type, device_version = frame.device_type, frame.device_version
+        size, count = measure(data, device_type, device_version)
+        total += size
+        t = timeit.timeit(lambda: FrameFrom(data, device_type, device_version), number=NUMBER) / NUMBER * 1e6
+        print(f'{type(frame).__name__:<40} {size:>7.0f} {count:>7.1f} {t:>10.2f}')
+    print(f'{"mean":<40} {total / len(frames):>7.0f}')
+
+
+if __name__ == '__main__':
+    main()
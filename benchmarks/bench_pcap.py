@@ -0,0 +1,69 @@
+#pcap of Horizon traffic: per record reads and per packet decoding against block reads, batch decoding and process pool
+#Run from repo root: python -m benchmarks.bench_pcap
+#std
+import ipaddress
+import os
+import struct
+import tempfile
+import time
+#proj
+from pylivox import data, pcap, points
+from pylivox.control.frame import DeviceType
+
+SECONDS = 10
+WORKERS = 4
+DEVICE = ipaddress.ip_address('192.168.1.101')
+
+
+def ethernet(payload:bytes)->bytes:
+    udp = struct.pack('>HHHH', 65000, 60001, 8 + len(payload), 0) + payload
+    ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, 0x4000, 64, 17, 0, DEVICE.packed, bytes(4))
+    return b'\1' * 12 + b'\x08\x00' + ip + udp
+
+
+def write(path:str):
+    count = data.POINT_RATE[DeviceType.HORIZON] // data.DataType2.N
+    block = data.PacketBlock(data.DataType2, count).fill(0, 400000, data.default_points(data.DataType2))
+    frames = [ethernet(bytes(packet)) for packet in block]
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<IHHiIII', 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for second in range(SECONDS):
+            f.write(b''.join(struct.pack('<IIII', 1700000000 + second, i * 400, len(frame), len(frame)) + frame
+                             for i, frame in enumerate(frames)))
+
+
+def legacy_read(path:str)->int:
+    count = 0
+    with open(path, 'rb') as f:
+        f.read(24)
+        while True:
+            header = f.read(16)
+            if len(header) < 16:
+                return count
+            _, _, captured, _ = struct.unpack('<IIII', header)
+            frame = f.read(captured)
+            count += len(points.decode(frame[42:]))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'horizon.pcap')
+        write(path)
+        size = os.path.getsize(path) / 1e6
+        started = time.perf_counter()
+        legacy = legacy_read(path)
+        legacy_time = time.perf_counter() - started
+        started = time.perf_counter()
+        single = pcap.read(path, device_type=DeviceType.HORIZON)
+        single_time = time.perf_counter() - started
+        started = time.perf_counter()
+        pooled = pcap.read(path, device_type=DeviceType.HORIZON, workers=WORKERS, chunk_size=int(size * 1e6) // (2 * WORKERS))
+        pooled_time = time.perf_counter() - started
+    count = len(single.points[DEVICE])
+    assert legacy == count == len(pooled.points[DEVICE])
+    print(f'{size:.0f} MB, {count} points: per record {legacy_time * 1e3:8.1f} ms  '
+          f'blocks {single_time * 1e3:8.1f} ms  {WORKERS} workers {pooled_time * 1e3:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
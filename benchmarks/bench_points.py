@@ -0,0 +1,46 @@
+#Point packets to points: per point struct unpacking against structured views of whole batch
+#Run from repo root: python -m benchmarks.bench_points
+#std
+import math
+import struct
+import timeit
+#proj
+from pylivox import data, points
+from pylivox.control.frame import DeviceType
+
+NUMBER = 5
+
+
+def legacy_decode(packets:list, data_type:type)->list:
+    point_struct = struct.Struct(data_type._PACK_FORMAT)
+    result = []
+    for packet in packets:
+        timestamp, = struct.unpack_from('<Q', packet, 10)
+        for depth, zenith, azimuth, reflectivity, *_ in point_struct.iter_unpack(packet[data.HEADER_LENGTH:]):
+            zenith = math.radians(zenith / 100)
+            azimuth = math.radians(azimuth / 100)
+            depth /= 1000
+            result.append((depth * math.sin(zenith) * math.cos(azimuth),
+                           depth * math.sin(zenith) * math.sin(azimuth),
+                           depth * math.cos(zenith),
+                           reflectivity,
+                           timestamp))
+    return result
+
+
+def main():
+    for data_type in (data.DataType3, data.DataType2, data.DataType5):
+        count = data.POINT_RATE[DeviceType.HORIZON] // data_type.N
+        block = data.PacketBlock(data_type, count).fill(0, 400000, data.default_points(data_type))
+        listed = [bytes(packet) for packet in block]
+        batch = timeit.timeit(lambda: points.decode(block.buffer, DeviceType.HORIZON), number=NUMBER) / NUMBER
+        joined = timeit.timeit(lambda: points.decode(listed, DeviceType.HORIZON), number=NUMBER) / NUMBER
+        line = f'type {data_type.TYPE} 1 s of Horizon = {count} packets: buffer {batch * 1e3:7.2f} ms  list {joined * 1e3:7.2f} ms'
+        if data_type is data.DataType3:
+            legacy = timeit.timeit(lambda: legacy_decode(listed, data_type), number=1)
+            line += f'  per point struct {legacy * 1e3:8.2f} ms'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
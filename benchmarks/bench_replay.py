@@ -0,0 +1,37 @@
+#Replay of packet dump: reading whole file into list of packets against memory mapped index and views
+#Run from repo root: python -m benchmarks.bench_replay
+#std
+import os
+import tempfile
+import timeit
+#proj
+from pylivox import data, replay
+
+PACKETS = 50000
+NUMBER = 5
+
+
+def legacy_load(path:str)->list:
+    with open(path, 'rb') as f:
+        content = f.read()
+    length = data.DataType2.PACKET_LENGTH
+    return [content[i:i + length] for i in range(0, len(content), length)]
+
+
+def main():
+    block = data.PacketBlock(data.DataType2, PACKETS).fill(0, 400000, data.default_points(data.DataType2))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'dump.bin')
+        with open(path, 'wb') as f:
+            f.write(block.buffer)
+        size = os.path.getsize(path) / 1e6
+        legacy = timeit.timeit(lambda: legacy_load(path), number=NUMBER) / NUMBER
+        index = timeit.timeit(lambda: replay.PacketReplay(path).close(), number=NUMBER) / NUMBER
+        r = replay.PacketReplay(path)
+        tick = timeit.timeit(lambda: r.packets(100000000), number=PACKETS // 250) / (PACKETS // 250)
+        print(f'{PACKETS} packets {size:.0f} MB: legacy load {legacy * 1e3:7.2f} ms  '
+              f'mmap index {index * 1e3:6.3f} ms  0.1 s window {tick * 1e3:6.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
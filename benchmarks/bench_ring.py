@@ -0,0 +1,42 @@
+#Data plane of several emulated Horizons: new bytes per packet (header + payload) against preallocated ring slots
+#Run from repo root: python -m benchmarks.bench_ring
+#std
+import time
+import timeit
+import tracemalloc
+#proj
+from pylivox import data
+from pylivox.control.frame import DeviceType
+
+LIDARS = 4
+NUMBER = 10
+
+
+def main():
+    data_type = data.data_type_for(DeviceType.HORIZON)
+    count = int(data.POINT_RATE[DeviceType.HORIZON] * 0.1) // data_type.N
+    frame = data.Frame(data.default_points(data_type))
+    frame.DATA = data_type
+    rings = [data.PacketRing(data_type, count) for _ in range(LIDARS)]
+    clocks = [data.PacketClock(400000) for _ in range(LIDARS)]
+    sink = []
+
+    def legacy():
+        for _ in range(LIDARS):
+            sink[:] = [frame.header + frame.payload for _ in range(count)]
+
+    def ring():
+        for lidar_ring, clock in zip(rings, clocks):
+            sink[:] = lidar_ring.next().stamp(clock)
+
+    for name, cycle in (('bytes per packet', legacy), ('ring', ring)):
+        elapsed = timeit.timeit(cycle, number=NUMBER) / NUMBER
+        tracemalloc.start()
+        cycle()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{LIDARS} Horizons 0.1 s cycle, {name:<16} {elapsed * 1e3:7.3f} ms  peak allocated {peak / 1e6:6.2f} MB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#Scan tables: computing pattern against loading cached .npy memory map, and cost of one 0.1 s block
+#Run from repo root: python -m benchmarks.bench_scan
+#std
+import tempfile
+import timeit
+#proj
+from pylivox import data, scan
+from pylivox.control.frame import DeviceType
+
+NUMBER = 20
+COMPUTE_NUMBER = 3 #non-repetitive tables cover 30 s
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for device_type in (DeviceType.MID_40, DeviceType.HORIZON):
+            for repetitive in (False, True):
+                compute = timeit.timeit(lambda: scan.load_table(device_type, repetitive, None), number=COMPUTE_NUMBER) / COMPUTE_NUMBER
+                scan.load_table(device_type, repetitive, cache_dir)
+                load = timeit.timeit(lambda: scan.load_table(device_type, repetitive, cache_dir), number=NUMBER) / NUMBER
+                data_type = data.data_type_for(device_type)
+                count = int(data.POINT_RATE[device_type] * 0.1) // data_type.N
+                block = data.PacketBlock(data_type, count)
+                cursor = scan.ScanCursor(scan.load_table(device_type, repetitive, cache_dir))
+                def tick():
+                    angles = cursor.take(count * data_type.N).reshape(count, data_type.N)
+                    data.write_points(block.points, data_type, angles['azimuth'], angles['zenith'], 10000)
+                write = timeit.timeit(tick, number=NUMBER) / NUMBER
+                print(f'{device_type.name:<8} {"repetitive" if repetitive else "non-repetitive":<14} '
+                      f'compute {compute * 1e3:7.2f} ms  mmap load {load * 1e3:6.3f} ms  0.1 s block {write * 1e3:6.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+#Scene ray casting: one 0.1 s block cast every time against measurements cached for repetitive scan
+#Run from repo root: python -m benchmarks.bench_scene
+#std
+import timeit
+#proj
+from pylivox import data, scan, scene
+from pylivox.control.frame import DeviceType
+
+NUMBER = 20
+
+
+def main():
+    scene_ = scene.default_scene()
+    for device_type in (DeviceType.MID_40, DeviceType.HORIZON):
+        data_type = data.data_type_for(device_type)
+        count = int(data.POINT_RATE[device_type] * 0.1) // data_type.N
+        block = data.PacketBlock(data_type, count)
+        table = scan.load_table(device_type, True, None)
+        measure = timeit.timeit(lambda: scene_.measure(table), number=1)
+        for name, cursor in (('cast', scan.ScanCursor(table)), ('cached', scan.ScanCursor(scene_.measure(table)))):
+            def tick():
+                rows = cursor.take(count * data_type.N).reshape(count, data_type.N)
+                if 'depth' in rows.dtype.names:
+                    depth, reflectivity = rows['depth'], rows['reflectivity']
+                else:
+                    depth, reflectivity = scene_.cast(rows['azimuth'], rows['zenith'])
+                data.write_points(block.points, data_type, rows['azimuth'], rows['zenith'], depth, reflectivity)
+            elapsed = timeit.timeit(tick, number=NUMBER) / NUMBER
+            print(f'{device_type.name:<8} {name:<6} 0.1 s block {elapsed * 1e3:6.3f} ms')
+        print(f'{device_type.name:<8} measure table of {len(table)} rows once {measure * 1e3:6.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+#Throughput of FrameStreamDecoder over a capture-like byte stream with some garbage between frames
+#Run from repo root: python -m benchmarks.bench_stream
+#std
+import io
+import time
+#proj
+from pylivox.control.utils import FrameStreamDecoder
+from benchmarks.samples import sample_frames
+
+REPEAT = 500
+CHUNK_SIZE = 1 << 16
+
+
+def main():
+    frames = [frame.frame for frame in sample_frames()]
+    data = b''.join(frame + (b'\xaa\x00' if i % 10 == 0 else b'') for i, frame in enumerate(frames * REPEAT))
+    for lazy in (False, True):
+        decoder = FrameStreamDecoder(lazy=lazy)
+        time_start = time.perf_counter()
+        count = sum(1 for _ in decoder.decode_stream(io.BytesIO(data), CHUNK_SIZE))
+        elapsed = time.perf_counter() - time_start
+        print(f'lazy:{lazy!s:<5} {count} frames {len(data) / elapsed / 1e6:>6.2f} MB/s {count / elapsed / 1e3:>7.1f} kframes/s {decoder}')
+
+
+if __name__ == '__main__':
+    main()
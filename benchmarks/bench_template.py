@@ -0,0 +1,34 @@
+#Compare building and encoding response objects with rendering pre-encoded templates
+#Run from repo root: python -m benchmarks.bench_template
+#std
+import timeit
+import itertools
+#proj
+from pylivox.control import general as g
+from pylivox.control.frame import DeviceType
+from pylivox.control.template import TemplateCache
+
+NUMBER = 100000
+
+
+def main():
+    device_type, device_version = DeviceType.HORIZON, (6, 4, 0, 0)
+    cache = TemplateCache(device_type, device_version)
+    cache.add(g.HeartbeatResponse(g.WorkState.Lidar.Normal, 0, 0, 0, device_type=device_type, device_version=device_version),
+              fields=('work_state', ))
+    state = g.WorkState.Lidar.Normal
+    seqs = itertools.count()
+    cases = (
+        ('heartbeat encode', lambda: g.HeartbeatResponse(state, 0, 0, next(seqs) & 0xFFFF, False, device_type, device_version).frame),
+        ('heartbeat template', lambda: cache.render(g.HeartbeatResponse, next(seqs) & 0xFFFF, work_state=state)),
+        ('ack encode', lambda: g.StartStopSamplingResponse(next(seqs) & 0xFFFF, False, device_type, device_version).frame),
+        ('ack template', lambda: cache.ack(g.StartStopSamplingResponse, next(seqs) & 0xFFFF)),
+        ('ack template same seq', lambda: cache.ack(g.StartStopSamplingResponse, 1)),
+    )
+    for name, f in cases:
+        t = min(timeit.repeat(f, number=NUMBER, repeat=3)) / NUMBER * 1e6
+        print(f'{name:<24} {t:>6.2f} us  {1 / t * 1e6:>10.0f} frames/s')
+
+
+if __name__ == '__main__':
+    main()
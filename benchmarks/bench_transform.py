@@ -0,0 +1,37 @@
+#Extrinsic transform of 6 lidars: per point rotation in python against one matmul per lidar into fused buffer
+#Run from repo root: python -m benchmarks.bench_transform
+#std
+import math
+import timeit
+#proj
+from pylivox import data, points
+from pylivox.control.frame import DeviceType
+from pylivox.transform import Extrinsics, Fusion
+
+NUMBER = 5
+LIDARS = 6
+
+
+def legacy_transform(xyz:list, extrinsics:Extrinsics)->list:
+    yaw = math.radians(extrinsics.yaw)
+    cos, sin = math.cos(yaw), math.sin(yaw)
+    return [(x * cos - y * sin + extrinsics.x / 1000, x * sin + y * cos + extrinsics.y / 1000, z + extrinsics.z / 1000)
+            for x, y, z in xyz]
+
+
+def main():
+    #100 ms frame of every lidar
+    count = data.POINT_RATE[DeviceType.HORIZON] // 10 // data.DataType2.N
+    block = data.PacketBlock(data.DataType2, count).fill(0, 400000, data.default_points(data.DataType2))
+    cloud = points.decode(block.buffer, DeviceType.HORIZON)
+    extrinsics = {i: Extrinsics(yaw=60 * i, x=1000 * i) for i in range(LIDARS)}
+    clouds = dict.fromkeys(extrinsics, cloud)
+    fusion = Fusion(extrinsics, LIDARS * len(cloud))
+    fused = timeit.timeit(lambda: fusion.fuse(clouds), number=NUMBER) / NUMBER
+    listed = cloud.xyz.tolist()
+    legacy = timeit.timeit(lambda: [legacy_transform(listed, e) for e in extrinsics.values()], number=1)
+    print(f'{LIDARS} lidars x {len(cloud)} points: fusion {fused * 1e3:7.2f} ms  per point (yaw only) {legacy * 1e3:8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
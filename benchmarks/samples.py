@@ -0,0 +1,61 @@
+#Sample instance of every control frame class. Shared by benchmarks
+#proj
+from pylivox.control import general as g
+from pylivox.control import lidar
+from pylivox.control.frame import DeviceType
+
+
+def sample_frames()->'list(Frame)':
+    params = [g.ConfigurationParameter(g.ConfigurationParameter.Key.HIGH_SENSITIVITY_FUNCTION, True),
+              g.ConfigurationParameter(g.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION, 3)]
+    keys = [g.ConfigurationParameter.Key.HIGH_SENSITIVITY_FUNCTION, g.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION]
+    return [
+        g.BroadcastMsg(g.Broadcast('12345678901234', 0), 1, DeviceType.MID_40),
+        g.Handshake('192.168.1.1', 0x1122, 0x3344, 0x5566, 1, DeviceType.HORIZON, (8, 8, 8, 8)),
+        g.HandshakeResponse(1),
+        g.QueryDeviceInformation(1),
+        g.QueryDeviceInformationResponse(1, device_version=(1, 2, 3, 4)),
+        g.Heartbeat(1),
+        g.HeartbeatResponse(g.WorkState.Lidar.Normal, 0, 0x11223344, 1),
+        g.StartStopSampling(True, 1),
+        g.StartStopSamplingResponse(1),
+        g.ChangeCoordinateSystem(True, 1),
+        g.ChangeCoordinateSystemResponse(1),
+        g.Disconnect(1),
+        g.DisconnectResponse(1),
+        g.PushAbnormalStatusInformation(0x11223344, 1),
+        g.ConfigureStaticDynamicIp(True, '192.168.1.2', '255.255.255.0', '192.168.1.1', 1),
+        g.ConfigureStaticDynamicIpResponse(1),
+        g.GetDeviceIpInformation(1),
+        g.GetDeviceIpInformationResponse(True, '192.168.1.2', '255.255.255.0', '192.168.1.1', 1),
+        g.RebootDevice(100, 1),
+        g.RebootDeviceResponse(1),
+        g.WriteConfigurationParameters(params, 1),
+        g.WriteConfigurationParametersResponse(g.ConfigurationParameter.Key.HIGH_SENSITIVITY_FUNCTION,
+                                               g.ConfigurationParameter.ErrorCode.NO_ERROR, 1),
+        g.ReadConfigurationParameters(len(keys), keys, 1),
+        g.ReadConfigurationParametersResponse(g.ConfigurationParameter.Key.HIGH_SENSITIVITY_FUNCTION,
+                                              g.ConfigurationParameter.ErrorCode.NO_ERROR, params, 1),
+        lidar.SetMode(lidar.PowerMode.normal, 1),
+        lidar.SetModeResponse(lidar.SetModeResponse.Result.Success, 1),
+        lidar.WriteLidarExtrinsicParameters(1.0, 2.0, 3.0, 4, 5, 6, 1),
+        lidar.WriteLidarExtrinsicParametersResponse(1),
+        lidar.ReadLidarExtrinsicParameters(1),
+        lidar.ReadLidarExtrinsicParametersResponse(1.0, 2.0, 3.0, 4, 5, 6, 1),
+        lidar.TurnOnOffRainFogSuppression(True, 1, DeviceType.MID_40),
+        lidar.TurnOnOffRainFogSuppressionResponse(1, device_type=DeviceType.MID_40),
+        lidar.SetTurnOnOffFan(True, 1),
+        lidar.SetTurnOnOffFanResponse(1),
+        lidar.GetTurnOnOffFanState(1),
+        lidar.GetTurnOnOffFanStateResponse(True, 1),
+        lidar.SetLidarReturnMode(lidar.ReturnMode.DUAL_RETURN, 1),
+        lidar.SetLidarReturnModeResponse(1),
+        lidar.GetLidarReturnMode(1),
+        lidar.GetLidarReturnModeResponse(lidar.ReturnMode.DUAL_RETURN, 1),
+        lidar.SetImuDataPushFrequency(lidar.PushFrequency.FREQ_200HZ, 1),
+        lidar.SetImuDataPushFrequencyResponse(1),
+        lidar.GetImuDataPushFrequency(1),
+        lidar.GetImuDataPushFrequencyResponse(lidar.PushFrequency.FREQ_200HZ, 1),
+        lidar.UpdateUtcSynchronizationTime(22, 2, 1, 1, 0x11223344, 1),
+        lidar.UpdateUtcSynchronizationTimeResponse(1),
+    ]
@@ -0,0 +1,131 @@
+#Integration of decoded points into frames of fixed time window.
+#Points are written into ring of preallocated clouds, finished frame is handed out as view of its cloud
+
+#libs
+import numpy as np
+#proj
+from pylivox.control.frame import DeviceType
+from pylivox.data import POINT_RATE, DataType6, timestamps_ns
+from pylivox.points import PointCloud, decode_into, point_count, point_period, split
+
+
+class CloudFrame:
+    """Points of one closed frame, view into accumulator buffer valid until buffer is reused"""
+    __slots__ = ('index', 'start', 'end', 'points')
+
+    def __init__(self, index:int, start:int, end:int, points:PointCloud):
+        self.index = index
+        self.start = start #ns of first point or packet
+        self.end = end #ns where window ends, None for frames closed by count only
+        self.points = points
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} #{self.index} start:{self.start} points:{len(self.points)}}}'
+
+    def __len__(self):
+        return len(self.points)
+
+
+class FrameAccumulator:
+    """Appends points into current of buffers clouds of capacity points.
+    Frame closes when timestamp reaches end of its window (ns, aligned to multiples of window)
+    or when it has max_points. Closed frame is view of its buffer, next frame goes into next buffer:
+    frame stays valid while buffers - 1 next frames are filled. Timestamps are expected non decreasing"""
+
+    def __init__(self, capacity:int, window:int=100000000, max_points:int=None, buffers:int=2):
+        if buffers < 2:
+            raise ValueError(f'Buffers {buffers} < 2: frame would be overwritten by next one')
+        if capacity < 1:
+            raise ValueError(f'Capacity {capacity} < 1')
+        self.window = window
+        self.max_points = capacity if max_points is None else min(max_points, capacity)
+        self.frames = 0 #closed so far
+        self._buffers = [PointCloud.empty(capacity) for _ in range(buffers)]
+        self._current = 0
+        self._count = 0
+        self._start:int = None
+        self._end:int = None
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} window:{self.window} frames:{self.frames} points:{self._count}}}'
+
+    @classmethod
+    def for_device(cls, device_type:DeviceType, window:int=100000000, returns:int=1, **kwargs)->'FrameAccumulator':
+        """Capacity for window of device point rate with returns per measurement and some jitter"""
+        capacity = int(POINT_RATE[device_type] * window / 1000000000 * returns * 1.1) + 100 * returns
+        return cls(capacity, window, **kwargs)
+
+    @property
+    def buffer(self)->PointCloud:
+        """Cloud current frame is written into"""
+        return self._buffers[self._current]
+
+    @property
+    def count(self)->int:
+        """Points of current frame"""
+        return self._count
+
+    def _open(self, timestamp:int):
+        self._start = int(timestamp)
+        self._end = (self._start // self.window + 1) * self.window if self.window else None
+
+    def _close(self)->CloudFrame:
+        frame = CloudFrame(self.frames, self._start, self._end, self.buffer[:self._count])
+        self.frames += 1
+        self._current = (self._current + 1) % len(self._buffers)
+        self._count = 0
+        self._start = None
+        self._end = None
+        return frame
+
+    def flush(self)->'CloudFrame|None':
+        """Close current frame even if its window is not over"""
+        return self._close() if self._count else None
+
+    def append(self, cloud:PointCloud)->'list(CloudFrame)':
+        """Copy points into frames, returns frames closed by them"""
+        frames = []
+        timestamps = cloud.timestamp
+        i = 0
+        while i < len(cloud):
+            if self._start is None:
+                self._open(timestamps[i])
+            stop = len(cloud) if self._end is None else i + int(np.searchsorted(timestamps[i:], self._end))
+            stop = min(stop, i + self.max_points - self._count)
+            if stop > i:
+                target = self.buffer[self._count:self._count + stop - i]
+                for name in PointCloud.__slots__:
+                    getattr(target, name)[...] = getattr(cloud, name)[i:stop]
+                self._count += stop - i
+                i = stop
+            if i < len(cloud):
+                frames.append(self._close())
+        return frames
+
+    def append_packets(self,
+                    packets:'bytes|memoryview|list(bytes|memoryview)',
+                    device_type:DeviceType=None,
+                    point_rate:int=None)->'list(CloudFrame)':
+        """Decode packets straight into frames, returns frames closed by them.
+        Frames are split between packets by header timestamps, IMU packets are skipped"""
+        frames = []
+        period = point_period(device_type, point_rate)
+        for data_type, array in split(packets):
+            if data_type is DataType6:
+                continue
+            per_packet = point_count(data_type)
+            if per_packet > self.max_points:
+                raise ValueError(f'Packet of {per_packet} points does not fit into frame of {self.max_points}')
+            times = timestamps_ns(array['header'])
+            i = 0
+            while i < len(array):
+                if self._start is None:
+                    self._open(times[i])
+                stop = len(array) if self._end is None else i + int(np.searchsorted(times[i:], self._end))
+                stop = min(stop, i + (self.max_points - self._count) // per_packet)
+                if stop > i:
+                    self._count += decode_into(array[i:stop], data_type, self.buffer[self._count:], period)
+                    i = stop
+                if i < len(array):
+                    frames.append(self._close())
+        return frames
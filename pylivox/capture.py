@@ -0,0 +1,277 @@
+#Capture of raw datagrams exchanged with devices into append-only segment files and their replay.
+#Record is header (receive time ns, length, port, direction) followed by datagram. Every segment
+#has sparse index of (time, offset) to start replay at any time without reading segment from start
+
+#std
+import os
+import mmap
+import time
+import queue
+import struct
+import threading
+#libs
+import numpy as np
+#proj
+import log
+from pylivox.control.frame import Frame
+from pylivox.control.utils import FrameFrom
+from pylivox.data import DataType6
+from pylivox.points import decode as decode_points, decode_imu
+
+logger = log.getLogger(__name__)
+
+RX = 0 #datagram received by recording side
+TX = 1 #datagram sent by recording side
+#time ns, datagram length, port of remote end, direction
+RECORD_STRUCT = struct.Struct('<qIHB')
+INDEX_DTYPE = np.dtype([('time', '<i8'), ('offset', '<i8')])
+SEGMENT_SIZE = 256 * 1024 * 1024 #bytes
+INDEX_INTERVAL = 100000000 #ns between index entries
+FSYNC_INTERVAL = 1.0 #seconds
+_BATCH = 4096 #records written between checks for fsync
+QUEUE_SIZE = 65536 #records waiting for writer, more are dropped
+
+
+def _segments(directory:str)->'list(str)':
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.seg'))
+
+
+class Recorder:
+    """Datagrams into segments of directory. record only queues copy of datagram,
+    writer thread writes queued records in batches and fsyncs every fsync_interval seconds.
+    When writer falls queue_size records behind new ones are dropped and counted.
+    New segment is started once current one exceeds segment_size"""
+
+    def __init__(self,
+                directory:str,
+                segment_size:int=SEGMENT_SIZE,
+                index_interval:int=INDEX_INTERVAL,
+                fsync_interval:float=FSYNC_INTERVAL,
+                queue_size:int=QUEUE_SIZE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.index_interval = index_interval
+        self.fsync_interval = fsync_interval
+        self.count = 0 #records written
+        self.dropped = 0 #records not queued: writer behind
+        self.error:Exception = None #of writer, nothing is written after it
+        existing = _segments(directory)
+        self._number = int(os.path.basename(existing[-1])[:-4]) + 1 if existing else 0
+        self._segment = None
+        self._index = None
+        self._size = 0
+        self._indexed:int = None
+        self._closed = False
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name='capture', daemon=True)
+        self._thread.start()
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.directory} records:{self.count} dropped:{self.dropped}}}'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, datagram:'bytes|memoryview', port:int, direction:int=RX, time_ns:int=None):
+        """Queue datagram received from (RX) or sent to (TX) remote port, stamped now by default.
+        Raises error of writer once it has failed"""
+        if self.error is not None:
+            raise self.error
+        if self._closed:
+            raise ValueError(f'{self} is closed')
+        try:
+            self._queue.put_nowait((time.time_ns() if time_ns is None else time_ns, port, direction, bytes(datagram)))
+        except queue.Full:
+            self.dropped += 1
+
+    def _open(self):
+        path = os.path.join(self.directory, f'{self._number:06d}')
+        self._number += 1
+        self._segment = open(f'{path}.seg', 'ab')
+        self._index = open(f'{path}.idx', 'ab')
+        self._size = 0
+        self._indexed = None
+
+    def _sync(self):
+        for f in (self._segment, self._index):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _close_segment(self):
+        try:
+            self._sync()
+        finally:
+            for f in (self._segment, self._index):
+                if f is not None:
+                    f.close()
+            self._segment = self._index = None
+
+    def _write(self, time_ns:int, port:int, direction:int, datagram:bytes):
+        if self._segment is None or self._size >= self.segment_size:
+            self._close_segment()
+            self._open()
+        if self._indexed is None or time_ns - self._indexed >= self.index_interval:
+            self._index.write(struct.pack('<qq', time_ns, self._size))
+            self._indexed = time_ns
+        self._segment.write(RECORD_STRUCT.pack(time_ns, len(datagram), port, direction))
+        self._segment.write(datagram)
+        self._size += RECORD_STRUCT.size + len(datagram)
+        self.count += 1
+
+    def _run(self):
+        synced = time.monotonic()
+        running = True
+        while running:
+            items = [self._queue.get()]
+            try:
+                while len(items) < _BATCH:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            #sentinel of close is looked for in whole batch, also after failed write
+            running = None not in items
+            if self.error is not None:
+                continue
+            try:
+                for item in items:
+                    if item is not None:
+                        self._write(*item)
+                if not running or time.monotonic() - synced >= self.fsync_interval:
+                    self._sync()
+                    synced = time.monotonic()
+            except Exception as e:
+                logger.exception(e)
+                self.error = e
+        try:
+            self._close_segment()
+        except Exception as e:
+            logger.exception(e)
+            self.error = self.error or e
+
+    def close(self):
+        """Write everything queued so far and close segment"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+class Segment:
+    """Memory mapped segment file, records are views into it"""
+
+    def __init__(self, path:str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+        self._view = memoryview(self._map)
+        index = f'{path[:-4]}.idx'
+        self.index = np.fromfile(index, INDEX_DTYPE) if os.path.exists(index) else np.zeros(0, INDEX_DTYPE)
+        if not len(self.index) and len(self._map):
+            self.index = np.array([(RECORD_STRUCT.unpack_from(self._map)[0], 0)], INDEX_DTYPE)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.path} index:{len(self.index)}}}'
+
+    @property
+    def start(self)->'int|None':
+        """Time of first record"""
+        return int(self.index['time'][0]) if len(self.index) else None
+
+    def records(self, start:int=None)->'iter(tuple(int,int,int,memoryview))':
+        """(time, port, direction, datagram) from first record at or after start ns"""
+        offset = 0
+        if start is not None and len(self.index):
+            entry = max(int(np.searchsorted(self.index['time'], start, 'right')) - 1, 0)
+            offset = int(self.index['offset'][entry])
+        length = len(self._map)
+        view = self._view
+        while offset + RECORD_STRUCT.size <= length:
+            time_ns, size, port, direction = RECORD_STRUCT.unpack_from(view, offset)
+            offset += RECORD_STRUCT.size
+            if offset + size > length:
+                #torn write at the end of segment
+                logger.warning(f'{self.path}: truncated record at {offset - RECORD_STRUCT.size}')
+                return
+            if start is None or time_ns >= start:
+                yield time_ns, port, direction, view[offset:offset + size]
+            offset += size
+
+    def close(self):
+        self._view.release()
+        if self._map:
+            self._map.close()
+
+
+class CaptureReplay:
+    """Records of capture directory emitted to sink(time, port, direction, datagram)
+    speed times faster than recorded, as fast as possible when speed is None"""
+
+    def __init__(self, directory:str, speed:'float|None'=1.0):
+        if speed is not None and speed <= 0:
+            raise ValueError(f'Speed {speed} <= 0')
+        self.directory = directory
+        self.speed = speed
+        self.segments = [Segment(path) for path in _segments(directory)]
+        self.segments = [segment for segment in self.segments if segment.start is not None]
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.directory} segments:{len(self.segments)} speed:{self.speed}}}'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def records(self, start:int=None)->'iter(tuple(int,int,int,memoryview))':
+        """Records of all segments from first one at or after start ns"""
+        first = 0
+        if start is not None:
+            starts = [segment.start for segment in self.segments]
+            first = max(int(np.searchsorted(starts, start, 'right')) - 1, 0)
+        for segment in self.segments[first:]:
+            yield from segment.records(start)
+
+    def play(self, sink, start:int=None, stop:int=None)->int:
+        """Emit records from start to stop ns keeping their spacing, returns count of emitted"""
+        count = 0
+        origin = None
+        for time_ns, port, direction, datagram in self.records(start):
+            if stop is not None and time_ns >= stop:
+                break
+            if self.speed is not None:
+                if origin is None:
+                    origin = time_ns, time.monotonic()
+                delay = (time_ns - origin[0]) / 1e9 / self.speed - (time.monotonic() - origin[1])
+                if delay > 0:
+                    time.sleep(delay)
+            sink(time_ns, port, direction, datagram)
+            count += 1
+        return count
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+
+
+def udp_sink(sock, host:str, direction:int=RX):
+    """Sink sending datagrams of direction to their port of host"""
+    def sink(time_ns:int, port:int, record_direction:int, datagram:memoryview):
+        if record_direction == direction:
+            sock.sendto(datagram, (host, port))
+    return sink
+
+
+def decode(datagram:'bytes|memoryview', device_type=None):
+    """Control frame (FrameFrom), point cloud of point packet or IMU samples of IMU packet.
+    device_type may be DeviceType or DeviceContext of control frames, or DeviceType for point rate"""
+    if datagram[0] == Frame.START:
+        return FrameFrom(datagram, device_type)
+    if len(datagram) > 9 and datagram[9] == DataType6.TYPE:
+        return decode_imu([datagram])
+    return decode_points([datagram], getattr(device_type, 'device_type', device_type))
@@ -6,17 +6,126 @@ import struct
 import abc
 import logging
 import functools
-import inspect
+import threading
 #libs
 import crcmod
 #projs
 
 crc32 = crcmod.mkCrcFun(0x104C11DB7, rev=True, initCrc=0x564F580A, xorOut=0xFFFFFFFF)
 crc16 = crcmod.mkCrcFun(0x11021, rev=True, initCrc=0x4C49)
+CRC32_INIT = crc32(b'')
 
 logger = logging.getLogger(__name__)
 
 
+class Crc32:
+    """Incremental frame CRC32. 
+    Header, header CRC and payload segments are checksummed one after another without joining them"""
+    __slots__ = ('value', )
+
+    def __init__(self, value:int=CRC32_INIT):
+        self.value = value
+
+    def update(self, data:'bytes|bytearray|memoryview')->'Crc32':
+        self.value = crc32(data, self.value)
+        return self
+
+
+#CRC16 of header memoized by header content. Header is 7 bytes, read as 8 and masked
+_HEADER_KEY_STRUCT = struct.Struct('<Q')
+_HEADER_KEY_MASK = (1 << 56) - 1
+_header_crc_cache = {}
+HEADER_CRC_CACHE_SIZE = 1 << 16
+
+
+#reused buffer for properties that pack whole frame or payload, one per thread.
+#Sized by 16 bit length field, so frames over FRAME_MAX_LENGTH reach the ValueError of encode_into
+_scratch = threading.local()
+_SCRATCH_SIZE = 1 << 16
+
+
+def _scratch_buffer()->bytearray:
+    buffer = getattr(_scratch, 'buffer', None)
+    if buffer is None:
+        buffer = _scratch.buffer = bytearray(_SCRATCH_SIZE)
+    return buffer
+
+
+def crc_header_cached(buffer:'bytes|bytearray|memoryview', offset:int=0)->int:
+    """CRC16 of frame header at offset. Buffer must hold header CRC slot after header"""
+    key = _HEADER_KEY_STRUCT.unpack_from(buffer, offset)[0] & _HEADER_KEY_MASK
+    crc = _header_crc_cache.get(key)
+    if crc is None:
+        if len(_header_crc_cache) >= HEADER_CRC_CACHE_SIZE:
+            _header_crc_cache.clear()
+        crc = _header_crc_cache[key] = crc16(memoryview(buffer)[offset:offset + 7])
+    return crc
+
+
+def frame_spans(buffer:'bytes|bytearray|memoryview', offset:int=0)->'list(tuple(int,int))':
+    """(offset, length) of frames packed back to back in buffer. Trailing incomplete frame is skipped"""
+    spans = []
+    end = len(buffer)
+    length_struct = Frame._HEADER_CRC_STRUCT
+    min_length = Frame.HEADER_LENGTH + Frame.FRAME_CRC_LENGTH
+    while offset + min_length <= end:
+        length, = length_struct.unpack_from(buffer, offset + 2)
+        if length < min_length or offset + length > end:
+            break
+        spans.append((offset, length))
+        offset += length
+    return spans
+
+
+def encode_many(frames:'list(Frame)', buffer:bytearray=None)->'tuple(bytearray, list(tuple(int,int)))':
+    """Encode frames back to back into one bytearray. Return buffer and (offset, length) of every frame.
+    Buffer grows only when less than FRAME_MAX_LENGTH is left, trailing space is trimmed"""
+    if buffer is None:
+        buffer = bytearray(len(frames) * 64 + Frame.FRAME_MAX_LENGTH)
+    spans = []
+    offset = 0
+    max_length = Frame.FRAME_MAX_LENGTH
+    for frame in frames:
+        if len(buffer) - offset < max_length:
+            buffer.extend(bytes(max(len(buffer), max_length)))
+        length = frame.encode_into(buffer, offset)
+        spans.append((offset, length))
+        offset += length
+    del buffer[offset:]
+    return buffer, spans
+
+
+def frame_views(buffer:'bytes|bytearray|memoryview', spans:'list(tuple(int,int))'=None)->'list(memoryview)':
+    """Zero copy view of every frame in buffer. 
+    Each view is one datagram: sendmsg joins its buffers into single UDP datagram"""
+    view = memoryview(buffer)
+    spans = frame_spans(view) if spans is None else spans
+    return [view[offset:offset + length] for offset, length in spans]
+
+
+def crc_frames(buffer:'bytes|bytearray|memoryview', spans:'list(tuple(int,int))'=None)->'list(int)':
+    """CRC32 of every frame in buffer (frame without its trailing CRC). Frames are not copied"""
+    view = memoryview(buffer)
+    spans = frame_spans(view) if spans is None else spans
+    crc_length = Frame.FRAME_CRC_LENGTH
+    return [crc32(view[offset:offset + length - crc_length]) for offset, length in spans]
+
+
+def verify_frames(buffer:'bytes|bytearray|memoryview', spans:'list(tuple(int,int))'=None)->'list(bool)':
+    """Check header CRC16 and frame CRC32 of every frame in buffer"""
+    view = memoryview(buffer)
+    spans = frame_spans(view) if spans is None else spans
+    crc_length = Frame.FRAME_CRC_LENGTH
+    header_crc_unpack = Frame._HEADER_CRC_STRUCT.unpack_from
+    frame_crc_unpack = Frame._FRAME_CRC_STRUCT.unpack_from
+    result = []
+    for offset, length in spans:
+        end = offset + length - crc_length
+        result.append(header_crc_unpack(view, offset + 7)[0] == crc_header_cached(view, offset)
+                      and frame_crc_unpack(view, end)[0] == crc32(view[offset:end]))
+    return result
+
+
 
 
 class DeviceType(enum.Enum):
@@ -28,13 +137,14 @@ class DeviceType(enum.Enum):
     AVIA     = 7
 
 
-#Global config for current device
+#Process wide defaults, used when frame is built or decoded without device type/version
 _Device_type = DeviceType.HORIZON
 _Device_version = (11,11,1,1)
 _Ignore_type_restriction = True
 
 def set_ignore_type_restriction(value:bool):
     assert type(value) is bool
+    global _Ignore_type_restriction
     _Ignore_type_restriction = value
 
 def get_ignore_type_restriction()->bool:
@@ -57,27 +167,86 @@ def get_default_device_version()->'tuple(int,int,int,int)':
     return _Device_version
 
 
+class DeviceContext:
+    """Device type and firmware version frames are encoded and decoded for.
+    Contexts are shared: get them with device_context(). Version dependent body layouts
+    are resolved once per context and frame type"""
+    __slots__ = ('device_type', 'device_version', '_layouts')
+
+    def __init__(self, device_type:'DeviceType|int', device_version:'tuple(int,int,int,int)'):
+        device_version = tuple(device_version)
+        if len(device_version) != 4 or [v for v in device_version if type(v) is not int or v < 0 or v > 255]:
+            raise ValueError(f'Bad device version {device_version}')
+        self.device_type = DeviceType(device_type)
+        self.device_version = device_version
+        self._layouts = {}
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.device_type.name} {".".join(map(str, self.device_version))}}}'
+
+    def layout(self, frame_type:type)->'tuple(struct.Struct, tuple)':
+        """Body struct and field names of frame type for this device"""
+        layout = self._layouts.get(frame_type)
+        if layout is None:
+            layout = self._layouts[frame_type] = frame_type._resolve_layout(self)
+        return layout
+
+    def supports(self, frame_type:type)->bool:
+        return is_supported(frame_type, self.device_type, self.device_version)
+
+
+_contexts = {}
+
+
+def device_context(device_type:'DeviceType|int|DeviceContext'=None, device_version:'tuple(int,int,int,int)'=None)->DeviceContext:
+    """Shared context for device type and version. Missing values are taken from process defaults.
+    DeviceContext passed as device_type is returned as is"""
+    if type(device_type) is DeviceContext:
+        return device_type
+    key = (device_type or _Device_type, tuple(device_version or _Device_version))
+    context = _contexts.get(key)
+    if context is None:
+        context = _contexts[key] = DeviceContext(*key)
+    return context
+
+
+
+#Capability matrix: command class -> {DeviceType: minimal firmware version}.
+#Filled once at import by support_only. Classes not in matrix are supported by every device
+CAPABILITIES = {}
+
 
 def support_only(devices:'list(tuple(DeviceType, tuple(int,int,int,int)))'):
     def decorator(cls):
-        old_init= cls.__init__
-        @functools.wraps(old_init, )
-        def __init__(self, *args, **kwargs):
-            if not get_ignore_type_restriction():
-                signature = inspect.signature(old_init)
-                b = signature.bind(self, *args, **kwargs)
-                b.apply_defaults()
-                arguments = b.arguments
-                device_type = arguments['device_type'] or get_default_device_type()
-                device_version = arguments['device_version'] or get_default_device_version()
-                if not next((d for d,v in devices if device_type == d and device_version >= v), None):
-                    raise Exception(f'Device {device_type} version:{device_version} does not support {self}')
-            old_init(self, *args, **kwargs)
-        cls.__init__ = __init__
+        CAPABILITIES[cls] = {DeviceType(device): tuple(version) for device, version in devices}
+        is_supported.cache_clear()
         return cls
     return decorator
 
 
+@functools.lru_cache(maxsize=None)
+def is_supported(cls:type, device_type:DeviceType, device_version:'tuple(int,int,int,int)')->bool:
+    """Check command class against capability matrix. Memoized per (class, device type, version)"""
+    for klass in cls.__mro__:
+        devices = CAPABILITIES.get(klass)
+        if devices is not None:
+            min_version = devices.get(device_type)
+            return min_version is not None and device_version >= min_version
+    return True
+
+
+def supported_cmds(device_type:DeviceType, device_version:'tuple(int,int,int,int)')->'list(type)':
+    """Registered command classes supported by device with firmware version"""
+    device_type = DeviceType(device_type)
+    device_version = tuple(device_version)
+    return [cls for cls in registered_cmds() if is_supported(cls, device_type, device_version)]
+
+
+def check_supported(cls:type, device_type:DeviceType, device_version:'tuple(int,int,int,int)'):
+    if not is_supported(cls, device_type, tuple(device_version)):
+        raise Exception(f'Device {device_type} version:{device_version} does not support {cls.__name__}')
+
+
 class Frame(abc.ABC):
     """Low level wrapper for command,response """
 
@@ -142,67 +311,138 @@ class Frame(abc.ABC):
     HEADER_LENGTH = 9
     FRAME_CRC_LENGTH = 4
     FRAME_MAX_LENGTH = 1400
+    _HEADER_STRUCT = struct.Struct('<BBHBH') #start, version, length, cmd_type, seq
+    _HEADER_CRC_STRUCT = struct.Struct('<H')
+    _FRAME_CRC_STRUCT = struct.Struct('<I')
+    _PACK_FORMAT:str = None
+    _STRUCT:struct.Struct = None
+    _FIELDS:tuple = () #names of _STRUCT fields, None if body is not flat
+    _DECODERS:dict = {} #field name -> conversion applied on first read from FrameView
+    _FIELD_INDEX:dict = {}
+    _CMD_TYPE_VALUE:int = None
+    __slots__ = ('seq', '_context')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        #precompile body layout once per class instead of parsing format on every pack
+        if '_PACK_FORMAT' in cls.__dict__ and cls._PACK_FORMAT is not None:
+            cls._STRUCT = struct.Struct(cls._PACK_FORMAT)
+            if '_FIELDS' not in cls.__dict__:
+                cls._FIELDS = None
+        cls._FIELD_INDEX = {name: i for i, name in enumerate(cls._FIELDS or ())}
+        #enum .value is a descriptor call, resolve header bytes once per class
+        cls._CMD_TYPE_VALUE = cls.CMD_TYPE.value if cls.CMD_TYPE is not None else None
 
     def __init__(self, 
                 seq:int,
-                device_type:DeviceType=None, 
+                device_type:'DeviceType|int|DeviceContext'=None, 
                 device_version:'tuple(int,int,int,int)'=None,
                 ):
+        """device_type may be DeviceContext, then it carries device version too"""
         self.seq = seq
-        self.device_type = device_type or get_default_device_type()
-        self.device_version = device_version or get_default_device_version()
+        self._context = device_context(device_type, device_version)
+        if not _Ignore_type_restriction:
+            check_supported(type(self), self._context.device_type, self._context.device_version)
+
+    @classmethod
+    def _trusted(cls, seq:int, device_type:'DeviceType|int|DeviceContext'=None, device_version:'tuple(int,int,int,int)'=None)->'Frame':
+        """Allocate frame without __init__ and setters for decode path.
+        Caller stores already unpacked values straight into slots"""
+        self = cls.__new__(cls)
+        self.seq = seq
+        context = self._context = device_context(device_type, device_version)
+        if not _Ignore_type_restriction:
+            check_supported(cls, context.device_type, context.device_version)
+        return self
+
+    @property
+    def context(self)->DeviceContext:
+        return self._context
+
+    @context.setter
+    def context(self, value:DeviceContext):
+        if type(value) is not DeviceContext:
+            raise TypeError
+        self._context = value
 
     @property
     def device_version(self)->'tuple(int,int,int,int)':
-        return self._device_version
+        return self._context.device_version
 
     @device_version.setter
     def device_version(self, value:'tuple|list(int,int,int,int)'):
-        assert type(value) is tuple or type(value) is list
-        assert len(value) == 4
-        assert not [v for v in value if type(v) is not int or v < 0 or v > 255]
-        self._device_version = value
+        self._context = device_context(self._context.device_type, value)
     
     @property
     def device_type(self)->DeviceType:
-        return self._device_type
+        return self._context.device_type
 
     @device_type.setter
     def device_type(self, value:'DeviceType|int'):
-        self._device_type = DeviceType(value)
+        self._context = device_context(DeviceType(value), self._context.device_version)
 
     @property
-    def frame(self):
-        return self.header + self.header_crc + self.payload + self.frame_crc 
+    def frame(self)->bytes:
+        return bytes(self._encoded())
+
+    def _encoded(self)->memoryview:
+        """Whole frame packed by encode_into into scratch buffer of thread, valid until next frame is packed"""
+        buffer = _scratch_buffer()
+        return memoryview(buffer)[:self.encode_into(buffer)]
+
+    def encode_into(self, buffer:'bytearray|memoryview', offset:int=0)->int:
+        """Pack whole frame into writable buffer starting at offset in a single pass.
+        Payload is packed once, CRCs are computed over the buffer in place.
+        Return frame length"""
+        if not _Ignore_type_restriction:
+            check_supported(type(self), self.device_type, self.device_version)
+        header_length = self.HEADER_LENGTH
+        length = header_length + self.payload_into(buffer, offset + header_length) + self.FRAME_CRC_LENGTH
+        if length > self.FRAME_MAX_LENGTH:
+            raise ValueError(f"{self} is too big. Max {self.FRAME_MAX_LENGTH} but pack is {length}")
+        view = memoryview(buffer)
+        self._HEADER_STRUCT.pack_into(buffer, offset, self.START, self.VERSION, length, self._CMD_TYPE_VALUE, self.seq)
+        self._HEADER_CRC_STRUCT.pack_into(buffer, offset + 7, crc_header_cached(buffer, offset))
+        end = offset + length - self.FRAME_CRC_LENGTH
+        self._FRAME_CRC_STRUCT.pack_into(buffer, end, crc32(view[offset:end]))
+        return length
 
     @property
     def header(self):
-        length = len(self.payload) + self.HEADER_LENGTH + self.FRAME_CRC_LENGTH
-        if length > self.FRAME_MAX_LENGTH:
-            raise ValueError(f"{self} is too big. Max {self.FRAME_MAX_LENGTH} but pack is {length}")
-        return (self.START.to_bytes(1, 'little')
-            + self.VERSION.to_bytes(1, 'little')
-            + length.to_bytes(2, 'little')
-            + self.CMD_TYPE.value.to_bytes(1, 'little')
-            + self.seq.to_bytes(2, 'little')
-        )
+        return bytes(self._encoded()[:self.HEADER_LENGTH - 2])
 
     @property
     def header_crc(self):
-        return crc16(self.header).to_bytes(2, 'little')
+        return bytes(self._encoded()[self.HEADER_LENGTH - 2:self.HEADER_LENGTH])
 
     @property
     def frame_crc(self):
-        return crc32(self.header + self.header_crc + self.payload).to_bytes(4, 'little')
+        return bytes(self._encoded()[-self.FRAME_CRC_LENGTH:])
 
     @abc.abstractproperty
     def cmd_payload(self):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def payload_into(self, buffer:'bytearray|memoryview', offset:int=0)->int:
+        raise NotImplementedError
+
     @abc.abstractstaticmethod
     def from_payload(payload:bytes):
         raise NotImplementedError
 
+    @classmethod
+    def _resolve_layout(cls, context:DeviceContext)->'tuple(struct.Struct, tuple)':
+        """Body layout for device context. Overridden by frames with version dependent layout"""
+        return cls._STRUCT, cls._FIELDS
+
+    @classmethod
+    def _layout(cls, body_length:int)->'tuple(struct.Struct, tuple)|None':
+        """Body struct and its field names for lazy decoding. None if body is not flat"""
+        if cls._FIELDS is None:
+            return None
+        return cls._STRUCT, cls._FIELDS
+
     @staticmethod
     def from_frame_set_type_value(cmd_set, cmd_type, cmd_id):
         pass
@@ -212,38 +452,101 @@ class Frame(abc.ABC):
         return crc16(data)
     
     @staticmethod
-    def crc(data:bytes):
-        return crc32(data)
+    def crc(data:bytes, value:int=CRC32_INIT):
+        return crc32(data, value)
 
 
     def __repr__(self):
         return f'{{{self.__class__.__name__}}}'
 
 class FrameResponse(Frame):
+    __slots__ = ()
 
     def __init__(self):
         super().__init__()
 
 
+#Command registry indexed directly by header bytes: CMD_TABLE[cmd_set][cmd_type][cmd_id].
+#Three list subscripts are cheaper than building and hashing a tuple key. Unused rows share one
+#immutable empty row, so any byte values are a valid index and unknown commands just hit None
+_EMPTY_CMD_IDS = (None, ) * 256
+_EMPTY_CMD_TYPES = (_EMPTY_CMD_IDS, ) * 256
+CMD_TABLE = [_EMPTY_CMD_TYPES] * 256
+
+
+def register_cmd(cls:type)->type:
+    """Put command class in registry under its CMD_SET, CMD_TYPE, CMD_ID"""
+    cmd_set, cmd_type, cmd_id = cls.CMD_SET.value, cls.CMD_TYPE.value, cls.CMD_ID.value
+    types = CMD_TABLE[cmd_set]
+    if types is _EMPTY_CMD_TYPES:
+        types = CMD_TABLE[cmd_set] = list(_EMPTY_CMD_TYPES)
+    ids = types[cmd_type]
+    if ids is _EMPTY_CMD_IDS:
+        ids = types[cmd_type] = list(_EMPTY_CMD_IDS)
+    registered = ids[cmd_id]
+    if registered is not None and registered.__qualname__ != cls.__qualname__:
+        logger.warning(f'{cls.__name__} replaces {registered.__name__} in command registry')
+    ids[cmd_id] = cls
+    return cls
+
+
+def lookup_cmd(cmd_set:int, cmd_type:int, cmd_id:int)->'type|None':
+    """Command class for header bytes. None for unknown command"""
+    return CMD_TABLE[cmd_set][cmd_type][cmd_id]
+
+
+def registered_cmds()->'list(type)':
+    return [cls for types in CMD_TABLE if types is not _EMPTY_CMD_TYPES 
+                for ids in types if ids is not _EMPTY_CMD_IDS 
+                    for cls in ids if cls is not None]
+
+
 class Cmd(Frame):
     CMD_SET = None
     CMD_ID = None
+    _CMD_STRUCT = struct.Struct('<BB') #CMD_SET, CMD_ID
+    _CMD_VALUES:tuple = None #CMD_SET, CMD_ID values
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.CMD_SET is not None and cls.CMD_ID is not None:
+            cls._CMD_VALUES = (cls.CMD_SET.value, cls.CMD_ID.value)
+        #every class that defines own CMD_ID is a concrete command
+        if 'CMD_ID' in cls.__dict__ and None not in (cls.CMD_SET, cls.CMD_TYPE, cls.CMD_ID):
+            register_cmd(cls)
 
     def cmd_payload(self, payload_body:bytes):
-        format = f'<BB{len(payload_body)}B' #CMD_SET, CMD_ID, BODY
-        return struct.pack(format, self.CMD_SET.value, self.CMD_ID.value, *payload_body )
+        return self._CMD_STRUCT.pack(self.CMD_SET.value, self.CMD_ID.value) + payload_body
 
     @property
-    def payload(self):
-        return self.cmd_payload(b'')
+    def payload(self)->bytes:
+        buffer = _scratch_buffer()
+        return bytes(memoryview(buffer)[:self.payload_into(buffer)])
+
+    def payload_into(self, buffer:'bytearray|memoryview', offset:int=0)->int:
+        self._CMD_STRUCT.pack_into(buffer, offset, *self._CMD_VALUES)
+        return self._CMD_STRUCT.size + self.body_into(buffer, offset + self._CMD_STRUCT.size)
+
+    def body_into(self, buffer:'bytearray|memoryview', offset:int)->int:
+        """Pack command body (payload without CMD_SET, CMD_ID). Return body length"""
+        if self._STRUCT is None:
+            return 0
+        self._STRUCT.pack_into(buffer, offset, *self._body_values())
+        return self._STRUCT.size
+
+    def _body_values(self)->tuple:
+        return ()
 
     @classmethod
     def from_payload(cls, payload:bytes, seq:int, *args, **kwargs):
-        return cls(seq)
+        return cls._trusted(seq, *args, **kwargs)
 
 class IsErrorResponse(Cmd):
     CMD_TYPE = Frame.Type.AKN
     _PACK_FORMAT = '<?' # is_error
+    _FIELDS = ('is_error', )
+    __slots__ = () #mixin: '_is_error' slot is declared by concrete classes to avoid layout conflicts
 
     @property
     def is_error(self)->bool:
@@ -255,8 +558,12 @@ class IsErrorResponse(Cmd):
             raise TypeError
         self._is_error = value
 
+    def _body_values(self)->tuple:
+        return (self.is_error, )
+
 
 class IsErrorResponseOnly(IsErrorResponse): 
+    __slots__ = ('_is_error', )
 
     def __init__(self, seq:int, is_error:bool=False, device_type:DeviceType=None, device_version:'tuple(int,int,int,int)'=None):
         super().__init__(seq, device_type, device_version)
@@ -265,13 +572,96 @@ class IsErrorResponseOnly(IsErrorResponse):
     def __repr__(self):
         return f'{{{type(self).__name__} is_error:{self.is_error}}}'
 
-    @property
-    def payload(self)->bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_error)
-        return super().cmd_payload(payload_body)
-
     @classmethod
     def from_payload(cls, payload:bytes, seq, device_type=None, device_version=None):
-        is_error, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(seq, is_error, device_type, device_version)
+        is_error, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        return self
+
+
+
+class FrameView:
+    """Read only lazy view over encoded frame.
+    Holds memoryview of receive buffer, nothing is copied. Header fields are unpacked on access,
+    body is unpacked on first field read and every field is converted (enum, ip, ...) once on its first read.
+    Fields of bodies that are not flat are taken from full frame built by to_frame().
+    Buffer must not be reused while view is alive"""
+
+    __slots__ = ('_view', '_frame_type', '_device_type', '_device_version', '_values', '_cache', '_frame')
+
+    def __init__(self, frame_type:type, view:memoryview, device_type:'DeviceType|DeviceContext'=None, device_version:'tuple(int,int,int,int)'=None):
+        self._view = view
+        self._frame_type = frame_type
+        #context is resolved only when asked for
+        self._device_type = device_type
+        self._device_version = device_version
+        self._values = None
+        self._cache = None
+        self._frame = None
 
+    def __repr__(self):
+        return f'{{View {self._frame_type.__name__} seq:{self.seq}}}'
+
+    @property
+    def frame_type(self)->type:
+        return self._frame_type
+
+    @property
+    def context(self)->DeviceContext:
+        return device_context(self._device_type, self._device_version)
+
+    @property
+    def device_type(self)->DeviceType:
+        return self.context.device_type
+
+    @property
+    def device_version(self)->'tuple(int,int,int,int)':
+        return self.context.device_version
+
+    @property
+    def seq(self)->int:
+        return Frame._HEADER_STRUCT.unpack_from(self._view)[4]
+
+    @property
+    def frame(self)->memoryview:
+        return self._view
+
+    @property
+    def payload(self)->memoryview:
+        return self._view[Frame.HEADER_LENGTH:-Frame.FRAME_CRC_LENGTH]
+
+    @property
+    def body(self)->memoryview:
+        return self._view[Frame.HEADER_LENGTH + Cmd._CMD_STRUCT.size:-Frame.FRAME_CRC_LENGTH]
+
+    def to_frame(self)->Frame:
+        """Build full frame object. Built once"""
+        if self._frame is None:
+            self._frame = self._frame_type.from_payload(self.body, self.seq, self._device_type, self._device_version)
+        return self._frame
+
+    def __getattr__(self, name:str):
+        if name[0] == '_':
+            raise AttributeError(name)
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = {}
+        elif name in cache:
+            return cache[name]
+        frame_type = self._frame_type
+        values = self._values
+        if values is None:
+            body_offset = Frame.HEADER_LENGTH + Cmd._CMD_STRUCT.size
+            layout = frame_type._layout(len(self._view) - body_offset - Frame.FRAME_CRC_LENGTH)
+            values = self._values = layout[0].unpack_from(self._view, body_offset) if layout and layout[0] else ()
+        index = frame_type._FIELD_INDEX.get(name)
+        if index is not None and index < len(values):
+            value = values[index]
+            decoder = frame_type._DECODERS.get(name)
+            if decoder is not None:
+                value = decoder(value)
+        else:
+            value = getattr(self.to_frame(), name)
+        cache[name] = value
+        return value
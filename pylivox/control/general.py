@@ -9,12 +9,14 @@ import ipaddress
 # project
 from pylivox.control.frame import (Frame, Cmd,
                                    IsErrorResponse, IsErrorResponseOnly,
-                                   DeviceType, get_default_device_type, get_default_device_version, get_ignore_type_restriction,
+                                   DeviceType, DeviceContext, device_context,
+                                   get_default_device_type, get_default_device_version, get_ignore_type_restriction,
                                    support_only, )
 
 
 class General(Cmd):
     CMD_SET = Frame.Set.GENERAL
+    __slots__ = ()
 
 
 class WorkState():
@@ -43,7 +45,9 @@ class WorkState():
 
 class Broadcast():
     _PACK_FORMAT = '<14sBx'  # 14 byte serial, ip_range, reserved
-    _PACK_LENGTH = struct.calcsize(_PACK_FORMAT)
+    _STRUCT = struct.Struct(_PACK_FORMAT)
+    _PACK_LENGTH = _STRUCT.size
+    __slots__ = ('_serial', '_ip_range')
 
     def __init__(self, serial: bytes, ip_range: int):
         self.serial = serial
@@ -76,28 +80,35 @@ class Broadcast():
 
     @property
     def payload(self) -> bytes:
-        return struct.pack(self._PACK_FORMAT, self.serial, self.ip_range)
+        return self._STRUCT.pack(self.serial, self.ip_range)
+
+    def payload_into(self, buffer: 'bytearray|memoryview', offset: int = 0) -> int:
+        self._STRUCT.pack_into(buffer, offset, self.serial, self.ip_range)
+        return self._PACK_LENGTH
 
     @classmethod
     def from_payload(cls, payload: bytes) -> 'Broadcast':
-        serial, ip_range = struct.unpack(cls._PACK_FORMAT, payload)
-        serial = bytes(serial)
-        return cls(serial, ip_range)
+        serial, ip_range = cls._STRUCT.unpack(payload)
+        self = cls.__new__(cls)
+        self._serial = serial
+        self._ip_range = ip_range
+        return self
 
 
 class BroadcastMsg(General):
     CMD_TYPE = Frame.Type.MSG
     CMD_ID = Frame.SetGeneral.BROADCAST_MESSAGE
     _PACK_FORMAT = f'<B2x'  # {broadcast}, dev_type, reserved
+    __slots__ = ('_broadcast', '_dev_type')
 
     def __init__(self, 
                 broadcast: Broadcast, 
                 seq:int,
-                device_type: 'DeviceType|int' = None, 
+                device_type: 'DeviceType|int|DeviceContext' = None, 
                 device_version: 'tuple(int,int,int,int)' = None):
         super().__init__(seq, device_type, device_version)
         self.broadcast = broadcast
-        self.dev_type = device_type
+        self.dev_type = self.device_type
 
     def __repr__(self):
         return f'{{{self.__class__} serial:{self._broadcast.serial} device{self.dev_type} }}'
@@ -124,27 +135,37 @@ class BroadcastMsg(General):
             raise TypeError
         self._dev_type = value
 
-    @property
-    def payload(self):
-        payload_body = self.broadcast.payload + \
-            struct.pack(self._PACK_FORMAT, self.dev_type.value)
-        return super().cmd_payload(payload_body)
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        length = self.broadcast.payload_into(buffer, offset)
+        self._STRUCT.pack_into(buffer, offset + length, self.dev_type.value)
+        return length + self._STRUCT.size
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type=None, device_version=None) -> 'BroadcastMsg':
         broadcast_bytes = payload[:Broadcast._PACK_LENGTH]
         broadcast = Broadcast.from_payload(broadcast_bytes)
-        dev_type, = struct.unpack(
-            cls._PACK_FORMAT, payload[Broadcast._PACK_LENGTH:])
-        assert DeviceType(dev_type) == device_type
-        return cls(broadcast, seq, dev_type, device_version)
+        dev_type, = cls._STRUCT.unpack_from(payload, Broadcast._PACK_LENGTH)
+        dev_type = DeviceType(dev_type)
+        if device_type is not None:
+            expected = device_context(device_type, device_version)
+            if dev_type != expected.device_type:
+                raise ValueError(f'Broadcast of {dev_type} but {expected.device_type} expected')
+            device_version = expected.device_version
+        self = cls._trusted(seq, dev_type, device_version)
+        self._broadcast = broadcast
+        self._dev_type = dev_type
+        return self
 
 
 class Handshake(General):
     # TODO description
     CMD_ID = Frame.SetGeneral.HANDSHAKE
     CMD_TYPE = Frame.Type.CMD
-    # _PACK_FORMAT = '<4sHH' #ip, point_port, cmd_port
+    _STRUCT_IMU = struct.Struct('<4sHHH')  # ip, point_port, cmd_port, imu_port
+    _STRUCT_NO_IMU = struct.Struct('<4sHH')  # ip, point_port, cmd_port
+    _FIELDS = ('ip', 'point_port', 'cmd_port', 'imu_port')
+    _DECODERS = {'ip': ipaddress.IPv4Address}
+    __slots__ = ('_ip', 'point_port', 'cmd_port', 'imu_port')
 
     def __init__(self,
                  ip: ipaddress.IPv4Address,
@@ -165,15 +186,27 @@ class Handshake(General):
     def __repr__(self):
         return f'{{{type(self).__name__} ip:{self.ip} point_port:{self.point_port} cmd_port:{self.cmd_port} imu_port:{self.imu_port}}}'
 
-    @property
-    def payload(self):
-        if ((self.device_type == DeviceType.HORIZON and self.device_version >= (6, 4, 0, 0)) or
-            (self.device_type == DeviceType.TELE_15 and self.device_version >= (3, 7, 0, 0))
+    @classmethod
+    def _layout(cls, body_length: int):
+        if body_length == cls._STRUCT_IMU.size:
+            return cls._STRUCT_IMU, cls._FIELDS
+        return cls._STRUCT_NO_IMU, cls._FIELDS[:3]
+
+    @classmethod
+    def _resolve_layout(cls, context: DeviceContext):
+        if ((context.device_type == DeviceType.HORIZON and context.device_version >= (6, 4, 0, 0)) or
+            (context.device_type == DeviceType.TELE_15 and context.device_version >= (3, 7, 0, 0))
             ):
-            payload_body = struct.pack('<4sHHH', self.ip.packed, self.point_port, self.cmd_port, self.imu_port)
+            return cls._STRUCT_IMU, cls._FIELDS
+        return cls._STRUCT_NO_IMU, cls._FIELDS[:3]
+
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        layout, fields = self._context.layout(type(self))
+        if layout is self._STRUCT_IMU:
+            layout.pack_into(buffer, offset, self.ip.packed, self.point_port, self.cmd_port, self.imu_port)
         else:
-            payload_body = struct.pack('<4sHH', self.ip.packed, self.point_port, self.cmd_port)
-        return super().cmd_payload(payload_body)
+            layout.pack_into(buffer, offset, self.ip.packed, self.point_port, self.cmd_port)
+        return layout.size
 
     @property
     def ip(self) -> ipaddress.IPv4Address:
@@ -189,58 +222,70 @@ class Handshake(General):
                     seq:int,
                     device_type: DeviceType = None,
                     device_version: 'tuple(int,int,int,int)' = None):
-        device_type = device_type or get_default_device_type()
-        device_version = device_version or get_default_device_version()
         imu_port = None
-        if len(payload) == struct.calcsize('<4sHHH'):
-            ip, point_port, cmd_port, imu_port = struct.unpack('<4sHHH', payload)
-        elif( len(payload) == struct.calcsize('4sHH')):
-            ip, point_port, cmd_port = struct.unpack('<4sHH', payload)
+        if len(payload) == cls._STRUCT_IMU.size:
+            ip, point_port, cmd_port, imu_port = cls._STRUCT_IMU.unpack(payload)
+        elif len(payload) == cls._STRUCT_NO_IMU.size:
+            ip, point_port, cmd_port = cls._STRUCT_NO_IMU.unpack(payload)
         else:
             raise ValueError
-        return cls(ip, point_port, cmd_port, imu_port, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self._ip = ipaddress.IPv4Address(ip)
+        self.point_port = point_port
+        self.cmd_port = cmd_port
+        self.imu_port = imu_port
+        return self
 
 
 class HandshakeResponse(General, IsErrorResponseOnly):
     CMD_ID = Frame.SetGeneral.HANDSHAKE
+    __slots__ = ()
 
 
 class QueryDeviceInformation(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.QUERY_DEVICE_INFORMATION
+    __slots__ = ()
 
 
 class QueryDeviceInformationResponse(General, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.QUERY_DEVICE_INFORMATION
     _PACK_FORMAT = '<?4B'  # is_error, firmware version
+    __slots__ = ('_is_error', )
 
     def __init__(self, seq:int, is_error: bool = False, device_type: DeviceType = None, device_version: 'tuple(int,int,int,int)' = None,):
         super().__init__(seq, device_type, device_version)
         self.is_error = is_error
 
-    @property
-    def payload(self):
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, *self.device_version)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, *self.device_version)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type=None, device_version=None):
-        is_error, *firmware_version = struct.unpack(cls._PACK_FORMAT, payload)
-        assert tuple(firmware_version) == device_version
-        return cls(seq, is_error, device_type, firmware_version)
+        is_error, *firmware_version = cls._STRUCT.unpack(payload)
+        firmware_version = tuple(firmware_version)
+        if type(device_type) is DeviceContext:
+            device_type, device_version = device_type.device_type, device_type.device_version
+        if device_version is not None and firmware_version != tuple(device_version):
+            raise ValueError(f'Firmware {firmware_version} but {device_version} expected')
+        self = cls._trusted(seq, device_type, firmware_version)
+        self._is_error = is_error
+        return self
 
 
 class Heartbeat(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.HEARTBEAT
+    __slots__ = ()
 
 
 class HeartbeatResponse(General, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.HEARTBEAT
     _PACK_FORMAT = '<?BBI'  # is_error, work_state, feature, ack_msg
+    _FIELDS = ('is_error', 'work_state', 'feature_msg', 'ack_msg')
+    __slots__ = ('_is_error', '_work_state', '_feature_msg', '_ack_msg')
 
     def __init__(self,
                  work_state: 'WorkState.Lidar|WorkState.Hub|int',
@@ -291,22 +336,26 @@ class HeartbeatResponse(General, IsErrorResponse):
         value.to_bytes(4, 'little')
         self._ack_msg = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, self.work_state, self.feature_msg, self.ack_msg)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.work_state, self.feature_msg, self.ack_msg)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, work_state, feature, ack_msg = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(work_state, feature, ack_msg, seq, is_error, device_type, device_version)
+        is_error, work_state, feature, ack_msg = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self._work_state = WorkState.Hub(work_state) if self._context.device_type is DeviceType.HUB else WorkState.Lidar(work_state)
+        self._feature_msg = feature
+        self._ack_msg = ack_msg
+        return self
 
 
 class StartStopSampling(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.START_STOP_SAMPLING
     _PACK_FORMAT = '<?'  # is_start
+    _FIELDS = ('is_start', )
+    __slots__ = ('_is_start', )
 
     def __init__(self,
                  is_start: bool,
@@ -330,26 +379,29 @@ class StartStopSampling(General):
             raise TypeError
         self._is_start = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_start)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_start, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_start,  = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(is_start, seq, device_type, device_version)
+        is_start, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_start = is_start
+        return self
 
 
 class StartStopSamplingResponse(General, IsErrorResponseOnly):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.START_STOP_SAMPLING
+    __slots__ = ()
 
 
 class ChangeCoordinateSystem(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.CHANGE_COORDINATE_SYSTEM
     _PACK_FORMAT = '<?'  # Is_Spherical_Coordinate?
+    _FIELDS = ('is_spherical', )
+    __slots__ = ('_is_spherical', )
 
     def __init__(self, 
                 is_spherical: bool, 
@@ -372,36 +424,41 @@ class ChangeCoordinateSystem(General):
             raise TypeError
         self._is_spherical = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_spherical)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_spherical, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_spherical, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(is_spherical, seq, device_type, device_version)
+        is_spherical, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_spherical = is_spherical
+        return self
 
 
 class ChangeCoordinateSystemResponse(General, IsErrorResponseOnly):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.CHANGE_COORDINATE_SYSTEM
+    __slots__ = ()
 
 
 class Disconnect(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.DISCONNECT
+    __slots__ = ()
 
 
 class DisconnectResponse(General, IsErrorResponseOnly):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.DISCONNECT
+    __slots__ = ()
 
 
 class PushAbnormalStatusInformation(General):
     CMD_TYPE = Frame.Type.MSG
     CMD_ID = Frame.SetGeneral.PUSH_ABNORMAL_STATUS_INFORMATION
     _PACK_FORMAT = '<I'  # status_code
+    _FIELDS = ('status_code', )
+    __slots__ = ('_status_code', )
 
     def __init__(self, 
                 status_code: int, 
@@ -421,20 +478,25 @@ class PushAbnormalStatusInformation(General):
             raise TypeError
         self._status_code = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.status_code)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.status_code, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int ,device_type = None, device_version = None):
-        status_code, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(status_code, seq, device_type, device_version)
+        status_code, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._status_code = status_code
+        return self
 
 
 class ConfigureStaticDynamicIp(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.CONFIGURE_STATIC_DYNAMIC_IP
+    _STRUCT_FULL = struct.Struct('<?4s4s4s')  # is_static, ip, mask, gw
+    _STRUCT_SHORT = struct.Struct('<?4s')  # is_static, ip
+    _FIELDS = ('is_static', 'ip', 'mask', 'gw')
+    _DECODERS = {'ip': ipaddress.IPv4Address, 'mask': ipaddress.IPv4Address, 'gw': ipaddress.IPv4Address}
+    __slots__ = ('_is_static', '_ip', '_mask', '_gw')
 
     def __init__(self,
                  is_static: bool,
@@ -454,6 +516,12 @@ class ConfigureStaticDynamicIp(General):
     def __repr__(self):
         return f'{{{type(self).__name__} static:{self.is_static} ip:{self.ip} mask:{self.mask} gw:{self.gw}}}'
 
+    @classmethod
+    def _layout(cls, body_length: int):
+        if body_length == cls._STRUCT_FULL.size:
+            return cls._STRUCT_FULL, cls._FIELDS
+        return cls._STRUCT_SHORT, cls._FIELDS[:-2]
+
     @property
     def is_static(self) -> bool:
         return self._is_static
@@ -498,46 +566,67 @@ class ConfigureStaticDynamicIp(General):
             raise TypeError
         self._is_static = value
 
-    @property
-    def payload(self) -> bytes:
-        if ((self.device_type == DeviceType.HORIZON and self.device_version >= (6, 4, 0, 0)) or
-            (self.device_type == DeviceType.TELE_15 and self.device_version >= (7, 3, 0, 0)) or
-            (self.device_type == DeviceType.MID_70 and self.device_version >= (10, 3, 0, 0)) or
-            (self.device_type == DeviceType.AVIA and self.device_version >= (11, 6, 0, 0))
+    @classmethod
+    def _resolve_layout(cls, context: DeviceContext):
+        if ((context.device_type == DeviceType.HORIZON and context.device_version >= (6, 4, 0, 0)) or
+            (context.device_type == DeviceType.TELE_15 and context.device_version >= (7, 3, 0, 0)) or
+            (context.device_type == DeviceType.MID_70 and context.device_version >= (10, 3, 0, 0)) or
+            (context.device_type == DeviceType.AVIA and context.device_version >= (11, 6, 0, 0))
             ):
-            payload_body = struct.pack('<?4s4s4s', self.is_static, self.ip.packed, self.mask.packed, self.gw.packed)
-        else:
-            payload_body = struct.pack('<?4s', self.is_static, self.ip.packed)
-        return super().cmd_payload(payload_body)
+            return cls._STRUCT_FULL, cls._FIELDS
+        return cls._STRUCT_SHORT, cls._FIELDS[:-2]
+
+    def _is_full_layout(self) -> bool:
+        return self._context.layout(type(self))[0] is self._STRUCT_FULL
+
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        if self._is_full_layout():
+            self._STRUCT_FULL.pack_into(buffer, offset, self.is_static, self.ip.packed, self.mask.packed, self.gw.packed)
+            return self._STRUCT_FULL.size
+        self._STRUCT_SHORT.pack_into(buffer, offset, self.is_static, self.ip.packed)
+        return self._STRUCT_SHORT.size
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int ,device_type = None, device_version = None):
-        device_type = device_type or get_default_device_type() 
-        device_version = device_version or get_default_device_version()
         mask = None
         gw = None
-        if len(payload) == struct.calcsize('<?4s4s4s'):
-            is_static, ip, mask, gw = struct.unpack('<?4s4s4s', payload)
-        elif len(payload) == struct.calcsize('<?4s'):
-            is_static, ip = struct.unpack('<?4s', payload)
+        if len(payload) == cls._STRUCT_FULL.size:
+            is_static, ip, mask, gw = cls._STRUCT_FULL.unpack(payload)
+        elif len(payload) == cls._STRUCT_SHORT.size:
+            is_static, ip = cls._STRUCT_SHORT.unpack(payload)
         else:
             raise ValueError
-        return cls(is_static, ip, mask, gw, seq, device_type, device_version)
+        return cls._trusted_ip(seq, device_type, device_version, is_static, ip, mask, gw)
+
+    @classmethod
+    def _trusted_ip(cls, seq:int, device_type, device_version, is_static:bool, ip:bytes, mask:'bytes|None', gw:'bytes|None'):
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_static = is_static
+        self._ip = ipaddress.IPv4Address(ip)
+        self._mask = ipaddress.IPv4Address(mask) if mask else None
+        self._gw = ipaddress.IPv4Address(gw) if gw else None
+        return self
 
 
 class ConfigureStaticDynamicIpResponse(General, IsErrorResponseOnly):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.CONFIGURE_STATIC_DYNAMIC_IP
+    __slots__ = ()
 
 
 class GetDeviceIpInformation(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.GET_DEVICE_IP_INFORMATION
+    __slots__ = ()
 
 
 class GetDeviceIpInformationResponse(ConfigureStaticDynamicIp, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.GET_DEVICE_IP_INFORMATION
+    _STRUCT_FULL = struct.Struct('<??4s4s4s')  # is_error, is_static, ip, mask, gw
+    _STRUCT_SHORT = struct.Struct('<??4s')  # is_error, is_static, ip
+    _FIELDS = ('is_error', 'is_static', 'ip', 'mask', 'gw')
+    __slots__ = ('_is_error', )
 
     def __init__(self,
                  is_static: bool,
@@ -555,29 +644,26 @@ class GetDeviceIpInformationResponse(ConfigureStaticDynamicIp, IsErrorResponse):
     def __repr__(self):
         return f'{{{type(self).__name__} error:{self.is_error} static:{self.is_static} ip:{self.ip} mask{self.mask} gw:{self.gw}}}'
 
-    @property
-    def payload(self) -> bytes:
-        if ((self.device_type == DeviceType.HORIZON and self.device_version >= (6, 4, 0, 0)) or
-            (self.device_type == DeviceType.TELE_15 and self.device_version >= (7, 3, 0, 0)) or
-            (self.device_type == DeviceType.MID_70 and self.device_version >= (10, 3, 0, 0)) or
-            (self.device_type == DeviceType.AVIA and self.device_version >= (11, 6, 0, 0))
-                ):
-            payload_body = struct.pack('<??4s4s4s', self.is_error, self.is_static, self.ip.packed, self.mask.packed, self.gw.packed)
-        else:
-            payload_body = struct.pack('<??4s', self._is_error, self.is_static, self.ip.packed)
-        return super().cmd_payload(payload_body)
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        if self._is_full_layout():
+            self._STRUCT_FULL.pack_into(buffer, offset, self.is_error, self.is_static, self.ip.packed, self.mask.packed, self.gw.packed)
+            return self._STRUCT_FULL.size
+        self._STRUCT_SHORT.pack_into(buffer, offset, self.is_error, self.is_static, self.ip.packed)
+        return self._STRUCT_SHORT.size
 
     @classmethod
     def from_payload(cls, payload, seq:int, device_type = None, device_version = None):
-        device_type = device_type or get_default_device_type()
-        device_version = device_version or get_default_device_version()
         mask = None
         gw = None
-        if len(payload) == struct.calcsize('<??4s4s4s'):
-            is_error, is_static, ip, mask, gw = struct.unpack('<??4s4s4s', payload)
-        elif len(payload) == struct.calcsize('<??4s'):
-            is_error, is_static, ip = struct.unpack('<??4s', payload)
-        return cls(is_static, ip, mask, gw, seq, is_error, device_type, device_version)
+        if len(payload) == cls._STRUCT_FULL.size:
+            is_error, is_static, ip, mask, gw = cls._STRUCT_FULL.unpack(payload)
+        elif len(payload) == cls._STRUCT_SHORT.size:
+            is_error, is_static, ip = cls._STRUCT_SHORT.unpack(payload)
+        else:
+            raise ValueError
+        self = cls._trusted_ip(seq, device_type, device_version, is_static, ip, mask, gw)
+        self._is_error = is_error
+        return self
 
 
 @support_only([
@@ -592,6 +678,8 @@ class RebootDevice(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.REBOOT_DEVICE
     _PACK_FORMAT = '<H'  # timeout
+    _FIELDS = ('timeout', )
+    __slots__ = ('_timeout', )
 
     def __init__(self, 
                 timeout: int, 
@@ -614,15 +702,15 @@ class RebootDevice(General):
             raise TypeError
         self._timeout = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.timeout)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.timeout, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        timeout, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(timeout, seq, device_type, device_version)
+        timeout, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._timeout = timeout
+        return self
 
 
 @support_only([
@@ -636,9 +724,11 @@ class RebootDevice(General):
 class RebootDeviceResponse(General, IsErrorResponseOnly):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.REBOOT_DEVICE
+    __slots__ = ()
 
 
 class ConfigurationParameter:
+    __slots__ = ('_key', '_value', 'length')
 
     class Key(enum.Enum):
         HIGH_SENSITIVITY_FUNCTION = 1
@@ -655,6 +745,8 @@ class ConfigurationParameter:
         READING_PARAMETER_LENGTH_LIMIT = 6
         THE_NUMBER_OF_PARAMETERS_DOES_NOT_MATCH = 7
 
+    _STRUCT = struct.Struct('<HHB')  # key, length, value
+
     TYPE_DIC = {
         Key.HIGH_SENSITIVITY_FUNCTION: bool,
         Key.SWITCH_REPETITIVE_NON_REPETITIVE_SCANNING_PATTERN: bool,
@@ -692,13 +784,21 @@ class ConfigurationParameter:
 
     @property
     def payload(self) -> bytes:
-        return struct.pack('<HHB', self.key.value, self.length, self.value)
+        return self._STRUCT.pack(self.key.value, self.length, self.value)
+
+    def payload_into(self, buffer: 'bytearray|memoryview', offset: int = 0) -> int:
+        self._STRUCT.pack_into(buffer, offset, self.key.value, self.length, self.value)
+        return self._STRUCT.size
 
     @classmethod
     def from_payload(cls, payload: bytes) -> 'ConfigurationParameter':
-        length, = struct.unpack('<H', payload[2:4])
-        key, length, value = struct.unpack('<HHB', payload[:length])
-        return cls(key, value)
+        key, length, value = cls._STRUCT.unpack_from(payload)
+        key = cls.Key(key)
+        self = cls.__new__(cls)
+        self._key = key
+        self._value = cls.TYPE_DIC[key](value)
+        self.length = 5
+        return self
 
     @classmethod
     def from_payload_list(cls, payload: bytes) -> 'list(ConfigurationParameter)':
@@ -721,6 +821,7 @@ class ConfigurationParameter:
 class WriteConfigurationParameters(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.WRITE_CONFIGURATION_PARAMETERS
+    __slots__ = ('_param_list', )
 
     def __init__(self, 
                 param_list: 'list(ConfigurationParameter)|bytes', 
@@ -736,19 +837,23 @@ class WriteConfigurationParameters(General):
 
     @param_list.setter
     def param_list(self, value: 'list(ConfigurationParameter)|bytes'):
-        if type(value) is bytes:
+        if type(value) is bytes or type(value) is memoryview:
             value = ConfigurationParameter.from_payload_list(value)
         elif type(value) is not list or [parameter for parameter in value if type(parameter) is not ConfigurationParameter]:
             raise TypeError
         self._param_list = value
 
-    @property
-    def payload(self) -> bytes:
-        return super().cmd_payload(b''.join([param.payload for param in self.param_list]))
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        length = 0
+        for param in self.param_list:
+            length += param.payload_into(buffer, offset + length)
+        return length
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        return cls(payload, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self._param_list = ConfigurationParameter.from_payload_list(payload)
+        return self
 
 
 @support_only([
@@ -762,6 +867,9 @@ class WriteConfigurationParametersResponse(General, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.WRITE_CONFIGURATION_PARAMETERS
     _PACK_FORMAT = '<?HB'  # is_error, error_key, error_code
+    _FIELDS = ('is_error', 'error_key', 'error_code')
+    _DECODERS = {'error_key': ConfigurationParameter.Key, 'error_code': ConfigurationParameter.ErrorCode}
+    __slots__ = ('_is_error', '_key', 'error_key', '_error_code')
 
     def __init__(self,
                  error_key: 'ConfigurationParameter.Key|int',
@@ -800,16 +908,17 @@ class WriteConfigurationParametersResponse(General, IsErrorResponse):
             raise TypeError
         self._error_code = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, self.error_key.value, self.error_code.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.error_key.value, self.error_code.value)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, error_key, error_code = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(error_key, error_code, seq, is_error, device_type, device_version)
+        is_error, error_key, error_code = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self.error_key = ConfigurationParameter.Key(error_key)
+        self._error_code = ConfigurationParameter.ErrorCode(error_code)
+        return self
 
 
 @support_only([
@@ -822,6 +931,9 @@ class WriteConfigurationParametersResponse(General, IsErrorResponse):
 class ReadConfigurationParameters(General):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetGeneral.READ_CONFIGURATION_PARAMETERS
+    _QUANTITY_STRUCT = struct.Struct('<B')  # keys_quantity
+    _KEY_STRUCT = struct.Struct('<H')  # key
+    __slots__ = ('_keys_quantity', '_keys')
 
     def __init__(self, 
                 keys_quantity: int, 
@@ -856,11 +968,13 @@ class ReadConfigurationParameters(General):
             raise TypeError
         self._keys = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            f'<B{self.keys_quantity}H', self.keys_quantity, *[key.value for key in self.keys])
-        return super().cmd_payload(payload_body)
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        self._QUANTITY_STRUCT.pack_into(buffer, offset, self.keys_quantity)
+        length = self._QUANTITY_STRUCT.size
+        for key in self.keys[:self.keys_quantity]:
+            self._KEY_STRUCT.pack_into(buffer, offset + length, key.value)
+            length += self._KEY_STRUCT.size
+        return length
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
@@ -868,7 +982,10 @@ class ReadConfigurationParameters(General):
         keys_bytes = [payload[2*i+1:2*i+3] for i in range(keys_quantity)]
         keys = [ConfigurationParameter.Key(
             int.from_bytes(key, 'little')) for key in keys_bytes]
-        return cls(keys_quantity, keys, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self._keys_quantity = keys_quantity
+        self._keys = keys
+        return self
 
 
 @support_only([
@@ -881,6 +998,10 @@ class ReadConfigurationParameters(General):
 class ReadConfigurationParametersResponse(General, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetGeneral.READ_CONFIGURATION_PARAMETERS
+    _PACK_FORMAT = '<?HB'  # is_error, error_key, error_code, {param_list}
+    _FIELDS = ('is_error', 'error_key', 'error_code')
+    _DECODERS = {'error_key': ConfigurationParameter.Key, 'error_code': ConfigurationParameter.ErrorCode}
+    __slots__ = ('_is_error', '_error_key', '_error_code', '_param_list')
 
     def __init__(self,
                  error_key: 'ConfigurationParameter.Key|int',
@@ -930,14 +1051,19 @@ class ReadConfigurationParametersResponse(General, IsErrorResponse):
             raise TypeError
         self._param_list = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(f'<?HB', self.is_error, self.error_key.value,
-                                   self.error_code.value) + b''.join([param.payload for param in self.param_list])
-        return super().cmd_payload(payload_body)
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        self._STRUCT.pack_into(buffer, offset, self.is_error, self.error_key.value, self.error_code.value)
+        length = self._STRUCT.size
+        for param in self.param_list:
+            length += param.payload_into(buffer, offset + length)
+        return length
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, error_key, error_code = struct.unpack('<?HB', payload[:4])
-        param_list = ConfigurationParameter.from_payload_list(payload[4:])
-        return cls(error_key, error_code, param_list, seq, is_error, device_type, device_version)
+        is_error, error_key, error_code = cls._STRUCT.unpack_from(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self._error_key = ConfigurationParameter.Key(error_key)
+        self._error_code = ConfigurationParameter.ErrorCode(error_code)
+        self._param_list = ConfigurationParameter.from_payload_list(payload[cls._STRUCT.size:])
+        return self
@@ -1,438 +1,574 @@
-# #TODO description
-# #std
-# import enum
-# import struct 
-# #proj
-# from pylivox.control.frame import Frame, FrameResponse
-# from . import general
-
-
-# # def get_slices(data:bytes, item_size:int):
-# #     try:
-# #         slices = i*DeviceInfo.PACK_SIZE: DeviceInfo.PACK_SIZE] for i in range(devices_info / DeviceInfo.PACK_SIZE)]
-# #         ##################TODO GET SLICES. uSE IT TO MAKE LISTS 
-# #     except TypeError:
-# #         raise ValueError(f'Bad devices_info format')
-
-# class BroadCastCode:
-
-#     def _broadcast_pars(self, broadcast:'general.BroadcastMsg.Broadcast|bytes')->bytes:
-#         if type(broadcast) is bytes:
-#             broadcast = general.BroadcastMsg.Broadcast.from_payload(broadcast)
-#         elif type(broadcast) is not general.BroadcastMsg.Broadcast:
-#             raise TypeError(f'Bad type for broadcast. Expect "Broadcast" or "bytes". Got {type(broadcast)}')
-#         self._broadcast = broadcast.payload
-
-#     @property
-#     def broadcast(self)->general.BroadcastMsg.Broadcast:
-#         return general.BroadcastMsg.Broadcast(self._broadcast)
-
-
-# class Hub(Frame):
-#     #TODO description 
-#     CMD_SET = 2
-#     CMD_ID = None
-#     CMD_TYPE = None
-
-#     def __init__(self):
-#         #TODO description
-#         super().__init__()
-#         self.cmd_set = self.CMD_SET
-#         self.cmd_id = None
-
-# class _HubGeneralResponse(FrameResponse, Hub) :
-#     FRAME_TYPE = Frame.Type.AKN
-#     __PACK_FORMAT = '<B?' #CMD_ID, result
-
-
-# class QueryConnectedLidarDeviceCmd(Hub):
-#     CMD_ID = 0x00
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
-
-#     def __init__(self):
-#         super().__init__()
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(QueryConnectedLidarDeviceCmd.__PACK_FORMAT, payload)
-#         QueryConnectedLidarDeviceCmd._check_cmd_id(cmd_id)
-#         return QueryConnectedLidarDeviceCmd()
-
-# class LidarPosition:
-#     class Enum(enum.Enum):
-#         left   = 1,
-#         middle = 2,
-#         right  = 3
-#     def _lidar_position_pars(self, position:'Enum|int'):
-#         if type(position) is int:
-#             position = self.Enum(position)
-#         elif type(position) is not self.Enum:
-#             raise TypeError(f'Bad type for position. Expect "Enum" or "int". Got {type(position)}')
-#         self._lidar_position = position.value
-
-#     @property
-#     def lidar_position(self)->Enum:
-#         return self.Enum(self._lidar_position)
-
-# class DeviceInfo:
-#     __PACK_FORMAT = f'<{general.BroadcastMsg.Broadcast.PACK_SIZE}sBIBB' #broadcast, reserved, dev_type, version, slot_id, lidar_position
-#     PACK_SIZE = struct.calcsize(__PACK_FORMAT)
-
-#     def __init__(self, broadcast:'general.BroadcastMsg.Broadcast|bytes', 
-#                         dev_type:'general.DeviceType|int', 
-#                         version:int, 
-#                         slot_id:int, 
-#                         lidar_position:'LidarPosition|int'):
-#         super().__init__()
-#         self._broadcast_pars(broadcast)
-#         self._dev_type_pars(dev_type)
-#         self._lidar_position_pars(lidar_position)
-#         self.version = version
-#         self.slot_id = slot_id
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self._broadcast, self._dev_type, self.version, self.slot_id, self._lidar_id )
-    
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         broadcast, dev_type, version, slot_id, lidar_id = struct.unpack(DeviceInfo.__PACK_FORMAT, payload)
-#         DeviceInfo(broadcast, dev_type, version, slot_id, lidar_id)
-
-# class QueryConnectedLidarDeviceResponse(_HubGeneralResponse, QueryConnectedLidarDeviceCmd, 
-#         BroadCastCode, general.DeviceType, LidarPosition):
-
- 
-#     def __init__(self, result:bool, devices_info:'list[DeviceInfo]|bytes'):
-#         super().__init__()
-#         self.result = result
-#         DeviceInfo = self.DeviceInfo
-#         if type(devices_info) is bytes:
-#             try:
-#                 items = [ devices_info[i*DeviceInfo.PACK_SIZE: DeviceInfo.PACK_SIZE] for i in range(devices_info / DeviceInfo.PACK_SIZE)]
-#             except TypeError:
-#                 raise ValueError(f'Bad devices_info format')
-#             devices_info = [ self.DeviceInfo.from_payload(item) for item in items]
-#         elif type(devices_info) is not list or any(map(lambda i: type(i) is not DeviceInfo, devices_info)):
-#             raise ValueError('Bad type for devices_info. Expected "List[DeviceInfo]" or "int"')
-#         self._devices_info = b''.join([info.payload for info in devices_info])
-#         self.num_devices = len(devices_info)
-
-#     @property
-#     def devices_info(self)->'list[DeviceInfo]':
-#         DeviceInfo = self.DeviceInfo
-#         items = [ self._devices_info[i*DeviceInfo.PACK_SIZE: DeviceInfo.PACK_SIZE] for i in range(self._devices_info / DeviceInfo.PACK_SIZE)]
-#         devices_info = [ self.DeviceInfo.from_payload(item) for item in items]
-#         return devices_info
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(f'<B?B{self.num_devices * self.DeviceInfo.PACK_SIZE}B', self.CMD_ID, self.result, self.num_devices, self._devices_info)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         try:
-#             DeviceInfo = QueryConnectedLidarDeviceResponse.DeviceInfo
-#             devices_info = payload[2:]
-#             items = [ devices_info[i*DeviceInfo.PACK_SIZE: DeviceInfo.PACK_SIZE] for i in range(devices_info / DeviceInfo.PACK_SIZE)]
-#         except TypeError:
-#             raise ValueError(f'Bad devices_info format')
-#         devices_info = [DeviceInfo.from_payload(item) for item in items]
-#         num_devices = len(items)
-#         cmd_id = int.from_bytes(payload[0], 'little')
-#         result = bool(payload[1])
-#         _num_devices = int.from_bytes(payload[2], 'little')
-#         if num_devices != _num_devices:
-#             raise ValueError(f'Bad count value in payload')
-#         return QueryConnectedLidarDeviceResponse(result, devices_info)
-        
-
-# class SetLidarModeCmd(Hub, BroadCastCode, general.WorkState.Lidar):
-#     CMD_ID = 0x01
-#     FRAME_TYPE = Frame.Type.CMD
-
-#     class Config (BroadCastCode):
-#         __PACK_FORMAT = f'<{general.BroadcastMsg.Broadcast.PACK_SIZE}sB' #broadcast, power_mode
-#         PACK_SIZE = struct.calcsize(__PACK_FORMAT)
-
-#         def __inti__(self, broadcast:'general.BroadcastMsg.Broadcast|bytes', power_mode:'general.WorkState.Lidar|int'):
-#             super().__init__()
-#             self._broadcast_pars(broadcast)
-#             self._work_state_pars(power_mode)
-
-#         @property
-#         def payload(self)->bytes:
-#             return struct.pack(self.__PACK_FORMAT, self._broadcast, self._work_state)
-
-#         @classmethod
-#         def from_payload(cls, payload:bytes):
-#             broadcast, power_mode = struct.unpack(cls.__PACK_FORMAT, payload)
-#             return cls(broadcast, power_mode)
-
-#     def __init__(self, configs:'list[SetLidarModeCmd.Config]|bytes'):
-#         super().__init__()
-#         if type(configs) is bytes:
-#             items = []
-#         self.__PACK_FORMAT = f'<BB{self.Config.PACK_SIZE}' #CMD_ID
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(SetLidarModeCmd.__PACK_FORMAT, payload)
-#         SetLidarModeCmd._check_cmd_id(cmd_id)
-#         return SetLidarModeCmd()
-
-
-# class TurnOnOffDesignatedSlotPower(Hub):
-#     CMD_ID = 0x02
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
-
-#     def __init__(self):
-#         super().__init__()
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
-
-
-# class WriteLiDarExtrinsicParameters(Hub):
-#     CMD_ID = 0x03
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
-
-#     def __init__(self):
-#         super().__init__()
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
-
-
-# class ReadLiDarExtrinsicParameters(Hub):
-#     CMD_ID = 0x04
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
-
-#     def __init__(self):
-#         super().__init__()
-
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
-
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+# Hub command set. Most hub commands carry list of lidar entries (count byte, then entries),
+# each entry starts with broadcast code of lidar (Broadcast layout) followed by its values
 
+# std libs
+import struct
 
-# class QueryLiDarDeviceStatus(Hub):
-#     CMD_ID = 0x05
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+# project
+from pylivox.control.frame import Frame, Cmd, IsErrorResponse, IsErrorResponseOnly, DeviceType, support_only
+from pylivox.control.general import Broadcast, WorkState
+from pylivox.control.lidar import PowerMode, ReturnMode, PushFrequency
+
+
+class Hub(Cmd):
+    CMD_SET = Frame.Set.HUB
+    __slots__ = ()
 
-#     def __init__(self):
-#         super().__init__()
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+def _broadcast(serial:bytes, ip_range:int)->Broadcast:
+    broadcast = Broadcast.__new__(Broadcast)
+    broadcast._serial = bytes(serial)
+    broadcast._ip_range = ip_range
+    return broadcast
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
 
+class LidarItem:
+    """Entry of lidar list: broadcast code and _FIELDS packed after it.
+    Fields with decoder are converted on assignment and packed by their value"""
+    _PACK_FORMAT = '<14sBx'  # broadcast: serial, ip_range, reserved
+    _STRUCT = struct.Struct(_PACK_FORMAT)
+    _FIELDS:tuple = ()
+    _DECODERS:dict = {}
+    __slots__ = ('_broadcast', )
 
-# class TurnOnOffHubCalculationOfExtrinsicParameters(Hub):
-#     CMD_ID = 0x06
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '_PACK_FORMAT' in cls.__dict__:
+            cls._STRUCT = struct.Struct(cls._PACK_FORMAT)
 
-#     def __init__(self):
-#         super().__init__()
+    def __init__(self, broadcast:Broadcast, *values):
+        if len(values) != len(self._FIELDS):
+            raise TypeError(f'{type(self).__name__} takes broadcast and {self._FIELDS}')
+        self.broadcast = broadcast
+        for name, value in zip(self._FIELDS, values):
+            decoder = self._DECODERS.get(name)
+            setattr(self, name, value if decoder is None else decoder(value))
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+    def __repr__(self):
+        return f'{{{type(self).__name__} serial:{self.broadcast.serial}{self._describe()}}}'
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+    def _describe(self)->str:
+        return ''.join(f' {name}:{getattr(self, name)}' for name in self._FIELDS)
 
+    def __eq__(self, other):
+        return type(other) is type(self) and self._values() == other._values()
 
-# class TurnOnOffLiDarRainFogSuppression(Hub):
-#     CMD_ID = 0x07
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+    @property
+    def broadcast(self)->Broadcast:
+        return self._broadcast
 
-#     def __init__(self):
-#         super().__init__()
+    @broadcast.setter
+    def broadcast(self, value:Broadcast):
+        if type(value) is not Broadcast:
+            raise TypeError
+        self._broadcast = value
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+    def _field_values(self)->tuple:
+        return tuple(getattr(self, name).value if name in self._DECODERS else getattr(self, name) for name in self._FIELDS)
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+    def _values(self)->tuple:
+        return (self.broadcast.serial, self.broadcast.ip_range) + self._field_values()
 
+    @classmethod
+    def _from_values(cls, values:tuple)->'LidarItem':
+        serial, ip_range, *values = values
+        return cls(_broadcast(serial, ip_range), *values)
 
-# class QueryHubSlotPowerStatus(Hub):
-#     CMD_ID = 0x08
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+    @property
+    def payload(self)->bytes:
+        return self._STRUCT.pack(*self._values())
 
-#     def __init__(self):
-#         super().__init__()
+    def payload_into(self, buffer:'bytearray|memoryview', offset:int=0)->int:
+        self._STRUCT.pack_into(buffer, offset, *self._values())
+        return self._STRUCT.size
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+    @classmethod
+    def from_payload_list(cls, payload:bytes, count:int)->'list(LidarItem)':
+        length = count * cls._STRUCT.size
+        if len(payload) < length:
+            raise ValueError(f'{count} entries of {cls.__name__} do not fit into {len(payload)} bytes')
+        return [cls._from_values(values) for values in cls._STRUCT.iter_unpack(payload[:length])]
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
 
+class LidarResult(LidarItem):
+    """Entry of lidar list in response: is_error of lidar before its broadcast code"""
+    _PACK_FORMAT = '<?14sBx'  # is_error, broadcast
+    __slots__ = ('_is_error', )
 
-# class SetLiDarTurnOnOffFan(Hub):
-#     CMD_ID = 0x09
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+    def __init__(self, is_error:bool, broadcast:Broadcast, *values):
+        super().__init__(broadcast, *values)
+        self.is_error = is_error
 
-#     def __init__(self):
-#         super().__init__()
+    def __repr__(self):
+        return f'{{{type(self).__name__} error:{self.is_error} serial:{self.broadcast.serial}{self._describe()}}}'
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+    @property
+    def is_error(self)->bool:
+        return self._is_error
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+    @is_error.setter
+    def is_error(self, value:bool):
+        if type(value) is not bool:
+            raise TypeError
+        self._is_error = value
 
+    def _values(self)->tuple:
+        return (self.is_error, ) + super()._values()
 
-# class GetLiDarTurnOnOffFanState(Hub):
-#     CMD_ID = 0x0A
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+    @classmethod
+    def _from_values(cls, values:tuple)->'LidarResult':
+        is_error, serial, ip_range, *values = values
+        return cls(is_error, _broadcast(serial, ip_range), *values)
 
-#     def __init__(self):
-#         super().__init__()
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+class LidarCode(LidarItem):
+    __slots__ = ()
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
 
+class ReturnCode(LidarResult):
+    __slots__ = ()
 
-# class SetLiDarReturnMode(Hub):
-#     CMD_ID = 0x0B
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
 
-#     def __init__(self):
-#         super().__init__()
+class LidarInfo(LidarItem):
+    _PACK_FORMAT = '<14sBxB4BBB'  # broadcast, dev_type, firmware version, slot, id
+    _FIELDS = ('dev_type', 'version', 'slot', 'id')
+    _DECODERS = {'dev_type': DeviceType}
+    __slots__ = _FIELDS
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+    def _field_values(self)->tuple:
+        return (self.dev_type.value, *self.version, self.slot, self.id)
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+    @classmethod
+    def _from_values(cls, values:tuple)->'LidarInfo':
+        serial, ip_range, dev_type, *version, slot, id = values
+        return cls(_broadcast(serial, ip_range), dev_type, tuple(version), slot, id)
 
 
-# class GetLiDarReturnMode(Hub):
-#     CMD_ID = 0x0C
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+class LidarMode(LidarItem):
+    _PACK_FORMAT = '<14sBxB'  # broadcast, power_mode
+    _FIELDS = ('power_mode', )
+    _DECODERS = {'power_mode': PowerMode}
+    __slots__ = _FIELDS
 
-#     def __init__(self):
-#         super().__init__()
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+class LidarExtrinsics(LidarItem):
+    _PACK_FORMAT = '<14sBxfffiii'  # broadcast, roll, pitch, yaw, x, y, z
+    _FIELDS = ('roll', 'pitch', 'yaw', 'x', 'y', 'z')
+    __slots__ = _FIELDS
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
 
+class LidarExtrinsicsResult(LidarResult):
+    _PACK_FORMAT = '<?14sBxfffiii'  # is_error, broadcast, roll, pitch, yaw, x, y, z
+    _FIELDS = ('roll', 'pitch', 'yaw', 'x', 'y', 'z')
+    __slots__ = _FIELDS
 
-# class SetLiDarImuDataPushFrequency(Hub):
-#     CMD_ID = 0x0D
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
 
-#     def __init__(self):
-#         super().__init__()
+class LidarStatus(LidarItem):
+    _PACK_FORMAT = '<14sBxIBBI'  # broadcast, point cloud count, work_state, feature_msg, status_code
+    _FIELDS = ('pcl_count', 'work_state', 'feature_msg', 'status_code')
+    _DECODERS = {'work_state': WorkState.Lidar}
+    __slots__ = _FIELDS
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+class LidarSwitch(LidarItem):
+    _PACK_FORMAT = '<14sBx?'  # broadcast, is_enable
+    _FIELDS = ('is_enable', )
+    __slots__ = _FIELDS
 
 
-# class GetLiDarImuDataPushFrequency(Hub):
-#     CMD_ID = 0x0E
-#     FRAME_TYPE = Frame.Type.CMD
-#     __PACK_FORMAT = '<B' #CMD_ID
+class LidarSwitchResult(LidarResult):
+    _PACK_FORMAT = '<?14sBx?'  # is_error, broadcast, state
+    _FIELDS = ('state', )
+    __slots__ = _FIELDS
 
-#     def __init__(self):
-#         super().__init__()
 
-#     @property
-#     def payload(self)->bytes:
-#         return struct.pack(self.__PACK_FORMAT, self.CMD_ID,)
+class LidarReturnMode(LidarItem):
+    _PACK_FORMAT = '<14sBxB'  # broadcast, mode
+    _FIELDS = ('mode', )
+    _DECODERS = {'mode': ReturnMode}
+    __slots__ = _FIELDS
 
-#     @staticmethod
-#     def from_payload(payload:bytes):
-#         cmd_id = struct.unpack(XXX.__PACK_FORMAT, payload)
-#         XXX._check_cmd_id(cmd_id)
-#         return XXX()
+
+class LidarReturnModeResult(LidarResult):
+    _PACK_FORMAT = '<?14sBxB'  # is_error, broadcast, mode
+    _FIELDS = ('mode', )
+    _DECODERS = {'mode': ReturnMode}
+    __slots__ = _FIELDS
+
+
+class LidarPushFrequency(LidarItem):
+    _PACK_FORMAT = '<14sBxB'  # broadcast, frequency
+    _FIELDS = ('frequency', )
+    _DECODERS = {'frequency': PushFrequency}
+    __slots__ = _FIELDS
+
+
+class LidarPushFrequencyResult(LidarResult):
+    _PACK_FORMAT = '<?14sBxB'  # is_error, broadcast, frequency
+    _FIELDS = ('frequency', )
+    _DECODERS = {'frequency': PushFrequency}
+    __slots__ = _FIELDS
+
+
+class HubListCmd(Hub):
+    """Body is count of entries followed by _ITEM entries"""
+    _ITEM:type = None
+    _COUNT_STRUCT = struct.Struct('<B')  # count
+    __slots__ = ('_lidar_list', )
+
+    def __init__(self,
+                lidar_list: 'list(LidarItem)',
+                seq: int,
+                device_type: DeviceType = None,
+                device_version: 'tuple(int,int,int,int)' = None):
+        super().__init__(seq, device_type, device_version)
+        self.lidar_list = lidar_list
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.lidar_list}}}'
+
+    @property
+    def lidar_list(self) -> 'list(LidarItem)':
+        return self._lidar_list
+
+    @lidar_list.setter
+    def lidar_list(self, value: 'list(LidarItem)'):
+        if type(value) is not list or [item for item in value if type(item) is not self._ITEM] or len(value) > 255:
+            raise TypeError
+        self._lidar_list = value
+
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        self._COUNT_STRUCT.pack_into(buffer, offset, len(self.lidar_list))
+        length = self._COUNT_STRUCT.size
+        for item in self.lidar_list:
+            length += item.payload_into(buffer, offset + length)
+        return length
+
+    @classmethod
+    def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
+        count, = cls._COUNT_STRUCT.unpack_from(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._lidar_list = cls._ITEM.from_payload_list(payload[cls._COUNT_STRUCT.size:], count)
+        return self
+
+
+class HubListResponse(Hub, IsErrorResponse):
+    """Body is is_error of hub, count of entries and _ITEM entries"""
+    _ITEM:type = ReturnCode
+    _COUNT_STRUCT = struct.Struct('<?B')  # is_error, count
+    __slots__ = ('_is_error', '_lidar_list')
+
+    def __init__(self,
+                lidar_list: 'list(LidarItem)',
+                seq: int,
+                is_error: bool = False,
+                device_type: DeviceType = None,
+                device_version: 'tuple(int,int,int,int)' = None):
+        super().__init__(seq, device_type, device_version)
+        self.is_error = is_error
+        self.lidar_list = lidar_list
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} error:{self.is_error} {self.lidar_list}}}'
+
+    lidar_list = HubListCmd.lidar_list
+
+    def body_into(self, buffer: 'bytearray|memoryview', offset: int) -> int:
+        self._COUNT_STRUCT.pack_into(buffer, offset, self.is_error, len(self.lidar_list))
+        length = self._COUNT_STRUCT.size
+        for item in self.lidar_list:
+            length += item.payload_into(buffer, offset + length)
+        return length
+
+    @classmethod
+    def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
+        is_error, count = cls._COUNT_STRUCT.unpack_from(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self._lidar_list = cls._ITEM.from_payload_list(payload[cls._COUNT_STRUCT.size:], count)
+        return self
+
+
+HUB = [(DeviceType.HUB, (0, 0, 0, 0))]
+
+
+@support_only(HUB)
+class QueryConnectedLidarDevice(Hub):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.QUERY_CONNECTED_LIDAR_DEVICE
+    __slots__ = ()
+
+
+@support_only(HUB)
+class QueryConnectedLidarDeviceResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.QUERY_CONNECTED_LIDAR_DEVICE
+    _ITEM = LidarInfo
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarMode(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.SET_LIDAR_MODE
+    _ITEM = LidarMode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarModeResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.SET_LIDAR_MODE
+    __slots__ = ()
+
+
+@support_only(HUB)
+class TurnOnOffDesignatedSlotPower(Hub):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_DESIGNATED_SLOT_POWER
+    _PACK_FORMAT = '<B?'  # slot, is_enable
+    _FIELDS = ('slot', 'is_enable')
+    __slots__ = ('slot', 'is_enable')
+
+    def __init__(self,
+                slot: int,
+                is_enable: bool,
+                seq: int,
+                device_type: DeviceType = None,
+                device_version: 'tuple(int,int,int,int)' = None):
+        super().__init__(seq, device_type, device_version)
+        self.slot = slot
+        self.is_enable = is_enable
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} slot:{self.slot} enable:{self.is_enable}}}'
+
+    def _body_values(self) -> tuple:
+        return (self.slot, self.is_enable)
+
+    @classmethod
+    def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
+        self = cls._trusted(seq, device_type, device_version)
+        self.slot, self.is_enable = cls._STRUCT.unpack(payload)
+        return self
+
+
+@support_only(HUB)
+class TurnOnOffDesignatedSlotPowerResponse(Hub, IsErrorResponseOnly):
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_DESIGNATED_SLOT_POWER
+    __slots__ = ()
+
+
+@support_only(HUB)
+class WriteLidarExtrinsicParameters(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.WRITE_LIDAR_EXTRINSIC_PARAMETERS
+    _ITEM = LidarExtrinsics
+    __slots__ = ()
+
+
+@support_only(HUB)
+class WriteLidarExtrinsicParametersResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.WRITE_LIDAR_EXTRINSIC_PARAMETERS
+    __slots__ = ()
+
+
+@support_only(HUB)
+class ReadLidarExtrinsicParameters(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.READ_LIDAR_EXTRINSIC_PARAMETERS
+    _ITEM = LidarCode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class ReadLidarExtrinsicParametersResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.READ_LIDAR_EXTRINSIC_PARAMETERS
+    _ITEM = LidarExtrinsicsResult
+    __slots__ = ()
+
+
+@support_only(HUB)
+class QueryLidarDeviceStatus(Hub):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.QUERY_LIDAR_DEVICE_STATUS
+    __slots__ = ()
+
+
+@support_only(HUB)
+class QueryLidarDeviceStatusResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.QUERY_LIDAR_DEVICE_STATUS
+    _ITEM = LidarStatus
+    __slots__ = ()
+
+
+@support_only(HUB)
+class TurnOnOffHubCalculationOfExtrinsicParameters(Hub):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_HUB_CALCULATION_OF_EXTRINSIC_PARAMETERS
+    _PACK_FORMAT = '<?'  # is_enable
+    _FIELDS = ('is_enable', )
+    __slots__ = ('is_enable', )
+
+    def __init__(self,
+                is_enable: bool,
+                seq: int,
+                device_type: DeviceType = None,
+                device_version: 'tuple(int,int,int,int)' = None):
+        super().__init__(seq, device_type, device_version)
+        self.is_enable = is_enable
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} enable:{self.is_enable}}}'
+
+    def _body_values(self) -> tuple:
+        return (self.is_enable, )
+
+    @classmethod
+    def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
+        self = cls._trusted(seq, device_type, device_version)
+        self.is_enable, = cls._STRUCT.unpack(payload)
+        return self
+
+
+@support_only(HUB)
+class TurnOnOffHubCalculationOfExtrinsicParametersResponse(Hub, IsErrorResponseOnly):
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_HUB_CALCULATION_OF_EXTRINSIC_PARAMETERS
+    __slots__ = ()
+
+
+@support_only(HUB)
+class TurnOnOffLidarRainFogSuppression(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_LIDAR_RAIN_FOG_SUPPRESSION
+    _ITEM = LidarSwitch
+    __slots__ = ()
+
+
+@support_only(HUB)
+class TurnOnOffLidarRainFogSuppressionResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.TURN_ON_OFF_LIDAR_RAIN_FOG_SUPPRESSION
+    __slots__ = ()
+
+
+@support_only(HUB)
+class QueryHubSlotPowerStatus(Hub):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.QUERY_HUB_SLOT_POWER_STATUS
+    __slots__ = ()
+
+
+@support_only(HUB)
+class QueryHubSlotPowerStatusResponse(Hub, IsErrorResponse):
+    CMD_TYPE = Frame.Type.AKN
+    CMD_ID = Frame.SetHub.QUERY_HUB_SLOT_POWER_STATUS
+    _PACK_FORMAT = '<?H'  # is_error, slot power bits: bit n is slot n + 1
+    _FIELDS = ('is_error', 'slot_power')
+    __slots__ = ('_is_error', 'slot_power')
+
+    def __init__(self,
+                slot_power: int,
+                seq: int,
+                is_error: bool = False,
+                device_type: DeviceType = None,
+                device_version: 'tuple(int,int,int,int)' = None):
+        super().__init__(seq, device_type, device_version)
+        self.is_error = is_error
+        self.slot_power = slot_power
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} error:{self.is_error} slot_power:{self.slot_power:09b}}}'
+
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.slot_power)
+
+    @classmethod
+    def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error, self.slot_power = cls._STRUCT.unpack(payload)
+        return self
+
+
+@support_only(HUB)
+class SetLidarTurnOnOffFan(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.SET_LIDAR_TURN_ON_OFF_FAN
+    _ITEM = LidarSwitch
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarTurnOnOffFanResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.SET_LIDAR_TURN_ON_OFF_FAN
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarTurnOnOffFanState(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.GET_LIDAR_TURN_ON_OFF_FAN_STATE
+    _ITEM = LidarCode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarTurnOnOffFanStateResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.GET_LIDAR_TURN_ON_OFF_FAN_STATE
+    _ITEM = LidarSwitchResult
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarReturnMode(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.SET_LIDAR_RETURN_MODE
+    _ITEM = LidarReturnMode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarReturnModeResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.SET_LIDAR_RETURN_MODE
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarReturnMode(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.GET_LIDAR_RETURN_MODE
+    _ITEM = LidarCode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarReturnModeResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.GET_LIDAR_RETURN_MODE
+    _ITEM = LidarReturnModeResult
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarImuDataPushFrequency(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.SET_LIDAR_IMU_DATA_PUSH_FREQUENCY
+    _ITEM = LidarPushFrequency
+    __slots__ = ()
+
+
+@support_only(HUB)
+class SetLidarImuDataPushFrequencyResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.SET_LIDAR_IMU_DATA_PUSH_FREQUENCY
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarImuDataPushFrequency(HubListCmd):
+    CMD_TYPE = Frame.Type.CMD
+    CMD_ID = Frame.SetHub.GET_LIDAR_IMU_DATA_PUSH_FREQUENCY
+    _ITEM = LidarCode
+    __slots__ = ()
+
+
+@support_only(HUB)
+class GetLidarImuDataPushFrequencyResponse(HubListResponse):
+    CMD_ID = Frame.SetHub.GET_LIDAR_IMU_DATA_PUSH_FREQUENCY
+    _ITEM = LidarPushFrequencyResult
+    __slots__ = ()
@@ -18,6 +18,7 @@ class PowerMode(enum.Enum):
 
 class Lidar(Cmd):
     CMD_SET = Frame.Set.LIDAR
+    __slots__ = ()
 
 
 class ReturnMode(enum.Enum):
@@ -36,6 +37,9 @@ class SetMode(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.SET_MODE
     _PACK_FORMAT = '<B'  # lidar_mode
+    _FIELDS = ('power_mode', )
+    _DECODERS = {'power_mode': PowerMode}
+    __slots__ = ('_power_mode', )
 
     def __init__(self, 
                 power_mode: 'PowerMode|int', 
@@ -60,27 +64,31 @@ class SetMode(Lidar):
             raise TypeError
         self._power_mode = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.power_mode.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.power_mode.value, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq, device_type = None, device_version = None):
-        lidar_mode, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(lidar_mode, seq, device_type, device_version)
+        lidar_mode, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._power_mode = PowerMode(lidar_mode)
+        return self
 
 
 class SetModeResponse(Lidar):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetLidar.SET_MODE
     _PACK_FORMAT = '<B'  # Result
+    _FIELDS = ('result', )
+    __slots__ = ('_result', )
 
     class Result(enum.Enum):
         Success = 0
         Fail = 1
         Switching = 2
 
+    _DECODERS = {'result': Result}
+
     def __init__(self, 
                 result: 'Result|int', 
                 seq:int,
@@ -104,21 +112,23 @@ class SetModeResponse(Lidar):
             raise TypeError
         self._result = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.result.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.result.value, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        result, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(result, seq, device_type, device_version)
+        result, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._result = cls.Result(result)
+        return self
 
 
 class WriteLidarExtrinsicParameters(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.WRITE_LIDAR_EXTRINSIC_PARAMETERS
-    _PACK_FORMAT = '<fffIII'  # roll, pitch, yaw, x, y, z
+    _PACK_FORMAT = '<fffiii'  # roll, pitch, yaw, x, y, z
+    _FIELDS = ('roll', 'pitch', 'yaw', 'x', 'y', 'z')
+    __slots__ = ('roll', 'pitch', 'yaw', 'x', 'y', 'z')
 
     def __init__(self, 
                 roll: float, 
@@ -141,31 +151,33 @@ class WriteLidarExtrinsicParameters(Lidar):
     def __repr__(self):
         return f'{{{type(self).__name__} roll:{self.roll} pitch:{self.pitch} yaw:{self.yaw} x:{self.x} y:{self.y} z:{self.z}}}'
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.roll, self.pitch, self.yaw, self.x, self.y, self.z)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.roll, self.pitch, self.yaw, self.x, self.y, self.z)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        roll, pitch, yaw, x, y, z = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(roll, pitch, yaw, x, y, z, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self.roll, self.pitch, self.yaw, self.x, self.y, self.z = cls._STRUCT.unpack(payload)
+        return self
 
 
 class WriteLidarExtrinsicParametersResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.WRITE_LIDAR_EXTRINSIC_PARAMETERS
+    __slots__ = ()
 
 
 class ReadLidarExtrinsicParameters(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.READ_LIDAR_EXTRINSIC_PARAMETERS
+    __slots__ = ()
 
 
 class ReadLidarExtrinsicParametersResponse(Lidar, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetLidar.READ_LIDAR_EXTRINSIC_PARAMETERS
-    _PACK_FORMAT = '<?fffIII'  # is_error, roll, pitch, yaw, x, y, z
+    _PACK_FORMAT = '<?fffiii'  # is_error, roll, pitch, yaw, x, y, z
+    _FIELDS = ('is_error', 'roll', 'pitch', 'yaw', 'x', 'y', 'z')
+    __slots__ = ('_is_error', 'roll', 'pitch', 'yaw', 'x', 'y', 'z')
 
     def __init__(self,
                  roll: float,
@@ -192,17 +204,14 @@ class ReadLidarExtrinsicParametersResponse(Lidar, IsErrorResponse):
         return f'{{{type(self).__name__} error:{self._is_error} roll:{self.roll} pitch:{self.pitch} yaw:{self.yaw} x:{self.x} y:{self.y} z:{self.z}}}'
 
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_error,
-                                   self.roll, self.pitch, self.yaw, self.x, self.y, self.z)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.roll, self.pitch, self.yaw, self.x, self.y, self.z)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, roll, pitch, yaw, x, y, z = struct.unpack(
-            cls._PACK_FORMAT, payload)
-        return cls(roll, pitch, yaw, x, y, z, seq, is_error, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error, self.roll, self.pitch, self.yaw, self.x, self.y, self.z = cls._STRUCT.unpack(payload)
+        return self
 
 
 @support_only([(DeviceType.MID_40, (0, 0, 0, 0))])
@@ -210,6 +219,8 @@ class TurnOnOffRainFogSuppression(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.TURN_ON_OFF_RAIN_FOG_SUPPRESSION
     _PACK_FORMAT = '<?'  # is_enable
+    _FIELDS = ('is_enable', )
+    __slots__ = ('is_enable', )
 
     def __init__(self, 
                 is_enable: bool, 
@@ -222,20 +233,20 @@ class TurnOnOffRainFogSuppression(Lidar):
     def __repr__(self):
         return f'{{{type(self).__name__} enable:{self.is_enable}}}'
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_enable)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_enable, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq, device_type = None, device_version = None):
-        is_enable, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(is_enable, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self.is_enable, = cls._STRUCT.unpack(payload)
+        return self
 
 
 @support_only([(DeviceType.MID_40, (0, 0, 0, 0))])
 class TurnOnOffRainFogSuppressionResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.TURN_ON_OFF_RAIN_FOG_SUPPRESSION
+    __slots__ = ()
 
 
 @support_only([
@@ -247,6 +258,8 @@ class SetTurnOnOffFan(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.SET_TURN_ON_OFF_FAN
     _PACK_FORMAT = '<?'  # is_enable
+    _FIELDS = ('is_enable', )
+    __slots__ = ('is_enable', )
 
     def __init__(self,
                 is_enable: bool, 
@@ -259,15 +272,14 @@ class SetTurnOnOffFan(Lidar):
     def __repr__(self):
         return f'{{{type(self).__name__} enable:{self.is_enable}}}'
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.is_enable)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_enable, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_enable, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(is_enable, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self.is_enable, = cls._STRUCT.unpack(payload)
+        return self
 
 
 @support_only([
@@ -277,6 +289,7 @@ class SetTurnOnOffFan(Lidar):
 ])
 class SetTurnOnOffFanResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.SET_TURN_ON_OFF_FAN
+    __slots__ = ()
 
 
 @support_only([
@@ -287,6 +300,7 @@ class SetTurnOnOffFanResponse(Lidar, IsErrorResponseOnly):
 class GetTurnOnOffFanState(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.GET_TURN_ON_OFF_FAN_STATE
+    __slots__ = ()
 
 
 @support_only([
@@ -298,6 +312,8 @@ class GetTurnOnOffFanStateResponse(Lidar, IsErrorResponse):
     CMD_TYPE = Frame.Type.AKN
     CMD_ID = Frame.SetLidar.GET_TURN_ON_OFF_FAN_STATE
     _PACK_FORMAT = '<??'  # is_error, state
+    _FIELDS = ('is_error', 'state')
+    __slots__ = ('_is_error', 'state')
 
     def __init__(self, 
                 state: bool, 
@@ -312,16 +328,14 @@ class GetTurnOnOffFanStateResponse(Lidar, IsErrorResponse):
     def __repr__(self):
         return f'{{{type(self).__name__} error:{self.is_error} state:{self.state}}}'
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, self.state)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.state)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, state = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(state, seq, is_error, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error, self.state = cls._STRUCT.unpack(payload)
+        return self
 
 
 @support_only([
@@ -334,6 +348,9 @@ class SetLidarReturnMode(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.SET_LIDAR_RETURN_MODE
     _PACK_FORMAT = '<B'  # return_mode
+    _FIELDS = ('return_mode', )
+    _DECODERS = {'return_mode': ReturnMode}
+    __slots__ = ('_return_mode', )
 
     def __init__(self, 
                 return_mode: 'ReturnMode|int', 
@@ -358,15 +375,15 @@ class SetLidarReturnMode(Lidar):
             raise TypeError
         self._return_mode = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.return_mode.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.return_mode.value, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq, device_type = None, device_version = None):
-        return_mode, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(return_mode, seq, device_type, device_version)
+        return_mode, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._return_mode = ReturnMode(return_mode)
+        return self
 
 
 @support_only([
@@ -377,6 +394,7 @@ class SetLidarReturnMode(Lidar):
 ])
 class SetLidarReturnModeResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.SET_LIDAR_RETURN_MODE
+    __slots__ = ()
 
 
 @support_only([
@@ -388,6 +406,7 @@ class SetLidarReturnModeResponse(Lidar, IsErrorResponseOnly):
 class GetLidarReturnMode(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.GET_LIDAR_RETURN_MODE
+    __slots__ = ()
 
 
 @support_only([
@@ -399,6 +418,9 @@ class GetLidarReturnMode(Lidar):
 class GetLidarReturnModeResponse(Lidar, IsErrorResponse):
     CMD_ID = Frame.SetLidar.GET_LIDAR_RETURN_MODE
     _PACK_FORMAT = '<?B'  # is_error, return_mode
+    _FIELDS = ('is_error', 'return_mode')
+    _DECODERS = {'return_mode': ReturnMode}
+    __slots__ = ('_is_error', '_return_mode')
 
     def __init__(self, 
                 return_mode: 'ReturnMode|int',
@@ -425,16 +447,16 @@ class GetLidarReturnModeResponse(Lidar, IsErrorResponse):
             raise TypeError
         self._return_mode = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, self.return_mode.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.return_mode.value)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, return_mode = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(return_mode, seq, is_error, device_type, device_version)
+        is_error, return_mode = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self._return_mode = ReturnMode(return_mode)
+        return self
 
 
 @support_only([
@@ -446,6 +468,9 @@ class SetImuDataPushFrequency(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.SET_IMU_DATA_PUSH_FREQUENCY
     _PACK_FORMAT = '<B'  # frequency
+    _FIELDS = ('frequency', )
+    _DECODERS = {'frequency': PushFrequency}
+    __slots__ = ('_frequency', )
 
     def __init__(self, 
                 frequency: 'PushFrequency|int', 
@@ -470,15 +495,15 @@ class SetImuDataPushFrequency(Lidar):
             raise TypeError
         self._frequency = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(self._PACK_FORMAT, self.frequency.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.frequency.value, )
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        frequency, = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(frequency, seq, device_type, device_version)
+        frequency, = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._frequency = PushFrequency(frequency)
+        return self
 
 
 @support_only([
@@ -488,6 +513,7 @@ class SetImuDataPushFrequency(Lidar):
 ])
 class SetImuDataPushFrequencyResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.SET_IMU_DATA_PUSH_FREQUENCY
+    __slots__ = ()
 
 
 @support_only([
@@ -498,6 +524,7 @@ class SetImuDataPushFrequencyResponse(Lidar, IsErrorResponseOnly):
 class GetImuDataPushFrequency(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.GET_IMU_DATA_PUSH_FREQUENCY
+    __slots__ = ()
 
 
 @support_only([
@@ -508,6 +535,9 @@ class GetImuDataPushFrequency(Lidar):
 class GetImuDataPushFrequencyResponse(Lidar, IsErrorResponse):
     CMD_ID = Frame.SetLidar.GET_IMU_DATA_PUSH_FREQUENCY
     _PACK_FORMAT = '<?B'  # is_error, frequency
+    _FIELDS = ('is_error', 'frequency')
+    _DECODERS = {'frequency': PushFrequency}
+    __slots__ = ('_is_error', '_frequency')
 
     def __init__(self, 
                 frequency: 'PushFrequency|int',
@@ -534,16 +564,16 @@ class GetImuDataPushFrequencyResponse(Lidar, IsErrorResponse):
             raise TypeError
         self._frequency = value
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.is_error, self.frequency.value)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.is_error, self.frequency.value)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        is_error, frequency = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(frequency, seq, is_error, device_type, device_version)
+        is_error, frequency = cls._STRUCT.unpack(payload)
+        self = cls._trusted(seq, device_type, device_version)
+        self._is_error = is_error
+        self._frequency = PushFrequency(frequency)
+        return self
 
 
 @support_only([
@@ -556,6 +586,8 @@ class UpdateUtcSynchronizationTime(Lidar):
     CMD_TYPE = Frame.Type.CMD
     CMD_ID = Frame.SetLidar.UPDATE_UTC_SYNCHRONIZATION_TIME
     _PACK_FORMAT = '<BBBBI'  # year, month, day, hour, microseconds
+    _FIELDS = ('year', 'month', 'day', 'hour', 'microseconds')
+    __slots__ = ('year', 'month', 'day', 'hour', 'microseconds')
 
     def __init__(self, 
                 year: int, 
@@ -574,16 +606,14 @@ class UpdateUtcSynchronizationTime(Lidar):
         self.hour = hour
         self.microseconds = microseconds
 
-    @property
-    def payload(self) -> bytes:
-        payload_body = struct.pack(
-            self._PACK_FORMAT, self.year, self.month, self.day, self.hour, self.microseconds)
-        return super().cmd_payload(payload_body)
+    def _body_values(self) -> tuple:
+        return (self.year, self.month, self.day, self.hour, self.microseconds)
 
     @classmethod
     def from_payload(cls, payload: bytes, seq:int, device_type = None, device_version = None):
-        year, month, day, hour, us = struct.unpack(cls._PACK_FORMAT, payload)
-        return cls(year, month, day, hour, us, seq, device_type, device_version)
+        self = cls._trusted(seq, device_type, device_version)
+        self.year, self.month, self.day, self.hour, self.microseconds = cls._STRUCT.unpack(payload)
+        return self
 
 
 @support_only([
@@ -594,3 +624,4 @@ class UpdateUtcSynchronizationTime(Lidar):
 ])
 class UpdateUtcSynchronizationTimeResponse(Lidar, IsErrorResponseOnly):
     CMD_ID = Frame.SetLidar.UPDATE_UTC_SYNCHRONIZATION_TIME
+    __slots__ = ()
@@ -0,0 +1,93 @@
+#Pre-encoded frames for frequent fixed layout responses
+
+#std
+import enum
+import struct
+#proj
+from pylivox.control.frame import Frame, Cmd, DeviceType, DeviceContext, device_context, crc32, crc_header_cached
+
+
+class FrameTemplate:
+    """Frame encoded once. render patches seq and selected body fields in place with pack_into
+    and refreshes both CRCs. Nothing is recomputed when seq and fields did not change.
+    Returned view points into template buffer and is valid until next render"""
+    _SEQ_OFFSET = 5
+    _SEQ_STRUCT = struct.Struct('<H')
+    _BODY_OFFSET = Frame.HEADER_LENGTH + Cmd._CMD_STRUCT.size
+    __slots__ = ('frame_type', 'length', '_buffer', '_view', '_prefix_crc', '_seq', '_struct', '_values', '_index')
+
+    def __init__(self, frame:Frame, fields:'tuple(str)'=()):
+        self.frame_type = type(frame)
+        self._buffer = bytearray(Frame.FRAME_MAX_LENGTH)
+        self.length = frame.encode_into(self._buffer)
+        del self._buffer[self.length:]
+        self._view = memoryview(self._buffer)
+        #start, version and length never change: CRC32 continues from them
+        self._prefix_crc = crc32(self._view[:self._SEQ_OFFSET])
+        self._seq = frame.seq
+        self._struct = None
+        self._values = None
+        self._index = {}
+        if fields:
+            if frame._STRUCT is None or frame._FIELDS is None:
+                raise TypeError(f'{type(frame).__name__} has no fixed body layout')
+            unknown = [name for name in fields if name not in frame._FIELD_INDEX]
+            if unknown:
+                raise ValueError(f'{type(frame).__name__} has no fields {unknown}')
+            self._struct = frame._STRUCT
+            self._values = list(frame._STRUCT.unpack_from(self._buffer, self._BODY_OFFSET))
+            self._index = {name: frame._FIELD_INDEX[name] for name in fields}
+
+    def __repr__(self):
+        return f'{{Template {self.frame_type.__name__} seq:{self._seq} length:{self.length}}}'
+
+    def render(self, seq:int, **values)->memoryview:
+        """Frame bytes with seq and given fields. Enum fields accept members"""
+        changed = seq != self._seq
+        if values:
+            current = self._values
+            body_changed = False
+            for name, value in values.items():
+                if isinstance(value, enum.Enum):
+                    value = value.value
+                index = self._index[name]
+                if current[index] != value:
+                    current[index] = value
+                    body_changed = True
+            if body_changed:
+                self._struct.pack_into(self._buffer, self._BODY_OFFSET, *current)
+                changed = True
+        if changed:
+            buffer = self._buffer
+            self._SEQ_STRUCT.pack_into(buffer, self._SEQ_OFFSET, seq)
+            self._seq = seq
+            Frame._HEADER_CRC_STRUCT.pack_into(buffer, Frame.HEADER_LENGTH - 2, crc_header_cached(buffer))
+            end = self.length - Frame.FRAME_CRC_LENGTH
+            Frame._FRAME_CRC_STRUCT.pack_into(buffer, end, crc32(self._view[self._SEQ_OFFSET:end], self._prefix_crc))
+        return self._view
+
+
+class TemplateCache:
+    """Templates of one device keyed by frame type.
+    Not thread safe: every template has single buffer patched in place"""
+
+    def __init__(self, device_type:'DeviceType|DeviceContext', device_version:'tuple(int,int,int,int)'=None):
+        self.context = device_context(device_type, device_version)
+        self._templates = {}
+
+    def __contains__(self, frame_type:type)->bool:
+        return frame_type in self._templates
+
+    def add(self, frame:Frame, fields:'tuple(str)'=())->FrameTemplate:
+        template = self._templates[type(frame)] = FrameTemplate(frame, fields)
+        return template
+
+    def render(self, frame_type:type, seq:int, **values)->memoryview:
+        return self._templates[frame_type].render(seq, **values)
+
+    def ack(self, frame_type:type, seq:int)->memoryview:
+        """IsErrorResponseOnly ACK without error. Template is built on first use"""
+        template = self._templates.get(frame_type)
+        if template is None:
+            template = self.add(frame_type(seq, False, self.context))
+        return template.render(seq)
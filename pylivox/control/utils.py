@@ -1,83 +1,151 @@
 
 #std
 import struct
+import logging
 #proj
-from pylivox.control.frame import Frame, DeviceType
+from pylivox.control.frame import (Frame, Cmd, FrameView, DeviceType, DeviceContext, device_context, crc_header_cached, CMD_TABLE,
+                                   check_supported, get_ignore_type_restriction)
+#command modules register their classes on import
 import pylivox.control.general as general
 import pylivox.control.hub as hub
 import pylivox.control.lidar as lidar
 
-TypeDict = {
-    #GENERAL CMD
-    (Frame.Set.GENERAL.value, Frame.Type.MSG.value, Frame.SetGeneral.BROADCAST_MESSAGE                .value) : general.BroadcastMsg,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.HANDSHAKE                        .value) : general.Handshake,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.QUERY_DEVICE_INFORMATION         .value) : general.QueryDeviceInformation,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.HEARTBEAT                        .value) : general.Heartbeat,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.START_STOP_SAMPLING              .value) : general.StartStopSampling,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.CHANGE_COORDINATE_SYSTEM         .value) : general.ChangeCoordinateSystem,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.DISCONNECT                       .value) : general.Disconnect,
-    (Frame.Set.GENERAL.value, Frame.Type.MSG.value, Frame.SetGeneral.PUSH_ABNORMAL_STATUS_INFORMATION .value) : general.PushAbnormalStatusInformation,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.CONFIGURE_STATIC_DYNAMIC_IP      .value) : general.ConfigureStaticDynamicIp,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.GET_DEVICE_IP_INFORMATION        .value) : general.GetDeviceIpInformation,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.REBOOT_DEVICE                    .value) : general.RebootDevice,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.WRITE_CONFIGURATION_PARAMETERS   .value) : general.WriteConfigurationParameters,
-    (Frame.Set.GENERAL.value, Frame.Type.CMD.value, Frame.SetGeneral.READ_CONFIGURATION_PARAMETERS    .value) : general.ReadConfigurationParameters,
-    #GENERAL AKN
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.HANDSHAKE                        .value) : general.HandshakeResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.QUERY_DEVICE_INFORMATION         .value) : general.QueryDeviceInformationResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.HEARTBEAT                        .value) : general.HeartbeatResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.START_STOP_SAMPLING              .value) : general.StartStopSamplingResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.CHANGE_COORDINATE_SYSTEM         .value) : general.ChangeCoordinateSystemResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.DISCONNECT                       .value) : general.DisconnectResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.CONFIGURE_STATIC_DYNAMIC_IP      .value) : general.ConfigureStaticDynamicIpResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.GET_DEVICE_IP_INFORMATION        .value) : general.GetDeviceIpInformationResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.REBOOT_DEVICE                    .value) : general.RebootDeviceResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.WRITE_CONFIGURATION_PARAMETERS   .value) : general.WriteConfigurationParametersResponse,
-    (Frame.Set.GENERAL.value, Frame.Type.AKN.value, Frame.SetGeneral.READ_CONFIGURATION_PARAMETERS    .value) : general.ReadConfigurationParametersResponse,
-    #LIDAR CMD
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.SET_MODE                             .value) : lidar.SetMode,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.WRITE_LIDAR_EXTRINSIC_PARAMETERS    .value) : lidar.WriteLidarExtrinsicParameters,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.READ_LIDAR_EXTRINSIC_PARAMETERS     .value) : lidar.ReadLidarExtrinsicParameters,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.TURN_ON_OFF_RAIN_FOG_SUPPRESSION     .value) : lidar.TurnOnOffRainFogSuppression,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.SET_TURN_ON_OFF_FAN                  .value) : lidar.SetTurnOnOffFan,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.GET_TURN_ON_OFF_FAN_STATE            .value) : lidar.GetTurnOnOffFanState,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.SET_LIDAR_RETURN_MODE                .value) : lidar.SetLidarReturnMode,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.GET_LIDAR_RETURN_MODE                .value) : lidar.GetLidarReturnMode,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.SET_IMU_DATA_PUSH_FREQUENCY          .value) : lidar.SetImuDataPushFrequency,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.GET_IMU_DATA_PUSH_FREQUENCY          .value) : lidar.GetImuDataPushFrequency,
-    (Frame.Set.LIDAR.value, Frame.Type.CMD.value, Frame.SetLidar.UPDATE_UTC_SYNCHRONIZATION_TIME      .value) : lidar.UpdateUtcSynchronizationTime,
-    #LIDAR AKN
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.SET_MODE                             .value) : lidar.SetModeResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.WRITE_LIDAR_EXTRINSIC_PARAMETERS    .value) : lidar.WriteLidarExtrinsicParametersResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.READ_LIDAR_EXTRINSIC_PARAMETERS     .value) : lidar.ReadLidarExtrinsicParametersResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.TURN_ON_OFF_RAIN_FOG_SUPPRESSION     .value) : lidar.TurnOnOffRainFogSuppressionResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.SET_TURN_ON_OFF_FAN                  .value) : lidar.SetTurnOnOffFanResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.GET_TURN_ON_OFF_FAN_STATE            .value) : lidar.GetTurnOnOffFanStateResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.SET_LIDAR_RETURN_MODE                .value) : lidar.SetLidarReturnModeResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.GET_LIDAR_RETURN_MODE                .value) : lidar.GetLidarReturnModeResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.SET_IMU_DATA_PUSH_FREQUENCY          .value) : lidar.SetImuDataPushFrequencyResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.GET_IMU_DATA_PUSH_FREQUENCY          .value) : lidar.GetImuDataPushFrequencyResponse,
-    (Frame.Set.LIDAR.value, Frame.Type.AKN.value, Frame.SetLidar.UPDATE_UTC_SYNCHRONIZATION_TIME      .value) : lidar.UpdateUtcSynchronizationTimeResponse,
-}    
+logger = logging.getLogger(__name__)
 
-def FrameFrom(frame:bytes, 
-                device_type:DeviceType=None, 
-                device_version:'tuple(int,int,int,int)'=None
-            )->Frame:
-    #TODO description
-    #parse frame parts
-    header = frame[0:7]
-    header_crc = int.from_bytes(frame[7:9], 'little')
-    cmd_set = frame[9]
-    cmd_id = frame[10]
-    frame_payload = frame[11:-4]
-    frame_crc = int.from_bytes(frame[-4:], 'little')
-    assert len(frame) < Frame.FRAME_MAX_LENGTH
-    assert frame_crc == Frame.crc(frame[:-4])
-    assert header_crc == Frame.crc_header(header)
-    #Check header 
-    start, version, length, cmd_type, seq = struct.unpack('<BBHBH', header)
-    assert start == Frame.START
-    assert version == Frame.VERSION
-    T = TypeDict[cmd_set, cmd_type, cmd_id]
-    return T.from_payload(frame_payload, seq, device_type, device_version)
\ No newline at end of file
+
+def FrameFrom(frame:'bytes|bytearray|memoryview', 
+                device_type:'DeviceType|DeviceContext'=None, 
+                device_version:'tuple(int,int,int,int)'=None,
+                lazy:bool=False,
+            )->'Frame|FrameView':
+    """Decode single frame. Frame is parsed through memoryview, nothing is sliced out of it.
+    With lazy=True return FrameView over frame buffer that decodes fields on first read.
+    device_type may be DeviceContext of the device frame came from.
+    Return None for unknown command. Raise ValueError on malformed frame"""
+    view = memoryview(frame)
+    if len(view) < Frame.HEADER_LENGTH + Cmd._CMD_STRUCT.size + Frame.FRAME_CRC_LENGTH:
+        raise ValueError(f'Frame is too short: {len(view)}')
+    if len(view) > Frame.FRAME_MAX_LENGTH:
+        raise ValueError(f'Frame is too big. Max {Frame.FRAME_MAX_LENGTH} but frame is {len(view)}')
+    start, version, length, cmd_type, seq = Frame._HEADER_STRUCT.unpack_from(view)
+    header_crc, = Frame._HEADER_CRC_STRUCT.unpack_from(view, 7)
+    frame_crc, = Frame._FRAME_CRC_STRUCT.unpack_from(view, len(view) - Frame.FRAME_CRC_LENGTH)
+    if start != Frame.START or version != Frame.VERSION:
+        raise ValueError(f'Bad frame start:{start} version:{version}')
+    if length != len(view):
+        raise ValueError(f'Bad frame length. Header:{length} frame:{len(view)}')
+    if header_crc != crc_header_cached(view):
+        raise ValueError('Bad header crc')
+    if frame_crc != Frame.crc(view[:-Frame.FRAME_CRC_LENGTH]):
+        raise ValueError('Bad frame crc')
+    T = CMD_TABLE[view[9]][cmd_type][view[10]]
+    if T is None:
+        return None
+    return _decode(T, view, seq, device_type, device_version, lazy)
+
+
+def _decode(T:type, view:memoryview, seq:int, device_type, device_version, lazy:bool)->'Frame|FrameView':
+    if lazy:
+        if not get_ignore_type_restriction():
+            context = device_context(device_type, device_version)
+            check_supported(T, context.device_type, context.device_version)
+        return FrameView(T, view, device_type, device_version)
+    return T.from_payload(view[Frame.HEADER_LENGTH + Cmd._CMD_STRUCT.size:-Frame.FRAME_CRC_LENGTH], seq, device_type, device_version)
+
+
+class FrameStreamDecoder:
+    """Decode frames from arbitrary byte chunks: capture files, tcp relays, serial taps.
+    Scans for START byte, checks header CRC16 before waiting for the rest of frame 
+    and resyncs byte by byte after corruption. Only incomplete frame tail is kept between chunks,
+    so memory is bounded by chunk size + FRAME_MAX_LENGTH. 
+    Lazy frames reference chunk memory, so chunks must not be reused while frames are alive"""
+
+    def __init__(self, 
+                device_type:'DeviceType|DeviceContext'=None, 
+                device_version:'tuple(int,int,int,int)'=None,
+                lazy:bool=False):
+        self.device_type = device_type
+        self.device_version = device_version
+        self.lazy = lazy
+        self._tail = b''
+        self.bytes_received = 0
+        self.bytes_discarded = 0
+        self.frames_decoded = 0
+        self.header_errors = 0
+        self.frame_crc_errors = 0
+        self.unknown_frames = 0
+        self.decode_errors = 0
+
+    def __repr__(self):
+        return (f'{{{type(self).__name__} received:{self.bytes_received} discarded:{self.bytes_discarded} '
+                f'frames:{self.frames_decoded} header_errors:{self.header_errors} '
+                f'frame_crc_errors:{self.frame_crc_errors} unknown:{self.unknown_frames} decode_errors:{self.decode_errors}}}')
+
+    @property
+    def pending(self)->int:
+        """Bytes waiting for the rest of frame"""
+        return len(self._tail)
+
+    def feed(self, chunk:'bytes|bytearray|memoryview')->'list(Frame|FrameView)':
+        """Consume chunk and return frames completed by it"""
+        if type(chunk) is memoryview:
+            chunk = bytes(chunk)
+        self.bytes_received += len(chunk)
+        data = self._tail + chunk if self._tail else chunk
+        view = memoryview(data)
+        end = len(data)
+        header_length = Frame.HEADER_LENGTH
+        min_length = header_length + Cmd._CMD_STRUCT.size + Frame.FRAME_CRC_LENGTH
+        max_length = Frame.FRAME_MAX_LENGTH
+        header_unpack = Frame._HEADER_STRUCT.unpack_from
+        header_crc_unpack = Frame._HEADER_CRC_STRUCT.unpack_from
+        frame_crc_unpack = Frame._FRAME_CRC_STRUCT.unpack_from
+        start_byte = bytes((Frame.START, ))
+        frames = []
+        pos = 0
+        while True:
+            start = data.find(start_byte, pos)
+            if start < 0:
+                self.bytes_discarded += end - pos
+                pos = end
+                break
+            self.bytes_discarded += start - pos
+            pos = start
+            if end - pos < header_length:
+                break
+            _, version, length, cmd_type, seq = header_unpack(view, pos)
+            if (version != Frame.VERSION or length < min_length or length > max_length 
+                    or header_crc_unpack(view, pos + 7)[0] != crc_header_cached(view, pos)):
+                self.header_errors += 1
+                self.bytes_discarded += 1
+                pos += 1
+                continue
+            if end - pos < length:
+                break
+            crc_offset = pos + length - Frame.FRAME_CRC_LENGTH
+            if frame_crc_unpack(view, crc_offset)[0] != Frame.crc(view[pos:crc_offset]):
+                self.frame_crc_errors += 1
+                self.bytes_discarded += 1
+                pos += 1
+                continue
+            T = CMD_TABLE[view[pos + 9]][cmd_type][view[pos + 10]]
+            if T is None:
+                self.unknown_frames += 1
+            else:
+                try:
+                    frames.append(_decode(T, view[pos:pos + length], seq, self.device_type, self.device_version, self.lazy))
+                    self.frames_decoded += 1
+                except (ValueError, TypeError, struct.error) as e:
+                    self.decode_errors += 1
+                    logger.debug(f'Can not decode {T.__name__}: {e}')
+            pos += length
+        self._tail = bytes(view[pos:])
+        return frames
+
+    def decode_stream(self, stream:'io.RawIOBase|io.BufferedIOBase', chunk_size:int=1 << 16)->'Iterator(Frame|FrameView)':
+        """Read file-like object chunk by chunk and yield frames"""
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield from self.feed(chunk)
@@ -1,10 +1,12 @@
 import time
-import os
 import struct
 from enum import Enum
+#libs
+import numpy as np
 #proj
-import log 
-# from control.frame import DeviceType
+import log
+from pylivox.control.frame import DeviceType
+from pylivox.control.lidar import ReturnMode
 
 logger = log.getLogger(__name__)
 
@@ -15,15 +17,15 @@ class LidarStatus:
         EXTREMELY = 2
 
     class Voltage(Enum):
-       NORMAL     = 0   
-       HIGH       = 1 
-       EXTREMELY  = 2     
+       NORMAL     = 0
+       HIGH       = 1
+       EXTREMELY  = 2
 
     class Motor(Enum):
         NORMAL  = 0
         WARNING = 1
-        ERROR   = 2 
-    
+        ERROR   = 2
+
     class TimeSync(Enum):
         NO_TIME_SYNC = 0
         PTP_1588 = 1
@@ -32,100 +34,481 @@ class LidarStatus:
         ABNORMAL = 4
 
     class System(Enum):
-        NORMAL  = 0  
-        WARNING = 1   
-        ERROR   = 2 
+        NORMAL  = 0
+        WARNING = 1
+        ERROR   = 2
+
+
+PROTOCOL_VERSION = 5
+#protocol version, slot_id, lidar_id, reserved, status_code, time_type, data_type, timestamp
+HEADER_DTYPE = np.dtype([
+    ('version', 'u1'),
+    ('slot_id', 'u1'),
+    ('lidar_id', 'u1'),
+    ('reserved', 'u1'),
+    ('status_code', '<u4'),
+    ('timestamp_type', 'u1'),
+    ('data_type', 'u1'),
+    ('timestamp', '<u8'),
+])
+HEADER_LENGTH = HEADER_DTYPE.itemsize
+HEADER_STRUCT = struct.Struct('<BBBxIBBQ')
+
+
+class TimestampType(Enum):
+    NO_SYNC = 0 #ns since power on
+    PTP = 1     #ns
+    RESERVED = 2
+    GPS = 3     #UTC: UTC_DTYPE
+    PPS = 4     #ns since last pulse
+
+#timestamp field of GPS synchronized packets
+UTC_DTYPE = np.dtype([('year', 'u1'), ('month', 'u1'), ('day', 'u1'), ('hour', 'u1'), ('microsecond', '<u4')])
+
+
+def timestamps_ns(header:np.ndarray)->np.ndarray:
+    """Timestamps of packet headers in ns, UTC ones as ns since epoch"""
+    timestamps = header['timestamp'].astype(np.int64)
+    utc = header['timestamp_type'] == TimestampType.GPS.value
+    if utc.any():
+        fields = np.ascontiguousarray(header['timestamp'][utc]).view(UTC_DTYPE)
+        #year is counted from 2000
+        months = (fields['year'].astype(np.int64) + 30) * 12 + fields['month'] - 1
+        days = months.astype('datetime64[M]').astype('datetime64[D]') + (fields['day'].astype(np.int64) - 1)
+        timestamps[utc] = (days.astype('datetime64[ns]').astype(np.int64)
+                           + fields['hour'].astype(np.int64) * 3600000000000
+                           + fields['microsecond'].astype(np.int64) * 1000)
+    return timestamps
+
+
+def encode_timestamps(ns:np.ndarray, timestamp_type:TimestampType, out:np.ndarray=None)->np.ndarray:
+    """Header timestamp field (uint64) of ns since epoch, ns since power on for NO_SYNC.
+    Inverse of timestamps_ns"""
+    ns = np.asarray(ns, np.int64)
+    if out is None:
+        out = np.empty(ns.shape, np.uint64)
+    if timestamp_type is TimestampType.GPS:
+        t = ns.astype('datetime64[ns]')
+        hours = t.astype('datetime64[h]')
+        days = t.astype('datetime64[D]')
+        months = t.astype('datetime64[M]')
+        utc = np.empty(ns.shape, UTC_DTYPE)
+        utc['year'] = t.astype('datetime64[Y]').astype(np.int64) - 30
+        utc['month'] = months.astype(np.int64) % 12 + 1
+        utc['day'] = (days - months.astype('datetime64[D]')).astype(np.int64) + 1
+        utc['hour'] = (hours - days.astype('datetime64[h]')).astype(np.int64)
+        utc['microsecond'] = (t - hours).astype(np.int64) // 1000
+        out[...] = utc.view(np.uint64)
+    elif timestamp_type is TimestampType.PPS:
+        #pulse every whole second
+        out[...] = ns % 1000000000
+    else:
+        out[...] = ns
+    return out
+
+
+class PacketClock:
+    """Timestamps of consecutive packets of one stream, packet_period ns apart.
+    Every block is stamped in one step from monotonic base, wall clock is read once at start (or sync),
+    so stamps never jump with system time. Stream that fell behind more than one block resyncs to now:
+    host sees the gap as lost packets"""
+
+    def __init__(self,
+                packet_period:int,
+                timestamp_type:TimestampType=TimestampType.NO_SYNC,
+                start_ns:int=None,
+                epoch_ns:int=None):
+        self.packet_period = packet_period
+        self.timestamp_type = timestamp_type
+        self.start_ns = time.monotonic_ns() if start_ns is None else start_ns #power on
+        self.epoch_ns = time.time_ns() if epoch_ns is None else epoch_ns #wall clock at power on
+        self._next:int = None #monotonic ns of next packet
+        self._steps = np.zeros(0, np.int64)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.timestamp_type.name} period:{self.packet_period}}}'
+
+    def sync(self, epoch_ns:int, timestamp_type:TimestampType=None):
+        """Wall clock is epoch_ns now"""
+        self.epoch_ns = epoch_ns - (time.monotonic_ns() - self.start_ns)
+        if timestamp_type is not None:
+            self.timestamp_type = timestamp_type
+
+    def _advance(self, span:int)->int:
+        """Stamp (ns since power on or epoch) of next packet, clock moves on by span ns"""
+        now = time.monotonic_ns()
+        #ahead of time is fine, blocks are sent before their packets are due
+        if self._next is None or now - self._next > span:
+            self._next = now
+        base = self._next - self.start_ns
+        if self.timestamp_type is not TimestampType.NO_SYNC:
+            base += self.epoch_ns
+        self._next += span
+        return base
 
+    def next(self, count:int, out:np.ndarray=None)->np.ndarray:
+        """Encoded timestamps of next count packets"""
+        if len(self._steps) < count:
+            self._steps = np.arange(count, dtype=np.int64)
+        ns = self._steps[:count] * self.packet_period
+        ns += self._advance(count * self.packet_period)
+        return encode_timestamps(ns, self.timestamp_type, out)
 
+    def at(self, offsets:np.ndarray, span:int, out:np.ndarray=None)->np.ndarray:
+        """Encoded timestamps of packets offsets (int64 ns) after next one, clock moves on by span ns"""
+        ns = offsets + self._advance(span)
+        return encode_timestamps(ns, self.timestamp_type, out)
 
-class DataType0:
+
+#measurements (directions) per second. Every return of multi return modes is sent, so packet rate grows with returns
+POINT_RATE = {
+    DeviceType.MID_40: 100000,
+    DeviceType.MID_70: 100000,
+    DeviceType.TELE_15: 240000,
+    DeviceType.HORIZON: 240000,
+    DeviceType.AVIA: 240000,
+}
+
+
+class DataType:
+    """Point packet layout: N points of DTYPE after common header.
+    PACKET_DTYPE of whole packet is built once per data type"""
+    TYPE:int = None
+    N:int = None
+    DTYPE:np.dtype = None
+    _PACK_FORMAT:str = None
+    IS_SPHERICAL = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.PACKET_DTYPE = np.dtype([('header', HEADER_DTYPE), ('points', cls.DTYPE, (cls.N, ))])
+        cls.PACKET_LENGTH = cls.PACKET_DTYPE.itemsize
+        DATA_TYPES[cls.TYPE] = cls
+
+
+DATA_TYPES = {}
+
+
+class DataType0(DataType):
     TYPE = 0
-    _PACK_FORMAT = '<IIIB' #X, Y, Z, reflectivity
+    _PACK_FORMAT = '<iiiB' #X, Y, Z, reflectivity
+    DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('z', '<i4'), ('reflectivity', 'u1')])
     N = 100
 
-class DataType1:
+class DataType1(DataType):
     TYPE = 1
     _PACK_FORMAT = '<IHHB' #Depth, Zenith angle, Azimuth, reflectivity
+    DTYPE = np.dtype([('depth', '<u4'), ('zenith', '<u2'), ('azimuth', '<u2'), ('reflectivity', 'u1')])
     N = 100
+    IS_SPHERICAL = True
 
-    def __init__(self):
-        # with open('mid40.csv') as f:
-        #     data = f.read()
-        # lines = data.split('\n')
-        # points = [ [float(i) for i in line.split(',')] for line in lines[1:-1] ] #timestamp/s, azimuth/deg, zenith/deg
-        # def create_data(time:float, azimuth:float, zenith:float)->'list(int,int,int,int)':
-        #     return [int(time*1000000000), 100, int(azimuth*100), int(zenith*100) ]
-        # self._points = [ create_data(*point) for point in points]
-        self._points = [ [10000, 100, 100] ]
-        self._i = 0
-        self._len = len(self._points)
-
-    def __iter__(self):
-        return self
-        
-    def __next__(self):
-        self._i = self._i + 1 if self._i+1 < self._len else 0
-        return self._points[self._i] 
-
-class DataType2:
+class DataType2(DataType):
     TYPE = 2
-    _PACK_FORMAT = '<IIIBB' #X, Y, Z, reflectivity, tag
+    _PACK_FORMAT = '<iiiBB' #X, Y, Z, reflectivity, tag
+    DTYPE = np.dtype([('x', '<i4'), ('y', '<i4'), ('z', '<i4'), ('reflectivity', 'u1'), ('tag', 'u1')])
     N = 96
 
-class DataType3:
+class DataType3(DataType):
     TYPE = 3
     _PACK_FORMAT = '<IHHBB' #Depth, Zenith angle, Azimuth, reflectivity, tag
+    DTYPE = np.dtype([('depth', '<u4'), ('zenith', '<u2'), ('azimuth', '<u2'), ('reflectivity', 'u1'), ('tag', 'u1')])
     N = 96
+    IS_SPHERICAL = True
+
+#single return of multi return spherical point
+_RETURN_DTYPE = np.dtype([('depth', '<u4'), ('reflectivity', 'u1'), ('tag', 'u1')])
+
+class DataType4(DataType):
+    TYPE = 4
+    _PACK_FORMAT = '<iiiBBiiiBB' #X1, Y1, Z1, reflectivity1, tag1, X2, Y2, Z2, reflectivity2, tag2
+    DTYPE = np.dtype([('returns', DataType2.DTYPE, (2, ))])
+    N = 48
+
+class DataType5(DataType):
+    TYPE = 5
+    _PACK_FORMAT = '<HHIBBIBB' #Zenith angle, Azimuth, Depth1, reflectivity1, tag1, Depth2, reflectivity2, tag2
+    DTYPE = np.dtype([('zenith', '<u2'), ('azimuth', '<u2'), ('returns', _RETURN_DTYPE, (2, ))])
+    N = 48
+    IS_SPHERICAL = True
+
+class DataType6(DataType):
+    TYPE = 6
+    _PACK_FORMAT = '<ffffff' #gyro X, Y, Z rad/s, acc X, Y, Z g
+    DTYPE = np.dtype([('gyro_x', '<f4'), ('gyro_y', '<f4'), ('gyro_z', '<f4'), ('acc_x', '<f4'), ('acc_y', '<f4'), ('acc_z', '<f4')])
+    N = 1
+
+class DataType7(DataType):
+    TYPE = 7
+    _PACK_FORMAT = '<iiiBBiiiBBiiiBB' #X, Y, Z, reflectivity, tag of 3 returns
+    DTYPE = np.dtype([('returns', DataType2.DTYPE, (3, ))])
+    N = 30
 
-# class DataType4:
-#     TYPE = 4
-#     _PACK_FORMAT = '<IIIB' #X, Y, Z, reflectivity
-#     N = 48
+class DataType8(DataType):
+    TYPE = 8
+    _PACK_FORMAT = '<HHIBBIBBIBB' #Zenith angle, Azimuth, Depth, reflectivity, tag of 3 returns
+    DTYPE = np.dtype([('zenith', '<u2'), ('azimuth', '<u2'), ('returns', _RETURN_DTYPE, (3, ))])
+    N = 30
+    IS_SPHERICAL = True
 
-# class DataType5:
-#     TYPE = 5
-#     _PACK_FORMAT = '<IIIB' #X, Y, Z, reflectivity
-#     N = 48
+IMU_RATE = 200 #IMU packets per second with PushFrequency.FREQ_200HZ
 
-# class DataType6:
-#     TYPE = 6
-#     _PACK_FORMAT = '<IIIB' #X, Y, Z, reflectivity
-#     N = 1
 
-# class DataType7:
-#     TYPE = 7
-#     _PACK_FORMAT = '<IIIB' #X, Y, Z, reflectivity
-#     N = 30
+def data_type_for(device_type:DeviceType, is_spherical:bool=False, return_mode:ReturnMode=ReturnMode.SINGLE_RETURN_FIRST)->type:
+    """Data type device streams in. Mid-40 sends basic packets only, other lidars extended ones with tag
+    and dual/triple return packets in multi return modes"""
+    if device_type is DeviceType.MID_40:
+        return DataType1 if is_spherical else DataType0
+    if return_mode is ReturnMode.DUAL_RETURN:
+        return DataType5 if is_spherical else DataType4
+    if return_mode is ReturnMode.TRIPLE_RETURN:
+        return DataType8 if is_spherical else DataType7
+    return DataType3 if is_spherical else DataType2
+
+
+def default_points(data_type:type)->np.ndarray:
+    """One packet of points on a circle 10 m ahead, every next return 0.5 m further.
+    IMU packet at rest. Used when emulator has no scene"""
+    points = np.zeros(data_type.N, data_type.DTYPE)
+    if data_type is DataType6:
+        points['acc_z'] = 1
+        return points
+    returns = points['returns'] if 'returns' in data_type.DTYPE.names else points[:, None]
+    depth = 10000 + 500 * np.arange(returns.shape[1])
+    angle = np.linspace(0, 2 * np.pi, data_type.N, endpoint=False)
+    radius = np.radians(15)
+    if data_type.IS_SPHERICAL:
+        returns['depth'] = depth
+        points['zenith'] = np.round(np.degrees(np.pi / 2 + radius * np.sin(angle)) * 100)
+        points['azimuth'] = np.round(np.degrees(radius * np.cos(angle)) % 360 * 100)
+    else:
+        returns['x'] = depth
+        returns['y'] = np.round(depth * np.tan(radius) * np.cos(angle)[:, None])
+        returns['z'] = np.round(depth * np.tan(radius) * np.sin(angle)[:, None])
+    returns['reflectivity'] = 100
+    return points
+
+
+def write_points(points:np.ndarray,
+                data_type:type,
+                azimuth:np.ndarray,
+                zenith:np.ndarray,
+                depth:'np.ndarray|int',
+                reflectivity:'np.ndarray|int'=100,
+                tag:'np.ndarray|int'=0)->np.ndarray:
+    """Write measurements into points of data_type in place, angles in radians, depth in mm.
+    For multi return types depth, reflectivity and tag with extra last axis give every return,
+    without it all returns are the same"""
+    if data_type is DataType6:
+        raise ValueError('IMU packets have no points')
+    is_multi = 'returns' in data_type.DTYPE.names
+    returns = points['returns'] if is_multi else points
+    def per_return(value):
+        value = np.asarray(value)
+        return value[..., None] if is_multi and value.ndim and value.ndim == azimuth.ndim else value
+    depth = per_return(depth)
+    if data_type.IS_SPHERICAL:
+        points['zenith'] = np.rint(np.degrees(zenith) * 100)
+        points['azimuth'] = np.rint(np.degrees(azimuth) * 100) % 36000
+        returns['depth'] = depth
+    else:
+        sin_zenith = np.sin(zenith)
+        for name, direction in (('x', sin_zenith * np.cos(azimuth)), ('y', sin_zenith * np.sin(azimuth)), ('z', np.cos(zenith))):
+            returns[name] = np.rint(per_return(direction) * depth)
+    returns['reflectivity'] = per_return(reflectivity)
+    if 'tag' in returns.dtype.names:
+        returns['tag'] = per_return(tag)
+    return points
+
+
+def packet_index(buffer:'bytes|mmap.mmap|memoryview')->'tuple(np.ndarray,np.ndarray)':
+    """Offsets and ns timestamps of point packets stored back to back in buffer.
+    Single data type streams are indexed with one strided view, mixed ones packet by packet"""
+    length = len(buffer)
+    if length < HEADER_LENGTH:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    first = DATA_TYPES.get(buffer[9])
+    if first is not None and length % first.PACKET_LENGTH == 0:
+        headers = np.ndarray((length // first.PACKET_LENGTH, ), np.dtype({'names': ['header'],
+                                                                           'formats': [HEADER_DTYPE],
+                                                                           'itemsize': first.PACKET_LENGTH}), buffer)['header']
+        if (headers['data_type'] == first.TYPE).all() and (headers['version'] == PROTOCOL_VERSION).all():
+            return np.arange(len(headers), dtype=np.int64) * first.PACKET_LENGTH, timestamps_ns(headers)
+    offsets = []
+    offset = 0
+    while offset + HEADER_LENGTH <= length:
+        version, data_type = struct.unpack_from('<B8xB', buffer, offset)
+        data_type = DATA_TYPES.get(data_type)
+        if version != PROTOCOL_VERSION or data_type is None or offset + data_type.PACKET_LENGTH > length:
+            raise ValueError(f'No point packet at offset {offset}')
+        offsets.append(offset)
+        offset += data_type.PACKET_LENGTH
+    if offset != length:
+        raise ValueError(f'{length - offset} trailing bytes after last packet')
+    offsets = np.array(offsets, np.int64)
+    headers = np.frombuffer(b''.join(bytes(buffer[o:o + HEADER_LENGTH]) for o in offsets), HEADER_DTYPE)
+    return offsets, timestamps_ns(headers)
+
+
+class PacketBlock:
+    """count point packets of one data type in one contiguous buffer, own or slot of bytearray at offset.
+    Constant header is packed once and copied to every packet, after that only timestamps,
+    status code and points are written for whole block with array operations.
+    Every packet is a memoryview into the buffer, so nothing is copied before send"""
+
+    def __init__(self,
+                data_type:type,
+                count:int,
+                slot_id:int=1,
+                lidar_id:int=1,
+                status_code:int=0,
+                timestamp_type:int=0,
+                buffer:bytearray=None,
+                offset:int=0):
+        self.data_type = data_type
+        self.count = count
+        length = data_type.PACKET_LENGTH
+        if buffer is None:
+            buffer = bytearray(count * length)
+        self.packets = np.frombuffer(buffer, data_type.PACKET_DTYPE, count, offset)
+        template = bytearray(HEADER_LENGTH)
+        HEADER_STRUCT.pack_into(template, 0, PROTOCOL_VERSION, slot_id, lidar_id, status_code, timestamp_type, data_type.TYPE, 0)
+        self.packets['header'] = np.frombuffer(template, HEADER_DTYPE)[0]
+        self._status_code = status_code
+        self._timestamps = self.packets['header']['timestamp']
+        self._steps = np.arange(count, dtype=np.uint64)
+        self.buffer = memoryview(buffer)[offset:offset + count * length]
+        self._views = [self.buffer[i * length:(i + 1) * length] for i in range(count)]
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} type:{self.data_type.TYPE} packets:{self.count}}}'
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index:int)->memoryview:
+        return self._views[index]
+
+    def __iter__(self):
+        return iter(self._views)
+
+    @property
+    def header(self)->np.ndarray:
+        return self.packets['header']
+
+    @property
+    def points(self)->np.ndarray:
+        """(count, N) view of points of every packet"""
+        return self.packets['points']
+
+    @property
+    def status_code(self)->int:
+        return self._status_code
+
+    @status_code.setter
+    def status_code(self, value:int):
+        if value != self._status_code:
+            self.packets['header']['status_code'] = value
+            self._status_code = value
+
+    def fill(self,
+            timestamp:int,
+            packet_period:int,
+            points:np.ndarray=None)->'PacketBlock':
+        """Stamp packets starting at timestamp (ns) every packet_period (ns).
+        points is (count, N) or (N, ) array broadcast over packets, None keeps points from previous fill"""
+        np.multiply(self._steps, packet_period, out=self._timestamps)
+        self._timestamps += timestamp
+        if points is not None:
+            self.packets['points'] = points
+        return self
+
+    def stamp(self, clock:PacketClock, offsets:np.ndarray=None, span:int=None)->'PacketBlock':
+        """Timestamps and timestamp type of next packets of clock.
+        With offsets (int64 ns) first len(offsets) packets are stamped that far after next packet of clock
+        and clock moves on by span"""
+        self.packets['header']['timestamp_type'] = clock.timestamp_type.value
+        if offsets is None:
+            clock.next(self.count, self._timestamps)
+        else:
+            clock.at(offsets, span, self._timestamps[:len(offsets)])
+        return self
+
+
+class PacketRing:
+    """slots PacketBlocks of same layout in one preallocated bytearray, handed out in turn.
+    Block can be filled while views of previous ones are still being sent"""
+
+    def __init__(self, data_type:type, count:int, slots:int=2, **header):
+        if slots < 1:
+            raise ValueError(f'Slots {slots} < 1')
+        self.data_type = data_type
+        size = count * data_type.PACKET_LENGTH
+        self.buffer = bytearray(slots * size)
+        self.blocks = [PacketBlock(data_type, count, buffer=self.buffer, offset=slot * size, **header) for slot in range(slots)]
+        self._next = 0
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} type:{self.data_type.TYPE} slots:{len(self.blocks)} packets:{self.blocks[0].count}}}'
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def next(self)->PacketBlock:
+        block = self.blocks[self._next]
+        self._next = (self._next + 1) % len(self.blocks)
+        return block
 
 
 class Frame:
-    PROTOCOL_VERSION = 5
+    """Single point packet. Streams are built with PacketBlock"""
+    PROTOCOL_VERSION = PROTOCOL_VERSION
     SLOT_ID = 1
     LIDAR_ID = 1
-    DATA = DataType1()
+    DATA = DataType1
+    _HEADER_STRUCT = HEADER_STRUCT #protocol version, slot_id,lidar_id,reserved,status_code,time_type,data_type,time
+
+    def __init__(self, points:np.ndarray=None, timestamp:int=None, timestamp_type:TimestampType=TimestampType.NO_SYNC):
+        self.points = default_points(self.DATA) if points is None else points
+        self.timestamp = timestamp
+        self.timestamp_type = timestamp_type
 
     @property
     def header(self)->bytes:
-        return struct.pack('<BBBxIBBQ', #protocol version, slot_id,lidar_id,reserved,status_code,time_type,data_type,time, 
+        buffer = bytearray(HEADER_LENGTH)
+        self._header_into(buffer, 0)
+        return bytes(buffer)
+
+    def _header_into(self, buffer:bytearray, offset:int):
+        self._HEADER_STRUCT.pack_into(
+                            buffer,
+                            offset,
                             self.PROTOCOL_VERSION,
                             self.SLOT_ID,
                             self.LIDAR_ID,
                             0, #status code
-                            LidarStatus.TimeSync.NO_TIME_SYNC.value,
-                            self.DATA.TYPE, #datatype 
-                            int(time.time() * 1000000000),
+                            self.timestamp_type.value,
+                            self.DATA.TYPE, #datatype
+                            int(encode_timestamps(time.time_ns() if self.timestamp is None else self.timestamp, self.timestamp_type)),
                             )
 
+    @property
+    def payload(self)->bytes:
+        return np.asarray(self.points, self.DATA.DTYPE).tobytes()
 
     @property
-    def payload(self):
-        length = struct.calcsize(self.DATA._PACK_FORMAT)
-        # t = [*next(self.DATA)]
-        value =  b''.join([ struct.pack('<IHHB',  *next(self.DATA), 100 ) for i in range(100)])
-        # return value
-        return os.urandom(length * self.DATA.N)
+    def length(self)->int:
+        return HEADER_LENGTH + self.DATA.N * self.DATA.DTYPE.itemsize
 
+    def frame_into(self, buffer:bytearray, offset:int=0)->int:
+        """Pack packet into preallocated buffer at offset, returns its length"""
+        self._header_into(buffer, offset)
+        start = offset + HEADER_LENGTH
+        points = np.frombuffer(buffer, self.DATA.DTYPE, self.DATA.N, start)
+        points[...] = self.points
+        return self.length
 
     @property
     def frame(self)->bytes:
-        return self.header + self.payload
+        buffer = bytearray(self.length)
+        self.frame_into(buffer)
+        return bytes(buffer)
@@ -0,0 +1,112 @@
+#Streaming export of decoded points to binary PCD and PLY.
+#Header is written with fixed width point count patched on close, every batch is packed
+#into reused record buffer and written with one call
+
+#libs
+import numpy as np
+#proj
+from pylivox.points import PointCloud
+
+#x, y, z in meters, reflectivity as intensity, tag, timestamp in seconds
+RECORD_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('intensity', 'u1'), ('tag', 'u1'), ('timestamp', '<f8')])
+WRITE_BUFFER = 16 * 1024 * 1024 #bytes
+_COUNT = b'{count}'
+_COUNT_WIDTH = 12 #digits of patched point count
+
+
+class CloudWriter:
+    """Binary point file of RECORD_DTYPE records. write appends batches, close patches point count.
+    Usable as context manager"""
+    HEADER:bytes = None #with _COUNT where point count goes
+
+    def __init__(self, path:str, buffer_size:int=WRITE_BUFFER):
+        self.path = path
+        self.count = 0
+        self._records = np.empty(0, RECORD_DTYPE)
+        self._file = open(path, 'wb', buffering=buffer_size)
+        header = self.HEADER
+        self._count_offsets = []
+        while _COUNT in header:
+            self._count_offsets.append(header.index(_COUNT))
+            header = header.replace(_COUNT, self._count_bytes(0), 1)
+        self._file.write(header)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.path} points:{self.count}}}'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _count_bytes(count:int)->bytes:
+        if count >= 10 ** _COUNT_WIDTH:
+            raise ValueError(f'{count} points do not fit into header')
+        return f'{count:0{_COUNT_WIDTH}d}'.encode()
+
+    def write(self, cloud:PointCloud):
+        """Append points of batch"""
+        count = len(cloud)
+        if count > len(self._records):
+            self._records = np.empty(count, RECORD_DTYPE)
+        records = self._records[:count]
+        records['x'] = cloud.x
+        records['y'] = cloud.y
+        records['z'] = cloud.z
+        records['intensity'] = cloud.reflectivity
+        records['tag'] = cloud.tag
+        np.multiply(cloud.timestamp, 1e-9, out=records['timestamp'])
+        self._file.write(records.data)
+        self.count += count
+
+    def close(self):
+        if self._file.closed:
+            return
+        count = self._count_bytes(self.count)
+        for offset in self._count_offsets:
+            self._file.seek(offset)
+            self._file.write(count)
+        self._file.close()
+
+
+class PcdWriter(CloudWriter):
+    HEADER = (b'# .PCD v0.7 - Point Cloud Data file format\n'
+              b'VERSION 0.7\n'
+              b'FIELDS x y z intensity tag timestamp\n'
+              b'SIZE 4 4 4 1 1 8\n'
+              b'TYPE F F F U U F\n'
+              b'COUNT 1 1 1 1 1 1\n'
+              b'WIDTH ' + _COUNT + b'\n'
+              b'HEIGHT 1\n'
+              b'VIEWPOINT 0 0 0 1 0 0 0\n'
+              b'POINTS ' + _COUNT + b'\n'
+              b'DATA binary\n')
+
+
+class PlyWriter(CloudWriter):
+    HEADER = (b'ply\n'
+              b'format binary_little_endian 1.0\n'
+              b'element vertex ' + _COUNT + b'\n'
+              b'property float x\n'
+              b'property float y\n'
+              b'property float z\n'
+              b'property uchar intensity\n'
+              b'property uchar tag\n'
+              b'property double timestamp\n'
+              b'end_header\n')
+
+
+def read_points(path:str)->np.ndarray:
+    """Records of file written by PcdWriter or PlyWriter, memory mapped"""
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+        size = f.seek(0, 2)
+    end = head.find(b'DATA binary\n') if head.startswith(b'# .PCD') else head.find(b'end_header\n')
+    if end < 0:
+        raise ValueError(f'{path}: not a binary PCD or PLY')
+    offset = head.index(b'\n', end) + 1
+    if size == offset:
+        return np.zeros(0, RECORD_DTYPE)
+    return np.memmap(path, RECORD_DTYPE, 'r', offset)
@@ -0,0 +1,102 @@
+#Reduction of decoded points before they reach consumers: noise tags, reflectivity and voxel grid.
+#Voxels are found by sorting packed integer keys of all points at once
+
+#libs
+import numpy as np
+#proj
+from pylivox.points import PointCloud
+
+#tag bits of data types 2..8, every field is 0 for normal point, 1..3 for noise of falling confidence
+TAG_SPATIAL = 0x03 #noise by spatial position
+TAG_INTENSITY = 0x0C #noise by intensity
+TAG_RETURN = 0x30 #return number
+TAG_NOISE = TAG_SPATIAL | TAG_INTENSITY
+
+_KEY_BITS = 21 #per axis, voxel index is packed into one int64 key
+_KEY_OFFSET = 1 << (_KEY_BITS - 1)
+
+
+def keep_mask(cloud:PointCloud, noise:int=TAG_NOISE, min_reflectivity:int=0, max_reflectivity:int=255)->np.ndarray:
+    """True for points without noise bits of tag and with reflectivity in min..max"""
+    mask = (cloud.tag & noise) == 0
+    if min_reflectivity > 0:
+        mask &= cloud.reflectivity >= min_reflectivity
+    if max_reflectivity < 255:
+        mask &= cloud.reflectivity <= max_reflectivity
+    return mask
+
+
+def voxel_keys(xyz:np.ndarray, size:float)->np.ndarray:
+    """int64 key of voxel of every point, size meters. Coordinates beyond 2**20 voxels are clipped"""
+    index = np.floor(xyz * np.float32(1 / size)).astype(np.int64)
+    np.clip(index, -_KEY_OFFSET, _KEY_OFFSET - 1, out=index)
+    index += _KEY_OFFSET
+    return (index[:, 0] << (2 * _KEY_BITS)) | (index[:, 1] << _KEY_BITS) | index[:, 2]
+
+
+def voxel_downsample(cloud:PointCloud, size:float, out:PointCloud=None)->PointCloud:
+    """One point per occupied voxel: centroid of its points, other columns of its earliest point.
+    Written to start of out when given (must fit point per voxel), returns view of written points"""
+    if size <= 0:
+        raise ValueError(f'Voxel size {size} <= 0')
+    count = len(cloud)
+    if not count:
+        return cloud[:0] if out is None else out[:0]
+    keys = voxel_keys(cloud.xyz, size)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    starts = np.flatnonzero(np.diff(keys, prepend=keys[0] - 1))
+    voxels = len(starts)
+    if out is None:
+        out = PointCloud.empty(voxels)
+    elif voxels > len(out):
+        raise ValueError(f'{voxels} voxels do not fit into {len(out)} points')
+    result = out[:voxels]
+    sums = np.add.reduceat(cloud.xyz[order], starts, axis=0, dtype=np.float64)
+    np.divide(sums, np.diff(starts, append=count)[:, None], out=result.xyz, casting='unsafe')
+    first = order[starts]
+    for name in PointCloud.__slots__[1:]:
+        np.take(getattr(cloud, name), first, out=getattr(result, name))
+    return result
+
+
+class PointFilter:
+    """Filter of frames: noise and reflectivity mask, voxel grid of voxel meters (None to skip)
+    and at most max_points points, evenly thinned when more are left.
+    Result is written into buffer of max_points and stays valid until next call"""
+
+    def __init__(self,
+                max_points:int,
+                voxel:float=None,
+                noise:int=TAG_NOISE,
+                min_reflectivity:int=0,
+                max_reflectivity:int=255):
+        if max_points < 1:
+            raise ValueError(f'Max points {max_points} < 1')
+        if voxel is not None and voxel <= 0:
+            raise ValueError(f'Voxel size {voxel} <= 0')
+        self.max_points = max_points
+        self.voxel = voxel
+        self.noise = noise
+        self.min_reflectivity = min_reflectivity
+        self.max_reflectivity = max_reflectivity
+        self._out = PointCloud.empty(max_points)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} max:{self.max_points} voxel:{self.voxel} noise:{self.noise:#04x}}}'
+
+    def __call__(self, cloud:PointCloud)->PointCloud:
+        mask = keep_mask(cloud, self.noise, self.min_reflectivity, self.max_reflectivity)
+        if not mask.all():
+            cloud = cloud[mask]
+        if self.voxel is not None:
+            cloud = voxel_downsample(cloud, self.voxel)
+        count = len(cloud)
+        if count > self.max_points:
+            index = np.linspace(0, count, self.max_points, endpoint=False).astype(np.intp)
+            cloud = cloud[index]
+            count = self.max_points
+        result = self._out[:count]
+        for name in PointCloud.__slots__:
+            getattr(result, name)[...] = getattr(cloud, name)
+        return result
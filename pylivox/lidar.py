@@ -4,35 +4,59 @@ import time
 import socket
 import ipaddress
 import enum
+#libs
+import numpy as np
 #import proj
 import log
 from pylivox.control import general, lidar
-from pylivox.control.frame import Frame, set_default_device_type, set_default_device_version
+from pylivox.control.frame import Frame, device_context
 from pylivox.control.utils import FrameFrom
-from pylivox.data import Frame as DataFrame
+from pylivox.control.template import TemplateCache
+from pylivox.data import PacketBlock, PacketRing, PacketClock, TimestampType, POINT_RATE, IMU_RATE, DataType6, data_type_for, default_points, write_points
+from pylivox.scan import ScanCursor, load_table
+from pylivox.scene import Scene, default_scene
+from pylivox.replay import Replay
+from pylivox.transform import Extrinsics
+from pylivox.lvx import LvxWriter
+from pylivox.capture import Recorder, RX, TX
 
 logger = log.getLogger(__name__)
 
 
 class Lidar:
+    DATA_TX_PERIOD = 0.1 #seconds of points sent in one packet block
+    DEPTH = 10000 #mm, distance of every point without scene
        
 # 
-    def __init__(self, serial:'str|bytes', model:general.DeviceType, fwv:'tuple(int,int,int,int)'):
+    def __init__(self, 
+                serial:'str|bytes', 
+                model:general.DeviceType, 
+                fwv:'tuple(int,int,int,int)', 
+                scene:Scene=None, 
+                replay:Replay=None,
+                recorder:LvxWriter=None,
+                capture:Recorder=None):
         self.serial = serial
-        general.DeviceType(model)
-        self.device_type = model
-        general.QueryDeviceInformationResponse(device_version=fwv, seq=0)
-        self.device_version = fwv
+        self.scene = default_scene() if scene is None else scene
+        #PacketReplay or PointReplay streamed instead of scan
+        self.replay = replay
+        #LvxWriter getting copy of every sent data packet
+        self.recorder = recorder
+        #Recorder of every datagram sent or received, control and data
+        self.capture = capture
+        #every frame is encoded and decoded for own device, process defaults are left untouched
+        self.context = device_context(model, fwv)
+        self.device_type = self.context.device_type
+        self.device_version = self.context.device_version
         self.master:general.Handshake = None
-        #Update libs defaults device's type,version 
-        set_default_device_type(self.device_type)
-        set_default_device_version(self.device_version)
+        self.master_address:'tuple(str,int)' = None
         #
         self.is_spherical = False
         self.rain_fog_suppression = False
         self.fan = False
         self.return_mode = lidar.ReturnMode.SINGLE_RETURN_FIRST
         self.imu_data_push_freq = lidar.PushFrequency.FREQ_200HZ
+        self.extrinsic_parameters = Extrinsics()
         self.config_parameters = {general.ConfigurationParameter.Key.SWITCH_REPETITIVE_NON_REPETITIVE_SCANNING_PATTERN: False, 
                                     general.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION: 0,
                                     general.ConfigurationParameter.Key.HIGH_SENSITIVITY_FUNCTION: False
@@ -42,6 +66,17 @@ class Lidar:
         self.sampling = False
         self.state:general.WorkState.Lidar = general.WorkState.Lidar.Standby
         self.seq = 0
+        self._ring:PacketRing = None
+        self._packet_period = 0
+        self._imu_block:PacketBlock = None
+        #one time base for points and IMU, both follow UTC synchronization
+        self._clock = PacketClock(0)
+        self._imu_clock = PacketClock(1000000000 // IMU_RATE, start_ns=self._clock.start_ns, epoch_ns=self._clock.epoch_ns)
+        self._scan:ScanCursor = None
+        self._scan_repetitive:bool = None
+        self._scan_cursor()
+        self.templates = TemplateCache(self.context)
+        self.templates.add(general.HeartbeatResponse(self.state, 0, 0, 0, device_type=self.context), fields=('work_state', ))
         self.s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         self.s.bind((str(ipaddress.IPv4Address("0.0.0.0")), 65000)) 
@@ -53,7 +88,7 @@ class Lidar:
 
     def _run_broadcast(self):
         def t():
-            msg = general.BroadcastMsg(general.Broadcast(self.serial, 0x31), 0, self.device_type).frame
+            msg = self.templates.add(general.BroadcastMsg(general.Broadcast(self.serial, 0x31), 0, self.context)).render(0)
             while True:
                 try:
                     time.sleep(1)
@@ -63,6 +98,7 @@ class Lidar:
                     self.is_connected = False
                     logger.debug('broadcast...')
                     self.s.sendto(msg, ('255.255.255.255', 55000) )
+                    self._capture(msg, 55000, TX)
                 except Exception as e:
                     logger.exception(e)
         self._broadcast_thread = threading.Thread(target=t, name='broadcast', daemon=True)
@@ -72,19 +108,23 @@ class Lidar:
         while True:
             try:
                 data, addr = self.s.recvfrom(1500)
+                self._capture(data, addr[1], RX)
                 self.heartbeat_time = time.time()
-                frame = FrameFrom(data)
+                frame = FrameFrom(data, self.context)
+                if frame is None:
+                    logger.warning(f'Unknown frame cmd set,type,id:{data[9]},{data[4]},{data[10]}')
+                    continue
                 if type(frame) is not general.Heartbeat:
                     logger.debug(f'<< {addr} {frame}')
                 handler = self.HANDLERS[type(frame)]
                 akn = handler(self, frame)
                 if akn: 
-                    self.send(akn)
+                    self.send(akn, type(frame) is general.Heartbeat)
                 continue
             except socket.timeout:
                 pass
             except KeyError as e:
-                logger.warning(f'Unknown frame cmd type,set,id:{e}')
+                logger.warning(f'No handler for {e}')
             except Exception as e:
                 logger.exception(e)
             time.sleep(1)
@@ -93,19 +133,33 @@ class Lidar:
         def f():
             # s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             # s.bind(('0.0.0.0', 37777))
-            sleep_time = 0.1
+            sleep_time = self.DATA_TX_PERIOD
+            deadline = time.monotonic()
             while True:
                 try:
                     if not self.is_connected:
                         self.sampling = False
                     if self.sampling:
-                        time_start = time.time()
-                        frame = DataFrame().frame
-                        for i in range(1000):
-                            pass
-                            self.s.sendto(DataFrame().frame, (str(self.master.ip), self.master.point_port))
-                        sleep_time = time_start+1 - time.time()
-                        sleep_time = sleep_time if sleep_time > 0 else 0
+                        address = (str(self.master.ip), self.master.point_port)
+                        packets = self._data_packets()
+                        for packet in packets:
+                            self.s.sendto(packet, address)
+                            self._capture(packet, address[1], TX)
+                        self._record(packets)
+                        imu_block = self._imu_data_block()
+                        if imu_block is not None:
+                            imu_block.stamp(self._imu_clock)
+                            address = (str(self.master.ip), self.master.imu_port)
+                            for packet in imu_block:
+                                self.s.sendto(packet, address)
+                                self._capture(packet, address[1], TX)
+                            self._record(imu_block)
+                    deadline += self.DATA_TX_PERIOD
+                    sleep_time = deadline - time.monotonic()
+                    if sleep_time < 0:
+                        #behind schedule: drop the backlog instead of bursting
+                        deadline = time.monotonic()
+                        sleep_time = 0
                 except Exception as e:
                     logger.exception(e)
                     sleep_time = 0.1
@@ -113,56 +167,131 @@ class Lidar:
         self._data_tx_thread = threading.Thread(target=f, name='data_tx', daemon=True)
         self._data_tx_thread.start()
 
-    def send(self, frame:Frame):
-        if type(frame) is general.HeartbeatResponse:
-            self.s.sendto(frame.frame, (str(self.master.ip), self.master.cmd_port))
+    def _capture(self, datagram:'bytes|memoryview', port:int, direction:int):
+        if self.capture is None:
+            return
+        try:
+            self.capture.record(datagram, port, direction)
+        except Exception as e:
+            #writer failed or was closed: capture stops, emulator goes on
+            logger.exception(e)
+            self.capture = None
+
+    def _record(self, packets:'PacketBlock|list(memoryview)'):
+        if self.recorder is not None:
+            self.recorder.write(packets.buffer if isinstance(packets, PacketBlock) else packets)
+
+    def _data_packets(self)->'PacketBlock|list(memoryview)':
+        """Packets of next DATA_TX_PERIOD from replay or scan"""
+        if self.replay is not None:
+            data_type = data_type_for(self.device_type, self.is_spherical, self.return_mode)
+            return self.replay.packets(int(self.DATA_TX_PERIOD * 1000000000), self._clock, data_type, self.scene)
+        block = self._data_block()
+        self._write_scan(block)
+        return block.stamp(self._clock)
+
+    def _data_block(self)->PacketBlock:
+        """Next slot of ring of packets of one DATA_TX_PERIOD in current data type. Ring is rebuilt only when data type changes"""
+        data_type = data_type_for(self.device_type, self.is_spherical, self.return_mode)
+        if self._ring is None or self._ring.data_type is not data_type:
+            rate = POINT_RATE.get(self.device_type, POINT_RATE[general.DeviceType.MID_40])
+            self._packet_period = self._clock.packet_period = data_type.N * 1000000000 // rate
+            self._ring = PacketRing(data_type, max(1, int(rate * self.DATA_TX_PERIOD) // data_type.N))
+            logger.debug(f'data type {data_type.TYPE}, {self._ring}')
+        return self._ring.next()
+
+    def _scan_cursor(self)->ScanCursor:
+        """Cursor over scan table selected by repetitive scanning parameter, table is memory mapped from cache.
+        Repetitive scan of static scene walks measurements cast once for every row of table"""
+        repetitive = self.config_parameters[general.ConfigurationParameter.Key.SWITCH_REPETITIVE_NON_REPETITIVE_SCANNING_PATTERN]
+        if self._scan is None or self._scan_repetitive != repetitive:
+            table = load_table(self.device_type, repetitive)
+            if repetitive and self.scene is not None and self.scene.static:
+                table = self.scene.measure(table)
+            self._scan = ScanCursor(table)
+            self._scan_repetitive = repetitive
+        return self._scan
+
+    def _write_scan(self, block:PacketBlock):
+        """Next directions of scan pattern and their measurements into points of block"""
+        data_type = block.data_type
+        rows = self._scan_cursor().take(len(block) * data_type.N).reshape(len(block), data_type.N)
+        azimuth, zenith = rows['azimuth'], rows['zenith']
+        if 'depth' in rows.dtype.names:
+            depth, reflectivity = rows['depth'], rows['reflectivity']
+        elif self.scene is not None:
+            depth, reflectivity = self.scene.cast(azimuth, zenith)
         else:
-            self.s2.sendto(frame.frame, (str(self.master.ip), self.master.cmd_port))
-            logger.debug(f'>> {frame}')
+            depth, reflectivity = self.DEPTH, 100
+        write_points(block.points, data_type, azimuth, zenith, depth, reflectivity)
+
+    def _imu_data_block(self)->'PacketBlock|None':
+        """IMU packets of one DATA_TX_PERIOD, None when push is off or master has no IMU port"""
+        if self.imu_data_push_freq is not lidar.PushFrequency.FREQ_200HZ or not self.master.imu_port:
+            return None
+        if self._imu_block is None:
+            self._imu_block = PacketBlock(DataType6, int(IMU_RATE * self.DATA_TX_PERIOD))
+            self._imu_block.fill(0, 0, default_points(DataType6))
+        return self._imu_block
+
+    def send(self, frame:'Frame|memoryview', is_heartbeat:bool=False):
+        """Send frame object or rendered template to master"""
+        data = frame if type(frame) is memoryview else frame.frame
+        if is_heartbeat or type(frame) is general.HeartbeatResponse:
+            self.s.sendto(data, self.master_address)
+        else:
+            self.s2.sendto(data, self.master_address)
+            logger.debug(f'>> {frame if type(frame) is not memoryview else bytes(frame).hex()}')
+        self._capture(data, self.master_address[1], TX)
 
 
 
     def onHandshake(self, req: general.Handshake):
         if not self.is_connected:
             self.master = req
+            self.master_address = (str(req.ip), req.cmd_port)
             self.heartbeat_time = time.time()
             self.is_connected = True
-            return general.HandshakeResponse(req.seq)
+            return self.templates.ack(general.HandshakeResponse, req.seq)
         else:
             logger.error('No handshake expected')
 
     def onQueryDeviceInformation(self, req: general.QueryDeviceInformation):
-        return general.QueryDeviceInformationResponse(req.seq)
+        return self.templates.ack(general.QueryDeviceInformationResponse, req.seq)
     def onHeartbeat(self, req: general.Heartbeat):
-        return general.HeartbeatResponse(work_state=self.state, 
-                                        feature_msg=0,
-                                        ack_msg=0, 
-                                        seq=req.seq)
+        return self.templates.render(general.HeartbeatResponse, req.seq, work_state=self.state)
     def onStartStopSampling(self, req: general.StartStopSampling):
         logger.debug(f'sampling: {self.sampling}->{req.is_start}')
         self.sampling = req.is_start
         # self.state = general.WorkState.Lidar.Normal if self.sampling else general.WorkState.Lidar.Standby
         logger.debug(f'state:{self.state}')
-        return general.StartStopSamplingResponse(req.seq)
+        return self.templates.ack(general.StartStopSamplingResponse, req.seq)
     def onChangeCoordinateSystem(self, req: general.ChangeCoordinateSystem):
         self.is_spherical = req.is_spherical
-        return general.ChangeCoordinateSystemResponse(req.seq)
+        return self.templates.ack(general.ChangeCoordinateSystemResponse, req.seq)
     def onDisconnect(self, req: general.Disconnect):
         self.heartbeat_time = time.time() - 5
     def onConfigureStaticDynamicIp(self, req: general.ConfigureStaticDynamicIp):
         pass
     def onGetDeviceIpInformation(self, req: general.GetDeviceIpInformation):
-        return general.GetDeviceIpInformationResponse(True, '192.168.222.56', '255.255.255.0', '192.168.222.1', req.seq)
+        return general.GetDeviceIpInformationResponse(True, '192.168.222.56', '255.255.255.0', '192.168.222.1', req.seq, 
+                                                      device_type=self.context)
     def onRebootDevice(self, req: general.RebootDevice):
         pass
     def onWriteConfigurationParameters(self, req: general.WriteConfigurationParameters):
-        pass
+        for param in req.param_list:
+            self.config_parameters[param.key] = param.value
+        return general.WriteConfigurationParametersResponse(req.param_list[0].key,
+                                                        general.ConfigurationParameter.ErrorCode.NO_ERROR,
+                                                        req.seq,
+                                                        device_type=self.context)
     def onReadConfigurationParameters(self, req: general.ReadConfigurationParameters):
         params = [general.ConfigurationParameter(key, value) for key,value in self.config_parameters.items() if key in req.keys]
         result = general.ReadConfigurationParametersResponse(params[0].key,
                                                         general.ConfigurationParameter.ErrorCode.NO_ERROR,
                                                         params,
-                                                        req.seq
+                                                        req.seq,
+                                                        device_type=self.context
         )
         return result
 
@@ -170,7 +299,7 @@ class Lidar:
 
     def onSetMode(self, req: lidar.SetMode):
         self.state = general.WorkState.Lidar(req.power_mode.value)
-        return lidar.SetModeResponse(result=lidar.SetModeResponse.Result.Switching, seq=req.seq)
+        return lidar.SetModeResponse(result=lidar.SetModeResponse.Result.Switching, seq=req.seq, device_type=self.context)
     def onWriteLidarExtrinsicParameters(self, req: lidar.WriteLidarExtrinsicParameters):
         self.extrinsic_parameters.roll = req.roll
         self.extrinsic_parameters.yaw = req.yaw
@@ -178,7 +307,7 @@ class Lidar:
         self.extrinsic_parameters.x = req.x
         self.extrinsic_parameters.y = req.y
         self.extrinsic_parameters.z = req.z
-        return lidar.WriteLidarExtrinsicParametersResponse(req.seq)
+        return self.templates.ack(lidar.WriteLidarExtrinsicParametersResponse, req.seq)
     def onReadLidarExtrinsicParameters(self, req: lidar.ReadLidarExtrinsicParameters):
         return lidar.ReadLidarExtrinsicParametersResponse(self.extrinsic_parameters.roll,
                                                           self.extrinsic_parameters.pitch,
@@ -186,27 +315,33 @@ class Lidar:
                                                           self.extrinsic_parameters.x,
                                                           self.extrinsic_parameters.y,
                                                           self.extrinsic_parameters.z,
-                                                          req.seq)
+                                                          req.seq,
+                                                          device_type=self.context)
     def onTurnOnOffRainFogSuppression(self, req: lidar.TurnOnOffRainFogSuppression):
         self.rain_fog_suppression = req.is_enable
-        return lidar.TurnOnOffRainFogSuppressionResponse(req.seq)
+        return self.templates.ack(lidar.TurnOnOffRainFogSuppressionResponse, req.seq)
     def onSetTurnOnOffFan(self, req: lidar.SetTurnOnOffFan):
         self.fan = req.is_enable
-        return lidar.SetTurnOnOffFanResponse(req.seq)
+        return self.templates.ack(lidar.SetTurnOnOffFanResponse, req.seq)
     def onGetTurnOnOffFanState(self, req: lidar.GetTurnOnOffFanState):
-        return lidar.GetTurnOnOffFanStateResponse(False, req.seq)
+        return lidar.GetTurnOnOffFanStateResponse(False, req.seq, device_type=self.context)
     def onSetLidarReturnMode(self, req: lidar.SetLidarReturnMode):
         self.return_mode = req.return_mode
-        return lidar.SetLidarReturnModeResponse(req.seq)
+        return self.templates.ack(lidar.SetLidarReturnModeResponse, req.seq)
     def onGetLidarReturnMode(self, req: lidar.GetLidarReturnMode):
-        return lidar.GetLidarReturnModeResponse(self.return_mode, req.seq)
+        return lidar.GetLidarReturnModeResponse(self.return_mode, req.seq, device_type=self.context)
     def onSetImuDataPushFrequency(self, req: lidar.SetImuDataPushFrequency):
         self.imu_data_push_freq = req.frequency
-        return lidar.SetImuDataPushFrequencyResponse(req.seq)
+        return self.templates.ack(lidar.SetImuDataPushFrequencyResponse, req.seq)
     def onGetImuDataPushFrequency(self, req: lidar.GetImuDataPushFrequency):
-        return lidar.GetImuDataPushFrequencyResponse(lidar.PushFrequency.FREQ_200HZ, req.seq)
+        return lidar.GetImuDataPushFrequencyResponse(lidar.PushFrequency.FREQ_200HZ, req.seq, device_type=self.context)
     def onUpdateUtcSynchronizationTime(self, req: lidar.UpdateUtcSynchronizationTime):
-        pass
+        #year is counted from 2000
+        hour = np.datetime64(f'{2000 + req.year:04}-{req.month:02}-{req.day:02}T{req.hour:02}', 'ns')
+        epoch_ns = int(hour.astype(np.int64)) + req.microseconds * 1000
+        for clock in (self._clock, self._imu_clock):
+            clock.sync(epoch_ns, TimestampType.GPS)
+        return self.templates.ack(lidar.UpdateUtcSynchronizationTimeResponse, req.seq)
     
 
     HANDLERS = {
@@ -219,7 +354,7 @@ class Lidar:
         # general.ConfigureStaticDynamicIp        : onConfigureStaticDynamicIp,                
         general.GetDeviceIpInformation          : onGetDeviceIpInformation,              
         # general.RebootDevice                    : onRebootDevice,    
-        # general.WriteConfigurationParameters    : onWriteConfigurationParameters,                    
+        general.WriteConfigurationParameters    : onWriteConfigurationParameters,                    
         general.ReadConfigurationParameters     : onReadConfigurationParameters,                   
 
         lidar.SetMode                           : onSetMode,       
@@ -232,5 +367,5 @@ class Lidar:
         lidar.GetLidarReturnMode                : onGetLidarReturnMode,                  
         lidar.SetImuDataPushFrequency           : onSetImuDataPushFrequency,                       
         lidar.GetImuDataPushFrequency           : onGetImuDataPushFrequency,                       
-        # lidar.UpdateUtcSynchronizationTime      : onUpdateUtcSynchronizationTime,                            
+        lidar.UpdateUtcSynchronizationTime      : onUpdateUtcSynchronizationTime,                            
     }
\ No newline at end of file
@@ -0,0 +1,240 @@
+#Livox .lvx recordings (v1.1): header, device info blocks and frames of packages.
+#Package is device index byte followed by point packet as sent by lidar, so reader hands out
+#packets as memoryviews of mapped file. Frame offsets and timestamps are indexed once and cached
+
+#std
+import os
+import mmap
+import struct
+#libs
+import numpy as np
+#proj
+import log
+from pylivox.control.frame import DeviceType
+from pylivox.data import DATA_TYPES, HEADER_DTYPE, HEADER_LENGTH, packet_index, timestamps_ns
+
+logger = log.getLogger(__name__)
+
+SIGNATURE = b'livox_tech'
+VERSION = (1, 1, 0, 0)
+MAGIC = 0xAC0EA767
+FRAME_DURATION = 50 #ms
+#signature, version a/b/c/d, magic code, frame duration ms, device count
+HEADER_STRUCT = struct.Struct('<16s4BIIB')
+#current offset, next offset, frame index
+FRAME_HEADER_STRUCT = struct.Struct('<QQQ')
+#extrinsics in degrees and meters
+DEVICE_DTYPE = np.dtype([
+    ('lidar_sn', 'S16'),
+    ('hub_sn', 'S16'),
+    ('device_index', 'u1'),
+    ('device_type', 'u1'),
+    ('extrinsic_enable', 'u1'),
+    ('roll', '<f4'),
+    ('pitch', '<f4'),
+    ('yaw', '<f4'),
+    ('x', '<f4'),
+    ('y', '<f4'),
+    ('z', '<f4'),
+])
+#frame offset in file, bytes of its packages, timestamp of its first package in ns
+INDEX_DTYPE = np.dtype([('offset', '<i8'), ('size', '<i8'), ('timestamp', '<i8')])
+
+
+def device_info(lidar_sn:'str|bytes',
+                device_type:DeviceType,
+                extrinsics=None,
+                hub_sn:'str|bytes'=b'')->np.ndarray:
+    """Device info block, extrinsics (pylivox.transform.Extrinsics) are enabled when given"""
+    info = np.zeros((), DEVICE_DTYPE)
+    info['lidar_sn'] = lidar_sn.encode() if isinstance(lidar_sn, str) else lidar_sn
+    info['hub_sn'] = hub_sn.encode() if isinstance(hub_sn, str) else hub_sn
+    info['device_type'] = device_type.value
+    if extrinsics is not None:
+        info['extrinsic_enable'] = 1
+        info['roll'], info['pitch'], info['yaw'] = extrinsics.roll, extrinsics.pitch, extrinsics.yaw
+        info['x'], info['y'], info['z'] = extrinsics.x / 1000, extrinsics.y / 1000, extrinsics.z / 1000
+    return info
+
+
+def _packet_timestamps(packets:list)->np.ndarray:
+    headers = np.frombuffer(b''.join(bytes(packet[:HEADER_LENGTH]) for packet in packets), HEADER_DTYPE)
+    return timestamps_ns(headers)
+
+
+class LvxWriter:
+    """Packets of devices (device_info blocks, index in list is device index) into frames
+    of frame_duration ms by their timestamps. Frame is written once next one starts or on close"""
+
+    def __init__(self, path:str, devices:list, frame_duration:int=FRAME_DURATION, buffer_size:int=16 * 1024 * 1024):
+        if not 0 < len(devices) < 256:
+            raise ValueError(f'{len(devices)} devices, expected 1..255')
+        self.path = path
+        self.frame_duration = frame_duration
+        self.frames = 0
+        self._frame = bytearray()
+        self._end:int = None
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._file.write(HEADER_STRUCT.pack(SIGNATURE, *VERSION, MAGIC, frame_duration, len(devices)))
+        for index, device in enumerate(devices):
+            device = np.array(device, DEVICE_DTYPE)
+            device['device_index'] = index
+            self._file.write(device.tobytes())
+        self._offset = self._file.tell()
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.path} frames:{self.frames}}}'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _close_frame(self):
+        size = FRAME_HEADER_STRUCT.size + len(self._frame)
+        self._file.write(FRAME_HEADER_STRUCT.pack(self._offset, self._offset + size, self.frames))
+        self._file.write(self._frame)
+        self._offset += size
+        self.frames += 1
+        self._frame.clear()
+
+    def write(self, packets:'bytes|memoryview|list(bytes|memoryview)', device_index:int=0):
+        """Point or IMU packets of device, one packet, buffer of packets back to back or list of them"""
+        if isinstance(packets, (list, tuple)):
+            if not packets:
+                return
+            timestamps = _packet_timestamps(packets)
+        else:
+            offsets, timestamps = packet_index(packets)
+            view = memoryview(packets)
+            bounds = np.append(offsets, len(view)).tolist()
+            packets = [view[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        duration = self.frame_duration * 1000000
+        device = bytes((device_index, ))
+        frame = self._frame
+        for packet, timestamp in zip(packets, timestamps.tolist()):
+            if self._end is None or timestamp >= self._end:
+                if frame:
+                    self._close_frame()
+                self._end = (timestamp // duration + 1) * duration
+            frame += device
+            frame += packet
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self._frame:
+            self._close_frame()
+        self._file.close()
+
+
+class LvxReader:
+    """Memory mapped recording. Frames are found by walking frame headers once,
+    index is cached next to recording (path.idx.npy) and reused while recording is older"""
+
+    def __init__(self, path:str, cache:bool=True):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if len(self._map) < HEADER_STRUCT.size:
+            raise ValueError(f'{path}: not a lvx file')
+        signature, *version, magic, self.frame_duration, count = HEADER_STRUCT.unpack_from(self._map)
+        if not signature.startswith(SIGNATURE) or magic != MAGIC:
+            raise ValueError(f'{path}: not a lvx file')
+        self.version = tuple(version)
+        self.devices = np.frombuffer(self._map, DEVICE_DTYPE, count, HEADER_STRUCT.size)
+        self._data = HEADER_STRUCT.size + count * DEVICE_DTYPE.itemsize
+        self.index = self._load_index() if cache else self._build_index()
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.path} frames:{len(self)}}}'
+
+    def __len__(self):
+        return len(self.index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _build_index(self)->np.ndarray:
+        offsets = []
+        offset = self._data
+        length = len(self._map)
+        while offset + FRAME_HEADER_STRUCT.size <= length:
+            current, following, _ = FRAME_HEADER_STRUCT.unpack_from(self._map, offset)
+            if current != offset or not offset < following <= length:
+                raise ValueError(f'{self.path}: broken frame at offset {offset}')
+            offsets.append((offset, following))
+            offset = following
+        index = np.zeros(len(offsets), INDEX_DTYPE)
+        if not offsets:
+            return index
+        bounds = np.array(offsets, np.int64)
+        index['offset'] = bounds[:, 0]
+        index['size'] = bounds[:, 1] - bounds[:, 0] - FRAME_HEADER_STRUCT.size
+        #header of first package of every frame, after device index byte
+        first = index['offset'] + FRAME_HEADER_STRUCT.size + 1
+        data = np.frombuffer(self._map, np.uint8)
+        headers = data[first[:, None] + np.arange(HEADER_LENGTH)].view(HEADER_DTYPE)[:, 0]
+        index['timestamp'] = timestamps_ns(headers)
+        return index
+
+    def _load_index(self)->np.ndarray:
+        cached = f'{self.path}.idx.npy'
+        if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(self.path):
+            index = np.load(cached)
+            if index.dtype == INDEX_DTYPE:
+                return index
+        index = self._build_index()
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'wb') as f:
+                np.save(f, index)
+            os.replace(tmp, cached)
+        except OSError as e:
+            logger.warning(f'Index of {self.path} not cached: {e}')
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return index
+
+    @property
+    def timestamps(self)->np.ndarray:
+        """ns of first package of every frame"""
+        return self.index['timestamp']
+
+    def seek(self, timestamp:int)->int:
+        """Index of frame holding timestamp ns, first frame for earlier ones"""
+        return max(int(np.searchsorted(self.index['timestamp'], timestamp, 'right')) - 1, 0)
+
+    def frame(self, index:int)->memoryview:
+        """Packages of frame back to back"""
+        offset, size, _ = self.index[index].tolist()
+        start = offset + FRAME_HEADER_STRUCT.size
+        return self._view[start:start + size]
+
+    def packages(self, index:int)->'list(tuple(int,memoryview))':
+        """(device index, packet) of every package of frame, packets are views of file"""
+        frame = self.frame(index)
+        result = []
+        offset = 0
+        while offset < len(frame):
+            data_type = DATA_TYPES.get(frame[offset + 10]) if offset + HEADER_LENGTH < len(frame) else None
+            stop = offset + 1 + data_type.PACKET_LENGTH if data_type is not None else None
+            if stop is None or stop > len(frame):
+                raise ValueError(f'{self.path}: broken package in frame {index} at {offset}')
+            result.append((frame[offset], frame[offset + 1:stop]))
+            offset = stop
+        return result
+
+    def packets(self, index:int, device_index:int=None)->'list(memoryview)':
+        """Packets of frame, of one device when device_index is given. Ready for points.decode"""
+        return [packet for device, packet in self.packages(index) if device_index is None or device == device_index]
+
+    def close(self):
+        self.devices = None
+        self._view.release()
+        self._map.close()
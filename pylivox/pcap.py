@@ -0,0 +1,469 @@
+#Offline ingestion of tcpdump captures (pcap and pcapng) of Livox traffic.
+#File is read in large blocks with readinto, records and Ethernet/IP/UDP headers are parsed
+#through memoryviews of block. Big files are split into chunks at record boundaries and decoded
+#in process pool, control frames are decoded with FrameFrom, data packets with pylivox.points
+
+#std
+import ipaddress
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+#libs
+import numpy as np
+#proj
+import log
+from pylivox.control.frame import Frame
+from pylivox.control.utils import FrameFrom
+from pylivox.data import DATA_TYPES, PROTOCOL_VERSION
+from pylivox.points import PointCloud, decode as decode_points, decode_imu
+
+logger = log.getLogger(__name__)
+
+BLOCK_SIZE = 16 * 1024 * 1024 #bytes read at once
+CHUNK_SIZE = 256 * 1024 * 1024 #bytes of file per worker task
+CONTROL_PORTS = (55000, 65000) #broadcast and command port of device
+_DECODE_BATCH = 8192 #data packets decoded at once
+_CHAIN = 8 #records that must follow each other to accept chunk start
+
+#pcap magic: (byte order, ns per timestamp fraction)
+_PCAP_MAGIC = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1000),
+    b'\xa1\xb2\xc3\xd4': ('>', 1000),
+    b'\x4d\x3c\xb2\xa1': ('<', 1),
+    b'\xa1\xb2\x3c\x4d': ('>', 1),
+}
+_PCAPNG_SHB = 0x0A0D0D0A
+_PCAPNG_IDB = 1
+_PCAPNG_SPB = 3
+_PCAPNG_EPB = 6
+_PCAPNG_BLOCKS = (1, 2, 3, 4, 5, 6, 10, 0x0BAD, 0x40000BAD)
+
+#link types
+ETHERNET = 1
+RAW = (12, 101, 228, 229)
+NULL = (0, 108)
+LINUX_SLL = 113
+LINUX_SLL2 = 276
+_VLAN = (0x8100, 0x88A8)
+_ETHERTYPES = (0x0800, 0x86DD, 0x0806) + _VLAN
+
+
+def udp_payload(linktype:int, packet:memoryview)->'tuple(bytes,int,int,memoryview)|None':
+    """(packed source address, source port, destination port, payload) of UDP over IPv4/IPv6,
+    None for other or fragmented packets"""
+    try:
+        if linktype == ETHERNET:
+            offset = 14
+            ethertype, = struct.unpack_from('>H', packet, 12)
+            while ethertype in _VLAN:
+                ethertype, = struct.unpack_from('>H', packet, offset + 2)
+                offset += 4
+        elif linktype == LINUX_SLL:
+            offset = 16
+            ethertype, = struct.unpack_from('>H', packet, 14)
+        elif linktype == LINUX_SLL2:
+            offset = 20
+            ethertype, = struct.unpack_from('>H', packet, 0)
+        elif linktype in RAW or linktype in NULL:
+            offset = 4 if linktype in NULL else 0
+            ethertype = {4: 0x0800, 6: 0x86DD}.get(packet[offset] >> 4)
+        else:
+            return None
+        if ethertype == 0x0800:
+            if packet[offset + 9] != 17 or struct.unpack_from('>H', packet, offset + 6)[0] & 0x3FFF:
+                return None
+            address = bytes(packet[offset + 12:offset + 16])
+            offset += (packet[offset] & 0x0F) * 4
+        elif ethertype == 0x86DD:
+            if packet[offset + 6] != 17:
+                return None
+            address = bytes(packet[offset + 8:offset + 24])
+            offset += 40
+        else:
+            return None
+        source, destination, length = struct.unpack_from('>HHH', packet, offset)
+    except (struct.error, IndexError):
+        return None
+    if length < 8 or offset + length > len(packet):
+        #snapped
+        return None
+    return address, source, destination, packet[offset + 8:offset + length]
+
+
+class _Blocks:
+    """Window of file in reused buffer, pos is next unread byte of buffer"""
+
+    def __init__(self, f, offset:int, block_size:int):
+        f.seek(offset)
+        self.f = f
+        self.offset = offset #of buffer start in file
+        self.buffer = bytearray(block_size)
+        self.view = memoryview(self.buffer)
+        self.pos = 0
+        self.end = 0
+
+    @property
+    def position(self)->int:
+        return self.offset + self.pos
+
+    def fill(self, size:int)->bool:
+        """At least size bytes after pos in buffer, False at end of file"""
+        if self.end - self.pos >= size:
+            return True
+        rest = self.end - self.pos
+        if size > len(self.buffer):
+            #new buffer: views handed out before stay on old one
+            buffer = bytearray(max(size, 2 * len(self.buffer)))
+            buffer[:rest] = self.view[self.pos:self.end]
+            self.buffer = buffer
+            self.view = memoryview(buffer)
+        else:
+            self.view[:rest] = self.view[self.pos:self.end]
+        self.offset += self.pos
+        self.pos = 0
+        self.end = rest
+        while self.end < size:
+            read = self.f.readinto(self.view[self.end:])
+            if not read:
+                return False
+            self.end += read
+        return True
+
+
+class Format:
+    """What records of chunk need from file header: byte order, pcap link type and timestamp unit
+    or pcapng interfaces (link type, ns per timestamp unit as numerator and denominator)"""
+    __slots__ = ('is_ng', 'order', 'linktype', 'unit', 'snaplen', 'interfaces', 'data')
+
+    def __init__(self, is_ng:bool, order:str, linktype:int=None, unit:int=None, snaplen:int=None, data:int=0, interfaces:list=None):
+        self.is_ng = is_ng
+        self.order = order
+        self.linktype = linktype
+        self.unit = unit
+        self.snaplen = snaplen
+        self.interfaces = [] if interfaces is None else interfaces
+        self.data = data #offset of first record
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {"pcapng" if self.is_ng else "pcap"} {self.order} link:{self.linktype} interfaces:{self.interfaces}}}'
+
+
+def _ng_interface(block:memoryview, order:str)->'tuple(int,int,int)':
+    """(link type, numerator, denominator) of interface description block, timestamp unit is
+    numerator / denominator ns kept exact: float unit is off by tens of ns on current times"""
+    linktype, = struct.unpack_from(order + 'H', block, 8)
+    num, den = 1000, 1
+    offset = 16
+    while offset + 4 <= len(block) - 4:
+        code, length = struct.unpack_from(order + 'HH', block, offset)
+        if code == 0:
+            break
+        if code == 9 and length == 1:
+            value = block[offset + 4]
+            num, den = 1000000000, 2 ** (value & 0x7F) if value & 0x80 else 10 ** value
+        offset += 4 + (length + 3) // 4 * 4
+    return linktype, num, den
+
+
+def read_format(path:str)->Format:
+    """Format of capture and offset of its first packet record, interfaces of pcapng described before it"""
+    with open(path, 'rb') as f:
+        head = f.read(24)
+        if len(head) < 24:
+            raise ValueError(f'{path}: not a pcap file')
+        magic = _PCAP_MAGIC.get(head[:4])
+        if magic is not None:
+            order, unit = magic
+            snaplen, linktype = struct.unpack_from(order + 'II', head, 16)
+            return Format(False, order, linktype & 0xFFFF, unit, snaplen, 24)
+        if struct.unpack_from('<I', head)[0] != _PCAPNG_SHB:
+            raise ValueError(f'{path}: not a pcap or pcapng file')
+        order = '<' if head[8:12] == b'\x4d\x3c\x2b\x1a' else '>'
+        result = Format(True, order)
+        blocks = _Blocks(f, 0, 65536)
+        while blocks.fill(8):
+            kind, length = struct.unpack_from(order + 'II', blocks.view, blocks.pos)
+            if kind in (_PCAPNG_EPB, _PCAPNG_SPB) or not blocks.fill(length):
+                break
+            if kind == _PCAPNG_IDB:
+                result.interfaces.append(_ng_interface(blocks.view[blocks.pos:blocks.pos + length], order))
+            blocks.pos += length
+        result.data = blocks.position
+        return result
+
+
+def records(path:str, fmt:Format=None, start:int=None, stop:int=None, block_size:int=BLOCK_SIZE)->'iter(tuple(int,int,memoryview))':
+    """(time ns, link type, packet) of records starting in start..stop of file.
+    Packet is view of read buffer, valid until next record is taken. pcapng records of interfaces
+    not described before them are skipped"""
+    fmt = read_format(path) if fmt is None else fmt
+    start = fmt.data if start is None else start
+    stop = os.path.getsize(path) if stop is None else stop
+    interfaces = list(fmt.interfaces)
+    order = fmt.order
+    with open(path, 'rb') as f:
+        blocks = _Blocks(f, start, block_size)
+        if not fmt.is_ng:
+            header = struct.Struct(order + 'IIII')
+            while blocks.position < stop and blocks.fill(16):
+                seconds, fraction, captured, _ = header.unpack_from(blocks.view, blocks.pos)
+                if not blocks.fill(16 + captured):
+                    logger.warning(f'{path}: truncated record at {blocks.position}')
+                    return
+                pos = blocks.pos + 16
+                blocks.pos = pos + captured
+                yield seconds * 1000000000 + fraction * fmt.unit, fmt.linktype, blocks.view[pos:pos + captured]
+            return
+        block_header = struct.Struct(order + 'II')
+        epb = struct.Struct(order + 'IIIII')
+        time_ns = 0
+        unknown = 0
+        while blocks.position < stop and blocks.fill(8):
+            kind, length = block_header.unpack_from(blocks.view, blocks.pos)
+            if length < 12 or not blocks.fill(length):
+                logger.warning(f'{path}: truncated block at {blocks.position}')
+                return
+            pos = blocks.pos
+            blocks.pos += length
+            if kind == _PCAPNG_EPB:
+                interface, high, low, captured, _ = epb.unpack_from(blocks.view, pos + 8)
+                if interface >= len(interfaces):
+                    unknown = _unknown_interface(path, pos, interface, unknown)
+                    continue
+                linktype, num, den = interfaces[interface]
+                time_ns = ((high << 32) | low) * num // den
+                yield time_ns, linktype, blocks.view[pos + 28:pos + 28 + captured]
+            elif kind == _PCAPNG_SPB:
+                #no timestamp: time of previous packet
+                if not interfaces:
+                    unknown = _unknown_interface(path, pos, 0, unknown)
+                    continue
+                captured = min(struct.unpack_from(order + 'I', blocks.view, pos + 8)[0], length - 16)
+                yield time_ns, interfaces[0][0], blocks.view[pos + 12:pos + 12 + captured]
+            elif kind == _PCAPNG_IDB:
+                interfaces.append(_ng_interface(blocks.view[pos:pos + length], order))
+            elif kind == _PCAPNG_SHB:
+                interfaces = []
+                order = '<' if bytes(blocks.view[pos + 8:pos + 12]) == b'\x4d\x3c\x2b\x1a' else '>'
+                block_header = struct.Struct(order + 'II')
+                epb = struct.Struct(order + 'IIIII')
+
+
+def _unknown_interface(path:str, pos:int, interface:int, unknown:int)->int:
+    """Count of records skipped for unknown interface, first one is logged"""
+    if not unknown:
+        logger.warning(f'{path}: record at {pos} of undescribed interface {interface} skipped')
+    return unknown + 1
+
+
+def datagrams(path:str, fmt:Format=None, start:int=None, stop:int=None, block_size:int=BLOCK_SIZE)->'iter(tuple(int,bytes,int,int,memoryview))':
+    """(time ns, packed source address, source port, destination port, payload) of UDP records,
+    payload valid until next one is taken"""
+    for time_ns, linktype, packet in records(path, fmt, start, stop, block_size):
+        udp = udp_payload(linktype, packet)
+        if udp is not None:
+            yield (time_ns, ) + udp
+
+
+def _is_record(view:memoryview, pos:int, fmt:Format, seconds:int=None)->'tuple(int,int)':
+    """(length, seconds) of record at pos if it looks like one (and is stamped near seconds), (0, None) otherwise"""
+    if fmt.is_ng:
+        if pos + 12 > len(view):
+            return 0, None
+        kind, length = struct.unpack_from(fmt.order + 'II', view, pos)
+        if kind not in _PCAPNG_BLOCKS or length < 12 or length % 4 or pos + length > len(view):
+            return 0, None
+        return (length if struct.unpack_from(fmt.order + 'I', view, pos + length - 4)[0] == length else 0), None
+    if pos + 16 > len(view):
+        return 0, None
+    stamp, fraction, captured, original = struct.unpack_from(fmt.order + 'IIII', view, pos)
+    if (fraction >= 1000000000 // fmt.unit or not 14 <= captured <= min(fmt.snaplen or 262144, original)
+            or pos + 16 + captured > len(view) or seconds is not None and not 0 <= stamp - seconds < 3600):
+        return 0, None
+    if fmt.linktype == ETHERNET and struct.unpack_from('>H', view, pos + 28)[0] not in _ETHERTYPES:
+        return 0, None
+    return 16 + captured, stamp
+
+
+def _chunk_start(path:str, fmt:Format, offset:int, window:int=4 * 1024 * 1024)->'int|None':
+    """First offset at or after offset followed by _CHAIN records (or end of file)"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        view = memoryview(f.read(window))
+    at_end = len(view) < window
+    step = 4 if fmt.is_ng else 1
+    for pos in range((-offset) % step, len(view), step):
+        chained = pos
+        seconds = None
+        for _ in range(_CHAIN):
+            length, seconds = _is_record(view, chained, fmt, seconds)
+            if not length:
+                break
+            chained += length
+            if chained == len(view) and at_end:
+                return offset + pos
+        else:
+            return offset + pos
+    return None
+
+
+def _ng_starts(path:str, fmt:Format, chunk_size:int)->'list(tuple(int,Format))':
+    """(start, format in effect there) of pcapng parts. Block chain is walked from first record
+    reading only block headers, interface descriptions and section headers met on the way are parsed"""
+    size = os.path.getsize(path)
+    order = fmt.order
+    interfaces = list(fmt.interfaces)
+    starts = [(fmt.data, fmt)]
+    offset = fmt.data
+    with open(path, 'rb') as f:
+        while offset + 12 <= size:
+            f.seek(offset)
+            head = f.read(12)
+            kind, = struct.unpack_from('<I', head)
+            if kind == _PCAPNG_SHB:
+                order = '<' if head[8:12] == b'\x4d\x3c\x2b\x1a' else '>'
+                interfaces = []
+            length, = struct.unpack_from(order + 'I', head, 4)
+            if length < 12 or offset + length > size:
+                #truncated: records of last part warn
+                break
+            if kind == _PCAPNG_IDB:
+                f.seek(offset)
+                interfaces.append(_ng_interface(memoryview(f.read(length)), order))
+            offset += length
+            if offset - starts[-1][0] >= chunk_size and offset < size:
+                starts.append((offset, Format(True, order, data=offset, interfaces=list(interfaces))))
+    return starts
+
+
+def chunks(path:str, fmt:Format, chunk_size:int=CHUNK_SIZE)->'list(tuple(int,int,Format))':
+    """(start, stop, format) of parts of file, every part starts at record. Format of pcapng part
+    has byte order and interfaces in effect at its start"""
+    size = os.path.getsize(path)
+    if fmt.is_ng:
+        starts = _ng_starts(path, fmt, chunk_size)
+    else:
+        starts = [(fmt.data, fmt)]
+        for offset in range(fmt.data + chunk_size, size, chunk_size):
+            start = _chunk_start(path, fmt, offset)
+            if start is not None and start > starts[-1][0]:
+                starts.append((start, fmt))
+    return [(start, stop, part) for (start, part), stop in zip(starts, [start for start, _ in starts[1:]] + [size])]
+
+
+def _is_data(payload:memoryview)->bool:
+    data_type = DATA_TYPES.get(payload[9]) if len(payload) > 9 else None
+    return data_type is not None and payload[0] == PROTOCOL_VERSION and len(payload) == data_type.PACKET_LENGTH
+
+
+def _decode_batch(packets:list, device_type, clouds:list, imu:list):
+    clouds.append(decode_points(packets, device_type))
+    imu.append(decode_imu(packets))
+    packets.clear()
+
+
+def decode_chunk(path:str,
+                fmt:Format,
+                start:int=None,
+                stop:int=None,
+                control_ports:'tuple(int)'=CONTROL_PORTS,
+                data_ports:'tuple(int)'=None,
+                device_type=None)->'tuple(list,dict,dict,int)':
+    """(control datagrams as (time, packed address, source, destination, bytes), points and IMU samples
+    per source address, skipped datagrams) of part of file.
+    Datagrams from or to control ports starting with frame start byte are control frames,
+    point and IMU packets are taken from every other port or only to data_ports"""
+    control = []
+    packets = {} #source address: packets not decoded yet
+    clouds = {}
+    imu = {}
+    skipped = 0
+    for time_ns, address, source, destination, payload in datagrams(path, fmt, start, stop):
+        if not len(payload):
+            skipped += 1
+        elif (source in control_ports or destination in control_ports) and payload[0] == Frame.START:
+            control.append((time_ns, address, source, destination, bytes(payload)))
+        elif (data_ports is None or destination in data_ports) and _is_data(payload):
+            pending = packets.get(address)
+            if pending is None:
+                pending = packets[address] = []
+                clouds[address] = []
+                imu[address] = []
+            pending.append(bytes(payload))
+            if len(pending) >= _DECODE_BATCH:
+                _decode_batch(pending, device_type, clouds[address], imu[address])
+        else:
+            skipped += 1
+    for address, pending in packets.items():
+        if pending:
+            _decode_batch(pending, device_type, clouds[address], imu[address])
+    return (control,
+            {ipaddress.ip_address(address): PointCloud.concatenate(parts) for address, parts in clouds.items()},
+            {ipaddress.ip_address(address): np.concatenate(parts) for address, parts in imu.items()},
+            skipped)
+
+
+class Traffic:
+    """Decoded capture: control frames as (time ns, source address, source port, destination port, frame),
+    points and IMU samples of data packets per source address (one device each), count of datagrams that were neither"""
+    __slots__ = ('frames', 'points', 'imu', 'skipped')
+
+    def __init__(self, frames:list, points:'dict(object,PointCloud)', imu:'dict(object,np.ndarray)', skipped:int=0):
+        self.frames = frames
+        self.points = points
+        self.imu = imu
+        self.skipped = skipped
+
+    @property
+    def devices(self)->list:
+        """Source addresses of data packets"""
+        return list(self.points)
+
+    def __repr__(self):
+        return (f'{{{type(self).__name__} frames:{len(self.frames)} devices:{len(self.points)} '
+                f'points:{sum(len(cloud) for cloud in self.points.values())} '
+                f'imu:{sum(len(samples) for samples in self.imu.values())} skipped:{self.skipped}}}')
+
+
+def read(path:str,
+        control_ports:'tuple(int)'=CONTROL_PORTS,
+        data_ports:'tuple(int)'=None,
+        device_type=None,
+        workers:int=None,
+        chunk_size:int=CHUNK_SIZE)->Traffic:
+    """Whole capture decoded. With workers > 1 chunks of file are decoded in process pool.
+    device_type (DeviceType or DeviceContext) is used for control frames and point rate"""
+    fmt = read_format(path)
+    rate_type = getattr(device_type, 'device_type', device_type)
+    if workers is not None and workers > 1 and os.path.getsize(path) > chunk_size:
+        parts = chunks(path, fmt, chunk_size)
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(decode_chunk, *zip(*((path, part, start, stop, control_ports, data_ports, rate_type)
+                                                         for start, stop, part in parts))))
+    else:
+        results = [decode_chunk(path, fmt, None, None, control_ports, data_ports, rate_type)]
+    frames = []
+    skipped = sum(result[3] for result in results)
+    for control, *_ in results:
+        for time_ns, address, source, destination, datagram in control:
+            try:
+                frame = FrameFrom(datagram, device_type)
+            except ValueError as e:
+                logger.debug(f'{time_ns} {source}->{destination}: {e}')
+                frame = None
+            if frame is None:
+                skipped += 1
+                continue
+            frames.append((time_ns, ipaddress.ip_address(address), source, destination, frame))
+    #parts of every device in file order
+    points = {}
+    imu = {}
+    for _, clouds, samples, _ in results:
+        for address, cloud in clouds.items():
+            points.setdefault(address, []).append(cloud)
+        for address, part in samples.items():
+            imu.setdefault(address, []).append(part)
+    return Traffic(frames,
+                   {address: PointCloud.concatenate(parts) for address, parts in points.items()},
+                   {address: np.concatenate(parts) for address, parts in imu.items()},
+                   skipped)
@@ -0,0 +1,168 @@
+#Host side decoding of point packets into columns.
+#Packets of one data type are read with one structured view, every data type ends in the same columns
+
+#libs
+import numpy as np
+#proj
+from pylivox.control.frame import DeviceType
+from pylivox.data import DATA_TYPES, DataType6, POINT_RATE, packet_index, timestamps_ns
+
+
+class PointCloud:
+    """Columns of points: xyz (n, 3) float32 in meters, reflectivity, tag,
+    timestamp in ns and index of return of multi return measurement"""
+    __slots__ = ('xyz', 'reflectivity', 'tag', 'timestamp', 'return_index')
+    DTYPES = {'xyz': np.float32, 'reflectivity': np.uint8, 'tag': np.uint8, 'timestamp': np.int64, 'return_index': np.uint8}
+
+    def __init__(self,
+                xyz:np.ndarray,
+                reflectivity:np.ndarray,
+                tag:np.ndarray,
+                timestamp:np.ndarray,
+                return_index:np.ndarray):
+        self.xyz = xyz
+        self.reflectivity = reflectivity
+        self.tag = tag
+        self.timestamp = timestamp
+        self.return_index = return_index
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} points:{len(self)}}}'
+
+    def __len__(self):
+        return len(self.xyz)
+
+    def __getitem__(self, index:'slice|np.ndarray')->'PointCloud':
+        """Rows of every column: views for slices, copies for masks and index arrays"""
+        return PointCloud(*(getattr(self, name)[index] for name in self.__slots__))
+
+    @classmethod
+    def empty(cls, count:int)->'PointCloud':
+        return cls(np.empty((count, 3), np.float32), *(np.empty(count, cls.DTYPES[name]) for name in cls.__slots__[1:]))
+
+    @classmethod
+    def from_columns(cls, xyz, reflectivity=0, tag=0, timestamp=0, return_index=0)->'PointCloud':
+        """Cloud of len(xyz) points with columns cast to DTYPES, scalars and short axes are broadcast"""
+        result = cls.empty(len(xyz))
+        for name, column in zip(cls.__slots__, (xyz, reflectivity, tag, timestamp, return_index)):
+            getattr(result, name)[...] = column
+        return result
+
+    @classmethod
+    def concatenate(cls, clouds:'list(PointCloud)')->'PointCloud':
+        if not clouds:
+            return cls.empty(0)
+        return cls(*(np.concatenate([getattr(cloud, name) for cloud in clouds]) for name in cls.__slots__))
+
+    @property
+    def x(self)->np.ndarray:
+        return self.xyz[:, 0]
+
+    @property
+    def y(self)->np.ndarray:
+        return self.xyz[:, 1]
+
+    @property
+    def z(self)->np.ndarray:
+        return self.xyz[:, 2]
+
+
+def _returns(data_type:type, points:np.ndarray)->np.ndarray:
+    """(packets, N, returns) view of returns"""
+    return points['returns'] if 'returns' in data_type.DTYPE.names else points[..., None]
+
+
+def point_count(data_type:type)->int:
+    """Points of one packet, every return is a point"""
+    if data_type is DataType6:
+        return 0
+    returns = data_type.DTYPE.fields.get('returns')
+    return data_type.N * (returns[0].shape[0] if returns else 1)
+
+
+def decode_into(packets:np.ndarray, data_type:type, out:PointCloud, point_period:int=0)->int:
+    """Points of packets (array of data_type.PACKET_DTYPE) into out from its start, returns count.
+    Point of k-th measurement of packet is stamped k * point_period ns after packet"""
+    points = packets['points']
+    returns = _returns(data_type, points)
+    shape = returns.shape
+    count = returns.size
+    xyz = out.xyz[:count].reshape(shape + (3, ))
+    if data_type.IS_SPHERICAL:
+        zenith = np.radians(points['zenith'] * np.float32(0.01), dtype=np.float32)
+        azimuth = np.radians(points['azimuth'] * np.float32(0.01), dtype=np.float32)
+        sin_zenith = np.sin(zenith)
+        depth = returns['depth'] * np.float32(0.001)
+        np.multiply(depth, (sin_zenith * np.cos(azimuth))[..., None], out=xyz[..., 0])
+        np.multiply(depth, (sin_zenith * np.sin(azimuth))[..., None], out=xyz[..., 1])
+        np.multiply(depth, np.cos(zenith)[..., None], out=xyz[..., 2])
+    else:
+        for axis, name in enumerate('xyz'):
+            np.multiply(returns[name], np.float32(0.001), out=xyz[..., axis])
+    out.reflectivity[:count].reshape(shape)[...] = returns['reflectivity']
+    out.tag[:count].reshape(shape)[...] = returns['tag'] if 'tag' in returns.dtype.names else 0
+    timestamp = timestamps_ns(packets['header'])[:, None] + np.arange(data_type.N, dtype=np.int64) * point_period
+    out.timestamp[:count].reshape(shape)[...] = timestamp[..., None]
+    out.return_index[:count].reshape(shape)[...] = np.arange(shape[-1], dtype=np.uint8)
+    return count
+
+
+def point_period(device_type:DeviceType=None, point_rate:int=None)->int:
+    """ns between measurements: 1 / point_rate, by default rate of device_type, 0 without both"""
+    if point_rate is None:
+        point_rate = POINT_RATE.get(device_type)
+    return 1000000000 // point_rate if point_rate else 0
+
+
+def split(packets:'bytes|memoryview|list(bytes|memoryview)')->'list(tuple(type,np.ndarray))':
+    """(data type, packet array) groups of buffer of packets stored back to back or of list of packets.
+    Single data type buffer is viewed without copy, other input is joined per data type"""
+    if not isinstance(packets, list):
+        offsets, _ = packet_index(packets)
+        if not len(offsets):
+            return []
+        data_type = DATA_TYPES[packets[9]]
+        if len(packets) == len(offsets) * data_type.PACKET_LENGTH:
+            array = np.frombuffer(packets, data_type.PACKET_DTYPE)
+            #types of same packet length (2 and 4) can follow each other
+            if (array['header']['data_type'] == data_type.TYPE).all():
+                return [(data_type, array)]
+        view = memoryview(packets)
+        bounds = np.append(offsets, len(view)).tolist()
+        packets = [view[start:stop] for start, stop in zip(bounds, bounds[1:])]
+    groups = {}
+    for packet in packets:
+        data_type = DATA_TYPES.get(packet[9]) if len(packet) > 9 else None
+        if data_type is None or len(packet) != data_type.PACKET_LENGTH:
+            raise ValueError(f'Not a point packet: {len(packet)} bytes')
+        groups.setdefault(data_type, []).append(packet)
+    return [(data_type, np.frombuffer(b''.join(group), data_type.PACKET_DTYPE)) for data_type, group in groups.items()]
+
+
+def decode(packets:'bytes|memoryview|list(bytes|memoryview)',
+            device_type:DeviceType=None,
+            point_rate:int=None)->PointCloud:
+    """Points of one or many packets, grouped by data type. IMU packets are skipped (decode_imu).
+    Per point timestamps step with point_rate, by default the rate of device_type, none without both"""
+    groups = [(data_type, array) for data_type, array in split(packets) if data_type is not DataType6]
+    cloud = PointCloud.empty(sum(point_count(data_type) * len(array) for data_type, array in groups))
+    start = 0
+    for data_type, array in groups:
+        start += decode_into(array, data_type, cloud[start:], point_period(device_type, point_rate))
+    return cloud
+
+
+IMU_DTYPE = np.dtype([('timestamp', '<i8')] + DataType6.DTYPE.descr)
+
+
+def decode_imu(packets:'bytes|memoryview|list(bytes|memoryview)')->np.ndarray:
+    """Timestamp (ns), gyro (rad/s) and acceleration (g) of IMU packets, point packets are skipped"""
+    arrays = [array for data_type, array in split(packets) if data_type is DataType6]
+    if not arrays:
+        return np.zeros(0, IMU_DTYPE)
+    array = np.concatenate(arrays)
+    imu = np.empty(len(array), IMU_DTYPE)
+    imu['timestamp'] = timestamps_ns(array['header'])
+    for name in DataType6.DTYPE.names:
+        imu[name] = array['points'][name][:, 0]
+    return imu
@@ -0,0 +1,200 @@
+#Replay of recorded point data in emulator instead of synthetic scan.
+#Recordings are memory mapped and every tick takes window of recording due in it,
+#recorded packets are sent as views into the map without copying
+
+#std
+import os
+import mmap
+import struct
+import shutil
+import itertools
+#libs
+import numpy as np
+#proj
+import log
+from pylivox.data import HEADER_DTYPE, PacketBlock, PacketClock, TimestampType, encode_timestamps, packet_index, write_points
+
+logger = log.getLogger(__name__)
+
+#point of recording: time in ns, direction in radians, depth in mm (0 when unknown)
+RECORDING_DTYPE = np.dtype([('time', '<i8'), ('azimuth', '<f4'), ('zenith', '<f4'), ('depth', '<u4'), ('reflectivity', 'u1')])
+CSV_CHUNK = 1000000 #rows parsed at once
+_TYPE_OFFSET = HEADER_DTYPE.fields['timestamp_type'][1]
+_STAMP_OFFSET = HEADER_DTYPE.fields['timestamp'][1]
+
+
+def _csv_rows(columns:np.ndarray)->np.ndarray:
+    rows = np.zeros(len(columns), RECORDING_DTYPE)
+    rows['time'] = np.rint(columns[:, 0] * 1e9)
+    rows['azimuth'] = np.radians(columns[:, 1]) % (2 * np.pi)
+    rows['zenith'] = np.radians(columns[:, 2])
+    if columns.shape[1] == 5:
+        rows['depth'] = np.rint(columns[:, 3] * 1000)
+        rows['reflectivity'] = columns[:, 4]
+    return rows
+
+
+def _csv_chunks(path:str):
+    with open(path) as f:
+        f.readline() #header
+        while True:
+            lines = list(itertools.islice(f, CSV_CHUNK))
+            if not lines:
+                return
+            columns = np.loadtxt(lines, delimiter=',', ndmin=2)
+            if columns.shape[1] not in (3, 5):
+                raise ValueError(f'{path}: expected 3 or 5 columns, got {columns.shape[1]}')
+            yield _csv_rows(columns)
+
+
+def load_csv(path:str, cache:bool=True)->np.ndarray:
+    """CSV with header line and rows time/s, azimuth/deg, zenith/deg[, depth/m, reflectivity].
+    Parsed in chunks once into path.npy next to CSV, memory mapped after that"""
+    npy = f'{path}.npy'
+    if cache and os.path.exists(npy) and os.path.getmtime(npy) >= os.path.getmtime(path):
+        return np.load(npy, mmap_mode='r')
+    if not cache:
+        chunks = list(_csv_chunks(path))
+        return np.concatenate(chunks) if chunks else np.zeros(0, RECORDING_DTYPE)
+    raw = f'{npy}.{os.getpid()}.raw'
+    tmp = f'{npy}.{os.getpid()}.tmp'
+    try:
+        count = 0
+        with open(raw, 'wb') as f:
+            for rows in _csv_chunks(path):
+                f.write(rows.data)
+                count += len(rows)
+        #rows count is known only now: header first, then rows streamed from disk
+        with open(tmp, 'wb') as f, open(raw, 'rb') as rows:
+            np.lib.format.write_array_header_1_0(f, {'descr': np.lib.format.dtype_to_descr(RECORDING_DTYPE),
+                                                     'fortran_order': False,
+                                                     'shape': (count, )})
+            shutil.copyfileobj(rows, f, 16 * 1024 * 1024)
+        os.replace(tmp, npy)
+    finally:
+        for name in (raw, tmp):
+            if os.path.exists(name):
+                os.remove(name)
+    return np.load(npy, mmap_mode='r')
+
+
+class Replay:
+    """Walk through recorded times (ns, non decreasing) speed times faster than recorded.
+    take gives slice of items due in next duration of replay, loop starts over at the end.
+    loops counts passes started over, every pass is span ns of recording"""
+
+    def __init__(self, times:np.ndarray, speed:float=1.0, loop:bool=True):
+        if speed <= 0:
+            raise ValueError(f'Speed {speed} <= 0')
+        if not len(times):
+            raise ValueError('Empty recording')
+        self.times = times
+        self.speed = speed
+        self.loop = loop
+        self.index = 0
+        self.position = 0 #ns of recording since its start
+        self.loops = 0
+        self._origin = int(times[0])
+        #last item plus mean spacing: next pass starts one step after it
+        self.span = int(times[-1]) - self._origin
+        if len(times) > 1:
+            self.span += round(self.span / (len(times) - 1))
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.index}/{len(self.times)} speed:{self.speed}}}'
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def is_done(self)->bool:
+        return not self.loop and self.index >= len(self.times)
+
+    def take(self, duration:int, multiple:int=1)->slice:
+        """Items recorded in next duration ns of replay, their count rounded down to multiple"""
+        if self.index >= len(self.times):
+            if not self.loop:
+                return slice(self.index, self.index)
+            self.index = 0
+            self.position = 0
+            self.loops += 1
+        start = self.index
+        end = self.position + int(round(duration * self.speed))
+        stop = start + int(np.searchsorted(self.times[start:], self._origin + end, 'left'))
+        if multiple > 1 and stop < len(self.times):
+            #rest waits for next take
+            stop = start + (stop - start) // multiple * multiple
+            end = min(end, int(self.times[stop]) - self._origin)
+        self.index = stop
+        self.position = end
+        return slice(start, stop)
+
+
+class PacketReplay(Replay):
+    """Recorded point packets stored back to back, sent with their own timestamps: unchanged views in first pass,
+    copies restamped loops * span ns later when looping, so time never runs backwards"""
+
+    def __init__(self, path:str, speed:float=1.0, loop:bool=True):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.offsets, times = packet_index(self._map)
+        self.offsets = np.append(self.offsets, len(self._map))
+        super().__init__(times, speed, loop)
+
+    def packets(self, duration:int, clock:PacketClock=None, data_type:type=None, scene=None)->'list(memoryview)':
+        """Views of packets due in next duration ns. clock, data_type and scene are ignored: packets are sent as recorded"""
+        window = self.take(duration)
+        bounds = self.offsets[window.start:window.stop + 1].tolist()
+        view = self._view
+        if not self.loops or len(bounds) < 2:
+            return [view[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        buffer = bytearray(view[bounds[0]:bounds[-1]])
+        stamps = self.times[window] + self.loops * self.span
+        for start, stamp in zip(bounds, stamps.tolist()):
+            offset = start - bounds[0]
+            timestamp_type = TimestampType(buffer[offset + _TYPE_OFFSET])
+            struct.pack_into('<Q', buffer, offset + _STAMP_OFFSET, int(encode_timestamps(stamp, timestamp_type)))
+        view = memoryview(buffer)
+        return [view[start - bounds[0]:stop - bounds[0]] for start, stop in zip(bounds, bounds[1:])]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+
+class PointReplay(Replay):
+    """Recorded points (RECORDING_DTYPE) packed into packets of current data type,
+    restamped by clock of emulator keeping recorded spacing. Points without depth are cast against scene"""
+
+    def __init__(self, recording:'np.ndarray|str', speed:float=1.0, loop:bool=True):
+        self.recording = load_csv(recording) if isinstance(recording, str) else recording
+        super().__init__(self.recording['time'], speed, loop)
+        self._block:PacketBlock = None
+
+    def _data_block(self, data_type:type, count:int)->PacketBlock:
+        block = self._block
+        if block is None or block.data_type is not data_type or len(block) < count:
+            block = self._block = PacketBlock(data_type, max(count, len(block) if block is not None else 0))
+        return block
+
+    def packets(self, duration:int, clock:PacketClock, data_type:type, scene=None)->'list(memoryview)':
+        """Packets of points due in next duration ns, first one stamped with next time of clock.
+        Clock moves on by duration"""
+        rows = self.recording[self.take(duration, data_type.N)]
+        count = len(rows) // data_type.N
+        if not count:
+            return []
+        rows = rows[:count * data_type.N].reshape(count, data_type.N)
+        block = self._data_block(data_type, count)
+        depth, reflectivity = rows['depth'], rows['reflectivity']
+        if scene is not None and not depth.any():
+            depth, reflectivity = scene.cast(rows['azimuth'], rows['zenith'])
+        write_points(block.points[:count], data_type, rows['azimuth'], rows['zenith'], depth, reflectivity)
+        offsets = rows['time'][:, 0] - rows['time'][0, 0]
+        if self.speed != 1:
+            #spacing is small, only it goes through float
+            offsets = np.rint(offsets / self.speed).astype(np.int64)
+        block.stamp(clock, offsets, duration)
+        return block[:count]
@@ -0,0 +1,182 @@
+#Scan patterns: directions of consecutive measurements for every device type.
+#Pattern is computed once into a table, saved as .npy and memory mapped on next start,
+#streaming only walks a cursor through the table
+
+#std
+import os
+import math
+#libs
+import numpy as np
+#proj
+import log
+from pylivox.control.frame import DeviceType
+from pylivox.data import POINT_RATE
+
+logger = log.getLogger(__name__)
+
+#azimuth in xy plane from x axis, zenith from z axis, radians (Livox spherical convention)
+SCAN_DTYPE = np.dtype([('azimuth', '<f4'), ('zenith', '<f4')])
+CACHE_DIR = os.environ.get('PYLIVOX_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'pylivox'))
+_TABLE_VERSION = 2 #bump when generators change, old cache files are ignored
+_BLOCK = 960000 #rows computed at once, multiple of LineScan laser counts
+
+
+class Pattern:
+    """Directions as function of time inside h_fov x v_fov (degrees).
+    Table covers seconds of scan, repetitive patterns repeat exactly after it"""
+    NAME:str = None
+
+    def __init__(self, h_fov:float, v_fov:float, seconds:float):
+        self.h_fov = h_fov
+        self.v_fov = v_fov
+        self.seconds = seconds
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.key}}}'
+
+    @property
+    def key(self)->str:
+        return f'{self.NAME}_{self.h_fov}x{self.v_fov}_{self.seconds}s'
+
+    def directions(self, t:np.ndarray)->'tuple(np.ndarray,np.ndarray)':
+        """Horizontal and vertical deflection from x axis in range -1..1 of half FOV"""
+        raise NotImplementedError
+
+    def table(self, rate:int)->np.ndarray:
+        table = np.empty(int(rate * self.seconds), SCAN_DTYPE)
+        #in blocks: float64 temporaries of whole 30 s table would take hundreds of MB
+        for start in range(0, len(table), _BLOCK):
+            block = table[start:start + _BLOCK]
+            t = np.arange(start, start + len(block)) / rate
+            horizontal, vertical = self.directions(t)
+            horizontal *= np.radians(self.h_fov) / 2
+            vertical *= np.radians(self.v_fov) / 2
+            block['azimuth'] = horizontal % (2 * np.pi)
+            #tiny negative deflections round up to full turn in float32
+            block['azimuth'][block['azimuth'] >= np.float32(2 * np.pi)] = 0
+            block['zenith'] = np.pi / 2 - vertical
+        return table
+
+
+class Rosette(Pattern):
+    """Two Risley prisms rotating with rpm. Commensurate speeds close the pattern (repetitive),
+    default Mid-40 speeds do not close for 30 s (non-repetitive).
+    Table covers whole closing period by default, so cursor wraps without seam"""
+    NAME = 'rosette'
+
+    def __init__(self, h_fov:float, v_fov:float, rpm:'tuple(int,int)'=(7294, -4664), seconds:float=None):
+        super().__init__(h_fov, v_fov, self.period(rpm) if seconds is None else seconds)
+        self.rpm = rpm
+
+    @staticmethod
+    def period(rpm:'tuple(int,int)')->float:
+        """Seconds after which both prisms are back in start position"""
+        return 60 / math.gcd(*rpm)
+
+    @property
+    def key(self)->str:
+        return f'{super().key}_{self.rpm[0]}_{self.rpm[1]}'
+
+    def directions(self, t:np.ndarray)->'tuple(np.ndarray,np.ndarray)':
+        #phase of whole turns only: float64 keeps it exact over long tables
+        w1, w2 = (rpm / 60 for rpm in self.rpm)
+        a1 = 2 * np.pi * ((w1 * t) % 1)
+        a2 = 2 * np.pi * ((w2 * t) % 1)
+        horizontal = np.cos(a1)
+        horizontal += np.cos(a2)
+        horizontal /= 2
+        vertical = np.sin(a1)
+        vertical += np.sin(a2)
+        vertical /= 2
+        return horizontal, vertical
+
+
+class LineScan(Pattern):
+    """lasers horizontal lines spread over v_fov, swept sinusoidally frequency times per second.
+    Consecutive measurements are taken by lasers in turn"""
+    NAME = 'lines'
+
+    def __init__(self, h_fov:float, v_fov:float, lasers:int=6, frequency:int=10):
+        super().__init__(h_fov, v_fov, 1 / frequency)
+        self.lasers = lasers
+        self.frequency = frequency
+
+    @property
+    def key(self)->str:
+        return f'{super().key}_{self.lasers}'
+
+    def directions(self, t:np.ndarray)->'tuple(np.ndarray,np.ndarray)':
+        horizontal = np.sin(2 * np.pi * self.frequency * t)
+        vertical = np.linspace(-1, 1, self.lasers)[np.arange(len(t)) % self.lasers]
+        return horizontal, vertical
+
+
+#commensurate prism speeds: pattern closes every 0.1 s
+REPETITIVE_RPM = (6600, -4200)
+
+#(device type, is repetitive): pattern
+PATTERNS = {
+    (DeviceType.MID_40, False): Rosette(38.4, 38.4),
+    (DeviceType.MID_40, True): Rosette(38.4, 38.4, REPETITIVE_RPM),
+    (DeviceType.MID_70, False): Rosette(70.4, 70.4),
+    (DeviceType.MID_70, True): Rosette(70.4, 70.4, REPETITIVE_RPM),
+    (DeviceType.TELE_15, False): Rosette(14.5, 16.2),
+    (DeviceType.TELE_15, True): Rosette(14.5, 16.2, REPETITIVE_RPM),
+    (DeviceType.HORIZON, False): Rosette(81.7, 25.1),
+    (DeviceType.HORIZON, True): LineScan(81.7, 25.1),
+    (DeviceType.AVIA, False): Rosette(70.4, 77.2),
+    (DeviceType.AVIA, True): LineScan(70.4, 4.5),
+}
+
+
+def pattern_for(device_type:DeviceType, repetitive:bool=False)->Pattern:
+    try:
+        return PATTERNS[(device_type, bool(repetitive))]
+    except KeyError:
+        raise ValueError(f'No scan pattern for {device_type}') from None
+
+
+def load_table(device_type:DeviceType, repetitive:bool=False, cache_dir:str=CACHE_DIR)->np.ndarray:
+    """Scan table of device. Computed on first use, then memory mapped read only from cache_dir.
+    cache_dir None or not writable keeps table in memory"""
+    pattern = pattern_for(device_type, repetitive)
+    rate = POINT_RATE[device_type]
+    if cache_dir is None:
+        return pattern.table(rate)
+    path = os.path.join(cache_dir, f'{device_type.name.lower()}_{pattern.key}_{rate}_v{_TABLE_VERSION}.npy')
+    if not os.path.exists(path):
+        table = pattern.table(rate)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            #concurrent emulators may build same table: write aside and rename atomically
+            tmp = f'{path}.{os.getpid()}.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, table)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f'Scan table is not cached: {e}')
+            return table
+    return np.load(path, mmap_mode='r')
+
+
+class ScanCursor:
+    """Endless walk through rows of table. take returns views while no wrap happens"""
+
+    def __init__(self, table:np.ndarray, position:int=0):
+        if not len(table):
+            raise ValueError('Empty table')
+        self.table = table
+        self.position = position % len(table)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} {self.position}/{len(self.table)}}}'
+
+    def take(self, count:int)->np.ndarray:
+        table = self.table
+        start = self.position
+        stop = start + count
+        length = len(table)
+        self.position = stop % length
+        if stop <= length:
+            return table[start:stop]
+        return table[np.arange(start, stop) % length]
@@ -0,0 +1,136 @@
+#Static scene for emulated points: rays of scan pattern are cast against few primitives at once with numpy.
+#Lidar is in origin, x forward, z up, scene units are meters
+
+#libs
+import numpy as np
+
+#scan table row with measurement of its direction, depth in mm
+MEASUREMENT_DTYPE = np.dtype([('azimuth', '<f4'), ('zenith', '<f4'), ('depth', '<u4'), ('reflectivity', 'u1')])
+
+
+def directions(azimuth:np.ndarray, zenith:np.ndarray)->np.ndarray:
+    """Unit vectors (..., 3) of Livox spherical angles in radians"""
+    sin_zenith = np.sin(zenith)
+    return np.stack((sin_zenith * np.cos(azimuth), sin_zenith * np.sin(azimuth), np.cos(zenith)), axis=-1)
+
+
+class Shape:
+    """Primitive with reflectivity 0..255. distance gives distance along every ray, inf on miss"""
+
+    def __init__(self, reflectivity:int):
+        if not 0 <= reflectivity <= 255:
+            raise ValueError(f'Reflectivity {reflectivity} out of 0..255')
+        self.reflectivity = reflectivity
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} reflectivity:{self.reflectivity}}}'
+
+    def distance(self, rays:np.ndarray)->np.ndarray:
+        raise NotImplementedError
+
+
+class Plane(Shape):
+    def __init__(self, point:'tuple(float,float,float)', normal:'tuple(float,float,float)', reflectivity:int=50):
+        super().__init__(reflectivity)
+        normal = np.asarray(normal, float)
+        norm = np.linalg.norm(normal)
+        if not norm:
+            raise ValueError('Zero normal')
+        self.normal = normal / norm
+        self._offset = np.dot(point, self.normal)
+
+    def distance(self, rays:np.ndarray)->np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = self._offset / (rays @ self.normal)
+        return np.where(t > 0, t, np.inf)
+
+
+class Ground(Plane):
+    """Horizontal plane height meters below lidar"""
+
+    def __init__(self, height:float=1.5, reflectivity:int=20):
+        super().__init__((0, 0, -height), (0, 0, 1), reflectivity)
+
+
+class Sphere(Shape):
+    def __init__(self, center:'tuple(float,float,float)', radius:float, reflectivity:int=50):
+        super().__init__(reflectivity)
+        if radius <= 0:
+            raise ValueError(f'Radius {radius} <= 0')
+        self.center = np.asarray(center, float)
+        self.radius = radius
+        self._c = np.dot(self.center, self.center) - radius ** 2
+
+    def distance(self, rays:np.ndarray)->np.ndarray:
+        b = rays @ self.center
+        root = np.sqrt(np.maximum(b * b - self._c, 0))
+        #near intersection, far one when lidar is inside
+        t = np.where(b - root > 0, b - root, b + root)
+        return np.where((b * b >= self._c) & (t > 0), t, np.inf)
+
+
+class Box(Shape):
+    """Axis aligned box between minimum and maximum corners"""
+
+    def __init__(self, minimum:'tuple(float,float,float)', maximum:'tuple(float,float,float)', reflectivity:int=50):
+        super().__init__(reflectivity)
+        self.minimum = np.asarray(minimum, float)
+        self.maximum = np.asarray(maximum, float)
+        if (self.minimum >= self.maximum).any():
+            raise ValueError(f'Box corners {minimum} {maximum} are not ordered')
+
+    def distance(self, rays:np.ndarray)->np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse = 1 / rays
+            t1 = self.minimum * inverse
+            t2 = self.maximum * inverse
+        #0 * inf of ray parallel to slab face is nan, ignored by nan reductions
+        near = np.nanmax(np.fmin(t1, t2), axis=-1)
+        far = np.nanmin(np.fmax(t1, t2), axis=-1)
+        t = np.where(near > 0, near, far)
+        return np.where((far >= near) & (t > 0), t, np.inf)
+
+
+class Scene:
+    """Shapes seen by emulated lidar. Rays without hit closer than max_range (m) give zero depth and reflectivity.
+    static scene does not change between passes, so repetitive scans can reuse its measurements"""
+
+    def __init__(self, shapes:'list(Shape)'=(), max_range:float=260, static:bool=True):
+        self.shapes = list(shapes)
+        self.max_range = max_range
+        self.static = static
+        self._reflectivity = np.array([0] + [shape.reflectivity for shape in self.shapes], np.uint8)
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} shapes:{len(self.shapes)} max_range:{self.max_range}}}'
+
+    def cast(self, azimuth:np.ndarray, zenith:np.ndarray)->'tuple(np.ndarray,np.ndarray)':
+        """Depth (mm, uint32) and reflectivity (uint8) of nearest hit of every direction"""
+        rays = directions(azimuth, zenith)
+        distances = np.full((len(self.shapes) + 1, ) + rays.shape[:-1], np.inf)
+        distances[0] = self.max_range
+        for i, shape in enumerate(self.shapes, 1):
+            distances[i] = shape.distance(rays)
+        nearest = distances.argmin(axis=0)
+        #index 0 is max range: no hit
+        depth = np.rint(np.take_along_axis(distances, nearest[None], 0)[0] * 1000).astype(np.uint32)
+        depth[nearest == 0] = 0
+        return depth, self._reflectivity[nearest]
+
+    def measure(self, table:np.ndarray)->np.ndarray:
+        """Scan table with depth and reflectivity of every row, cast once for repetitive scans of static scene"""
+        measurements = np.empty(len(table), MEASUREMENT_DTYPE)
+        measurements['azimuth'] = table['azimuth']
+        measurements['zenith'] = table['zenith']
+        measurements['depth'], measurements['reflectivity'] = self.cast(table['azimuth'], table['zenith'])
+        return measurements
+
+
+def default_scene()->Scene:
+    """Ground, wall 30 m ahead, box and sphere in front of it"""
+    return Scene([
+        Ground(1.5, 20),
+        Plane((30, 0, 0), (-1, 0, 0), 60),
+        Box((8, -3, -1.5), (10, -1, 0.5), 120),
+        Sphere((12, 2, 0), 1, 200),
+    ])
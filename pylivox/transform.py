@@ -0,0 +1,110 @@
+#Extrinsic transform of decoded points into vehicle frame and fusion of many lidars.
+#Matrix of every lidar is built once per change of its extrinsics, points are moved with one matmul per batch
+
+#libs
+import numpy as np
+#proj
+from pylivox.points import PointCloud
+
+
+class Extrinsics:
+    """Pose of lidar: roll, pitch, yaw in degrees, x, y, z in mm as in WriteLidarExtrinsicParameters.
+    matrix (4, 4) float32 maps lidar points to parent frame, rebuilt when any value has changed"""
+    __slots__ = ('roll', 'pitch', 'yaw', 'x', 'y', 'z', '_key', '_matrix')
+
+    def __init__(self, roll:float=0, pitch:float=0, yaw:float=0, x:int=0, y:int=0, z:int=0):
+        self.roll = roll
+        self.pitch = pitch
+        self.yaw = yaw
+        self.x = x
+        self.y = y
+        self.z = z
+        self._key = None
+        self._matrix:np.ndarray = None
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} roll:{self.roll} pitch:{self.pitch} yaw:{self.yaw} x:{self.x} y:{self.y} z:{self.z}}}'
+
+    @classmethod
+    def from_frame(cls, frame)->'Extrinsics':
+        """From WriteLidarExtrinsicParameters or ReadLidarExtrinsicParametersResponse"""
+        return cls(frame.roll, frame.pitch, frame.yaw, frame.x, frame.y, frame.z)
+
+    @property
+    def matrix(self)->np.ndarray:
+        key = (self.roll, self.pitch, self.yaw, self.x, self.y, self.z)
+        if key != self._key:
+            roll, pitch, yaw = np.radians(key[:3])
+            cr, sr = np.cos(roll), np.sin(roll)
+            cp, sp = np.cos(pitch), np.sin(pitch)
+            cy, sy = np.cos(yaw), np.sin(yaw)
+            matrix = np.eye(4)
+            #Rz(yaw) @ Ry(pitch) @ Rx(roll)
+            matrix[:3, :3] = ((cy * cp, cy * sp * sr - sy * cr, cy * sp * cr + sy * sr),
+                              (sy * cp, sy * sp * sr + cy * cr, sy * sp * cr - cy * sr),
+                              (-sp, cp * sr, cp * cr))
+            matrix[:3, 3] = np.array(key[3:]) / 1000
+            matrix = matrix.astype(np.float32)
+            matrix.setflags(write=False)
+            self._matrix = matrix
+            self._key = key
+        return self._matrix
+
+
+def transform(xyz:np.ndarray, matrix:np.ndarray, out:np.ndarray=None)->np.ndarray:
+    """Points (n, 3) moved by (4, 4) matrix, into out (n, 3) when given. out may be xyz itself"""
+    if out is None:
+        out = np.empty(xyz.shape, np.float32)
+    translation = matrix[:3, 3]
+    if np.shares_memory(out, xyz):
+        #matmul must not write into its operand
+        xyz = xyz.copy()
+    np.matmul(xyz, matrix[:3, :3].T, out=out)
+    out += translation
+    return out
+
+
+class Fusion:
+    """Points of many lidars in one frame. Lidars are keyed by anything (serial, address),
+    fuse writes into preallocated buffer of capacity points: result is valid until next fuse"""
+
+    def __init__(self, extrinsics:'dict(object,Extrinsics)', capacity:int):
+        self.extrinsics = dict(extrinsics)
+        self._cloud = PointCloud.empty(capacity)
+        self._source = np.empty(capacity, np.uint8)
+        self._count = 0
+
+    def __repr__(self):
+        return f'{{{type(self).__name__} lidars:{len(self.extrinsics)} capacity:{len(self._cloud)}}}'
+
+    @property
+    def source(self)->np.ndarray:
+        """Index of lidar (order of extrinsics) of every point of last fuse"""
+        return self._source[:self._count]
+
+    def _reserve(self, count:int):
+        if count > len(self._cloud):
+            #grows once to size of largest frame seen
+            self._cloud = PointCloud.empty(count)
+            self._source = np.empty(count, np.uint8)
+
+    def fuse(self, clouds:'dict(object,PointCloud)')->PointCloud:
+        """Clouds of lidars moved into common frame and joined in order of extrinsics"""
+        unknown = clouds.keys() - self.extrinsics.keys()
+        if unknown:
+            raise ValueError(f'No extrinsics of {unknown}')
+        self._reserve(sum(len(cloud) for cloud in clouds.values()))
+        start = 0
+        for index, (key, extrinsics) in enumerate(self.extrinsics.items()):
+            cloud = clouds.get(key)
+            if cloud is None or not len(cloud):
+                continue
+            stop = start + len(cloud)
+            target = self._cloud[start:stop]
+            transform(cloud.xyz, extrinsics.matrix, target.xyz)
+            for name in PointCloud.__slots__[1:]:
+                getattr(target, name)[...] = getattr(cloud, name)
+            self._source[start:stop] = index
+            start = stop
+        self._count = start
+        return self._cloud[:start]
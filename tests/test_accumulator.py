@@ -0,0 +1,55 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data, points
+from pylivox.accumulator import FrameAccumulator
+from pylivox.control.frame import DeviceType
+from pylivox.points import PointCloud
+
+
+def test_time_window():
+    accumulator = FrameAccumulator(100, window=10, buffers=4)
+    assert accumulator.append(PointCloud.from_columns(np.zeros((3, 3)), timestamp=[3, 5, 9])) == []
+    frames = accumulator.append(PointCloud.from_columns(np.zeros((4, 3)), timestamp=[10, 12, 25, 31]))
+    assert [frame.points.timestamp.tolist() for frame in frames] == [[3, 5, 9], [10, 12], [25]]
+    assert [(frame.index, frame.start, frame.end) for frame in frames] == [(0, 3, 10), (1, 10, 20), (2, 25, 30)]
+    assert accumulator.count == 1
+    last = accumulator.flush()
+    assert last.points.timestamp.tolist() == [31] and accumulator.flush() is None
+
+
+def test_max_points():
+    accumulator = FrameAccumulator(100, window=None, max_points=4)
+    index = np.arange(10)
+    frames = accumulator.append(PointCloud.from_columns(index[:, None], timestamp=index))
+    assert [len(frame) for frame in frames] == [4, 4] and frames[1].end is None
+    assert frames[1].points.xyz[:, 0].tolist() == [4, 5, 6, 7]
+
+
+def test_views():
+    accumulator = FrameAccumulator(8, window=10, buffers=3)
+    frames = accumulator.append(PointCloud.from_columns(np.zeros((8, 3)), timestamp=np.arange(0, 40, 5)))
+    buffers = [frame.points.xyz.base for frame in frames]
+    assert len(frames) == 3 and len({id(base) for base in buffers}) == 3
+    #ring wraps to first buffer
+    frames += accumulator.append(PointCloud.from_columns(np.zeros((1, 3)), timestamp=[45]))
+    assert frames[3].points.xyz.base is buffers[0]
+    with pytest.raises(ValueError):
+        FrameAccumulator(8, buffers=1)
+
+
+def test_packets():
+    block = data.PacketBlock(data.DataType2, 10).fill(0, 10000000, data.default_points(data.DataType2))
+    expected = points.decode(block.buffer, DeviceType.HORIZON)
+    accumulator = FrameAccumulator.for_device(DeviceType.HORIZON, window=50000000)
+    frames = accumulator.append_packets(block.buffer, DeviceType.HORIZON)
+    #packets are whole in the frame they start in
+    assert [len(frame) for frame in frames] == [5 * 96]
+    assert (frames[0].points.xyz == expected.xyz[:5 * 96]).all()
+    assert (accumulator.flush().points.timestamp == expected.timestamp[5 * 96:]).all()
+    small = FrameAccumulator(250, window=None)
+    frames = small.append_packets([bytes(packet) for packet in block])
+    assert [len(frame) for frame in frames] == [192] * 4
+    with pytest.raises(ValueError):
+        FrameAccumulator(50).append_packets(block.buffer)
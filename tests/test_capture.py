@@ -0,0 +1,101 @@
+#std
+import os
+import time
+import threading
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import capture, data
+from pylivox.control import general as g
+from pylivox.control.frame import DeviceType
+
+
+def datagrams():
+    heartbeat = g.Heartbeat(seq=3).frame
+    points = data.PacketBlock(data.DataType2, 1).fill(0, 0, data.default_points(data.DataType2))
+    imu = data.PacketBlock(data.DataType6, 1).fill(0, 0, data.default_points(data.DataType6))
+    return heartbeat, bytes(points[0]), bytes(imu[0])
+
+
+def record(directory, count=20, step=50000000, **kwargs):
+    heartbeat, points, imu = datagrams()
+    with capture.Recorder(str(directory), **kwargs) as recorder:
+        for i in range(count):
+            recorder.record([heartbeat, points, imu][i % 3], 65000 + i % 3, i % 2, time_ns=1000 + i * step)
+    assert recorder.count == count and recorder.error is None
+
+
+def test_round_trip(tmp_path):
+    record(tmp_path, index_interval=100000000)
+    segments = sorted(os.listdir(tmp_path))
+    assert segments == ['000000.idx', '000000.seg']
+    index = np.fromfile(tmp_path / '000000.idx', capture.INDEX_DTYPE)
+    assert index['time'].tolist() == [1000 + i * 100000000 for i in range(10)]
+    with capture.CaptureReplay(str(tmp_path), speed=None) as replay:
+        records = [(t, port, direction, bytes(datagram)) for t, port, direction, datagram in replay.records()]
+        assert [t for t, *_ in records] == [1000 + i * 50000000 for i in range(20)]
+        assert [port for _, port, _, _ in records[:4]] == [65000, 65001, 65002, 65000]
+        assert [direction for _, _, direction, _ in records[:4]] == [0, 1, 0, 1]
+        assert records[1][3] == datagrams()[1]
+
+
+@pytest.mark.parametrize('start, expected', [(None, 20), (0, 20), (1000, 20), (1001, 19), (250001000, 15), (10 ** 12, 0)])
+def test_seek(tmp_path, start, expected):
+    #rotation: few records per segment
+    record(tmp_path, segment_size=500)
+    assert len(os.listdir(tmp_path)) > 4
+    with capture.CaptureReplay(str(tmp_path), speed=None) as replay:
+        times = [t for t, *_ in replay.records(start)]
+        assert len(times) == expected and times == sorted(times)
+
+
+def test_failed_write(tmp_path, monkeypatch):
+    def fail(*item):
+        raise OSError('disk full')
+    recorder = capture.Recorder(str(tmp_path))
+    monkeypatch.setattr(recorder, '_write', fail)
+    #record and close sentinel may land in the same batch of writer
+    recorder.record(b'\x00', 65000)
+    recorder.close()
+    assert isinstance(recorder.error, OSError)
+    with pytest.raises(OSError):
+        recorder.record(b'\x00', 65000)
+
+
+def test_dropped(tmp_path, monkeypatch):
+    recorder = capture.Recorder(str(tmp_path), queue_size=2)
+    #writer kept busy by first record until released
+    release = threading.Event()
+    write = recorder._write
+    monkeypatch.setattr(recorder, '_write', lambda *item: release.wait() and write(*item))
+    recorder.record(b'\x00', 65000)
+    while not recorder._queue.empty():
+        time.sleep(0.001)
+    for _ in range(5):
+        recorder.record(b'\x00', 65000)
+    release.set()
+    recorder.close()
+    assert recorder.dropped == 3 and recorder.count == 3 and recorder.error is None
+    with pytest.raises(ValueError):
+        recorder.record(b'\x00', 65000)
+
+
+def test_play(tmp_path):
+    record(tmp_path, count=5, step=20000000)
+    emitted = []
+    with capture.CaptureReplay(str(tmp_path), speed=2) as replay:
+        started = time.monotonic()
+        assert replay.play(lambda *item: emitted.append(item[0]), stop=60001000) == 3
+        elapsed = time.monotonic() - started
+    assert emitted == [1000, 20001000, 40001000]
+    assert 0.015 < elapsed < 0.5
+    with pytest.raises(ValueError):
+        capture.CaptureReplay(str(tmp_path), speed=0)
+
+
+def test_decode():
+    heartbeat, points, imu = datagrams()
+    assert type(capture.decode(heartbeat)) is g.Heartbeat
+    assert len(capture.decode(points, DeviceType.HORIZON)) == 96
+    assert capture.decode(imu)['acc_z'].tolist() == [1]
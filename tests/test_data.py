@@ -0,0 +1,152 @@
+#std
+import struct
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox.control.frame import DeviceType
+from pylivox.control.lidar import ReturnMode
+from pylivox import data
+
+ALL_TYPES = [data.DataType0, data.DataType1, data.DataType2, data.DataType3,
+             data.DataType4, data.DataType5, data.DataType6, data.DataType7, data.DataType8]
+
+
+def flat(point)->list:
+    """Nested point from tolist() as plain values in _PACK_FORMAT order"""
+    values = []
+    for value in point:
+        if isinstance(value, np.ndarray):
+            values += flat(value.tolist())
+        elif isinstance(value, (tuple, list)):
+            values += flat(value)
+        else:
+            values.append(value)
+    return values
+
+
+@pytest.mark.parametrize('data_type, length', [(data.DataType0, 1318), (data.DataType1, 918),
+                                               (data.DataType2, 1362), (data.DataType3, 978),
+                                               (data.DataType4, 1362), (data.DataType5, 786),
+                                               (data.DataType6, 42), (data.DataType7, 1278),
+                                               (data.DataType8, 678)])
+def test_data_type_layout(data_type, length):
+    assert data_type.DTYPE.itemsize == struct.calcsize(data_type._PACK_FORMAT)
+    assert data_type.PACKET_LENGTH == length == data.HEADER_LENGTH + data_type.N * data_type.DTYPE.itemsize
+    assert data.DATA_TYPES[data_type.TYPE] is data_type
+
+
+@pytest.mark.parametrize('data_type', ALL_TYPES)
+def test_packet_block(data_type):
+    block = data.PacketBlock(data_type, 10, slot_id=2, lidar_id=3)
+    points = data.default_points(data_type)
+    block.fill(1000, 500, points)
+    assert len(block) == 10 and len(block.buffer) == 10 * data_type.PACKET_LENGTH
+    point_struct = struct.Struct(data_type._PACK_FORMAT)
+    payload = b''.join(point_struct.pack(*flat(point)) for point in points.tolist())
+    for i, packet in enumerate(block):
+        assert packet.obj is block.buffer.obj
+        header = struct.unpack_from('<BBBxIBBQ', packet)
+        assert header == (data.PROTOCOL_VERSION, 2, 3, 0, 0, data_type.TYPE, 1000 + 500 * i)
+        assert bytes(packet[data.HEADER_LENGTH:]) == payload
+    block.fill(0, 1)
+    assert struct.unpack_from('<Q', block[9], 10) == (9, )
+    assert bytes(block[9][data.HEADER_LENGTH:]) == payload
+    block.points[3, 0] = np.zeros(1, data_type.DTYPE)[0]
+    assert bytes(block[3][data.HEADER_LENGTH:]) == bytes(data_type.DTYPE.itemsize) + payload[data_type.DTYPE.itemsize:]
+
+
+@pytest.mark.parametrize('data_type', [data.DataType4, data.DataType5, data.DataType7, data.DataType8])
+def test_multi_return_points(data_type):
+    points = data.default_points(data_type)
+    returns = points['returns']
+    assert returns.shape == (data_type.N, 2 if data_type.N == 48 else 3)
+    field = 'depth' if data_type.IS_SPHERICAL else 'x'
+    assert (returns[field] == 10000 + 500 * np.arange(returns.shape[1])).all()
+    assert (returns['reflectivity'] == 100).all()
+
+
+def test_imu_points():
+    point = data.default_points(data.DataType6)[0]
+    assert struct.pack(data.DataType6._PACK_FORMAT, *point.tolist()) == struct.pack('<ffffff', 0, 0, 0, 0, 0, 1)
+
+
+def test_data_type_for():
+    assert data.data_type_for(DeviceType.MID_40) is data.DataType0
+    assert data.data_type_for(DeviceType.MID_40, True) is data.DataType1
+    assert data.data_type_for(DeviceType.HORIZON) is data.DataType2
+    assert data.data_type_for(DeviceType.AVIA, True) is data.DataType3
+    assert data.data_type_for(DeviceType.HORIZON, False, ReturnMode.SINGLE_RETURN_STRONGEST) is data.DataType2
+    assert data.data_type_for(DeviceType.HORIZON, False, ReturnMode.DUAL_RETURN) is data.DataType4
+    assert data.data_type_for(DeviceType.TELE_15, True, ReturnMode.DUAL_RETURN) is data.DataType5
+    assert data.data_type_for(DeviceType.AVIA, False, ReturnMode.TRIPLE_RETURN) is data.DataType7
+    assert data.data_type_for(DeviceType.AVIA, True, ReturnMode.TRIPLE_RETURN) is data.DataType8
+    assert data.data_type_for(DeviceType.MID_40, False, ReturnMode.DUAL_RETURN) is data.DataType0
+
+
+def test_frame():
+    frame = data.Frame(timestamp=123)
+    assert len(frame.frame) == data.DataType1.PACKET_LENGTH
+    assert frame.payload == data.default_points(data.DataType1).tobytes()
+    assert frame.header == struct.pack('<BBBxIBBQ', data.PROTOCOL_VERSION, 1, 1, 0, 0, 1, 123)
+
+
+@pytest.mark.parametrize('data_type', [data.DataType0, data.DataType1, data.DataType2, data.DataType3,
+                                       data.DataType4, data.DataType5, data.DataType7, data.DataType8])
+def test_write_points(data_type):
+    azimuth = np.radians([0, 90, 350, 10]).reshape(2, 2)
+    zenith = np.radians([90, 90, 80, 100]).reshape(2, 2)
+    points = np.zeros((2, 2), data_type.DTYPE)
+    data.write_points(points, data_type, azimuth, zenith, 10000, 50, 1)
+    returns = points['returns'] if 'returns' in data_type.DTYPE.names else points[..., None]
+    assert (returns['reflectivity'] == 50).all()
+    if data_type.IS_SPHERICAL:
+        assert points['zenith'].tolist() == [[9000, 9000], [8000, 10000]]
+        assert points['azimuth'].tolist() == [[0, 9000], [35000, 1000]]
+        assert (returns['depth'] == 10000).all()
+    else:
+        assert returns[0, 0, 0].tolist()[:3] == (10000, 0, 0)
+        assert returns[0, 1, 0].tolist()[:3] == (0, 10000, 0)
+        assert returns[1, 0, 0]['z'] == round(10000 * np.cos(np.radians(80)))
+        assert (returns['x'] ** 2 + returns['y'] ** 2 + returns['z'] ** 2 == pytest.approx(10000 ** 2, rel=1e-3))
+    if returns.shape[-1] > 1:
+        depth = np.array([1000, 2000, 3000][:returns.shape[-1]])
+        data.write_points(points, data_type, azimuth, zenith, np.broadcast_to(depth, azimuth.shape + depth.shape))
+        field = 'depth' if data_type.IS_SPHERICAL else 'x'
+        assert returns[0, 0][field].tolist() == depth.tolist()
+    with pytest.raises(ValueError):
+        data.write_points(np.zeros(1, data.DataType6.DTYPE), data.DataType6, azimuth, zenith, 1)
+
+
+def test_timestamps_ns():
+    header = np.zeros(3, data.HEADER_DTYPE)
+    header['timestamp_type'] = [data.TimestampType.NO_SYNC.value, data.TimestampType.GPS.value, data.TimestampType.PTP.value]
+    utc = np.array([(24, 2, 29, 13, 1500000)], data.UTC_DTYPE)
+    header['timestamp'] = [5, utc.view('<u8')[0], 7]
+    timestamps = data.timestamps_ns(header)
+    assert timestamps[[0, 2]].tolist() == [5, 7]
+    assert timestamps[1] == np.datetime64('2024-02-29T13:00:01.5', 'ns').astype(np.int64)
+
+
+def test_packet_ring():
+    ring = data.PacketRing(data.DataType2, 3, slots=2, slot_id=4, lidar_id=5)
+    first, second = ring.next(), ring.next()
+    assert ring.next() is first and len(ring) == 2
+    assert len(ring.buffer) == 6 * data.DataType2.PACKET_LENGTH
+    assert first[0].obj is ring.buffer and second[0].obj is ring.buffer
+    first.fill(100, 10, data.default_points(data.DataType2))
+    second.fill(200, 10)
+    second.status_code = 0x1234
+    assert struct.unpack_from('<BBBxIBBQ', ring.buffer, 2 * data.DataType2.PACKET_LENGTH) == (5, 4, 5, 0, 0, 2, 100 + 20)
+    assert struct.unpack_from('<BBBxIBBQ', ring.buffer, 3 * data.DataType2.PACKET_LENGTH) == (5, 4, 5, 0x1234, 0, 2, 200)
+    assert bytes(first[1][data.HEADER_LENGTH:]) == data.default_points(data.DataType2).tobytes()
+    assert first.status_code == 0 and second.status_code == 0x1234
+    with pytest.raises(ValueError):
+        data.PacketRing(data.DataType2, 3, slots=0)
+
+
+def test_frame_into():
+    frame = data.Frame(timestamp=123)
+    buffer = bytearray(frame.length + 10)
+    assert frame.frame_into(buffer, 10) == data.DataType1.PACKET_LENGTH
+    assert bytes(buffer[10:]) == frame.frame == frame.header + frame.payload
@@ -0,0 +1,30 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import export
+from pylivox.points import PointCloud
+
+
+@pytest.mark.parametrize('writer', [export.PcdWriter, export.PlyWriter])
+def test_writer(tmp_path, writer):
+    path = str(tmp_path / 'cloud')
+    with writer(path, buffer_size=64) as f:
+        for start, stop in [(0, 3), (3, 3), (3, 5)]:
+            index = np.arange(start, stop)
+            f.write(PointCloud.from_columns(index[:, None] * (1, 2, 3), index - start, 5, 1000000000 * index))
+    assert f.count == 5
+    records = export.read_points(path)
+    assert records['x'].tolist() == [0, 1, 2, 3, 4] and records['z'].tolist() == [0, 3, 6, 9, 12]
+    assert records['intensity'].tolist() == [0, 1, 2, 0, 1] and (records['tag'] == 5).all()
+    assert records['timestamp'].tolist() == [0, 1, 2, 3, 4]
+    header = open(path, 'rb').read(512)
+    assert header.count(b'000000000005\n') == (2 if writer is export.PcdWriter else 1)
+
+
+def test_empty(tmp_path):
+    path = str(tmp_path / 'empty.ply')
+    export.PlyWriter(path).close()
+    assert len(export.read_points(path)) == 0
+    with pytest.raises(ValueError):
+        export.read_points(__file__)
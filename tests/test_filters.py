@@ -0,0 +1,44 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import filters
+from pylivox.points import PointCloud
+
+
+@pytest.mark.parametrize('noise, min_reflectivity, max_reflectivity, expected', [
+    (filters.TAG_NOISE, 0, 255, [0, 4, 5]),
+    (filters.TAG_SPATIAL, 0, 255, [0, 2, 4, 5]),
+    (0, 0, 255, [0, 1, 2, 3, 4, 5]),
+    (filters.TAG_NOISE, 20, 255, [4, 5]),
+    (0, 20, 100, [1, 2, 3, 4]),
+])
+def test_keep_mask(noise, min_reflectivity, max_reflectivity, expected):
+    tagged = PointCloud.from_columns(np.zeros((6, 3)), [10, 20, 30, 40, 50, 200], [0, 1, 4, 3, 0x10, 0x20])
+    mask = filters.keep_mask(tagged, noise, min_reflectivity, max_reflectivity)
+    assert np.flatnonzero(mask).tolist() == expected
+
+
+def test_voxel_downsample():
+    xyz = [(0.1, 0.1, 0.1), (5, 5, 5), (0.3, 0.1, 0.2), (-0.1, 0, 0), (5.2, 5.4, 5)]
+    result = filters.voxel_downsample(PointCloud.from_columns(xyz, [1, 2, 3, 4, 5], timestamp=np.arange(5)), 0.5)
+    assert len(result) == 3
+    assert np.allclose(result.xyz, [(-0.1, 0, 0), (0.2, 0.1, 0.15), (5.1, 5.2, 5)])
+    assert result.reflectivity.tolist() == [4, 1, 2] and result.timestamp.tolist() == [3, 0, 1]
+    out = PointCloud.empty(2)
+    with pytest.raises(ValueError):
+        filters.voxel_downsample(PointCloud.from_columns(xyz), 0.5, out)
+    assert filters.voxel_downsample(PointCloud.from_columns(xyz[:2]), 0.5, out).xyz.base is out.xyz
+    assert len(filters.voxel_downsample(PointCloud.empty(0), 0.5)) == 0
+
+
+def test_point_filter():
+    stage = filters.PointFilter(4, voxel=1.0)
+    xyz = np.repeat(np.arange(10)[:, None], 3, axis=1) + 0.5
+    noisy = PointCloud.from_columns(np.concatenate([xyz, xyz]), 50, [0] * 10 + [1] * 10, np.arange(20))
+    result = stage(noisy)
+    assert len(result) == 4 and (result.tag == 0).all()
+    assert result.timestamp.tolist() == [0, 2, 5, 7]
+    assert stage(PointCloud.from_columns(xyz[:3])).xyz.base is result.xyz.base
+    with pytest.raises(ValueError):
+        filters.PointFilter(0)
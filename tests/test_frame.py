@@ -0,0 +1,287 @@
+#std
+import enum
+import io
+import random
+import struct
+#libs
+import pytest
+#proj
+from pylivox.control import general as g
+from pylivox.control import hub, lidar
+from pylivox.control.frame import (Frame, Cmd, CMD_TABLE, DeviceType, Crc32, crc32, crc16, crc_header_cached,
+                                   frame_spans, crc_frames, verify_frames, lookup_cmd, registered_cmds,
+                                   set_ignore_type_restriction, is_supported, supported_cmds,
+                                   encode_many, frame_views, device_context,
+                                   get_default_device_type, get_default_device_version)
+from pylivox.control.utils import FrameFrom, FrameStreamDecoder
+
+
+FRAMES = [
+    g.BroadcastMsg(g.Broadcast('12345678901234', 0), 1, DeviceType.MID_40),
+    g.Handshake('192.168.1.1', 0x1122, 0x3344, 0x5566, 2, DeviceType.HORIZON, (8, 8, 8, 8)),
+    g.HeartbeatResponse(g.WorkState.Lidar.Normal, 0, 0x11223344, 3),
+    g.GetDeviceIpInformationResponse(True, '192.168.1.2', '255.255.255.0', '192.168.1.1', 4),
+    g.WriteConfigurationParameters([g.ConfigurationParameter(g.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION, 3)], 5),
+    g.ReadConfigurationParameters(1, [g.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION], 6),
+    lidar.ReadLidarExtrinsicParametersResponse(1.0, 2.0, 3.0, 4, 5, 6, 7),
+    lidar.GetLidarReturnMode(8),
+]
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_encode_into_matches_frame(frame:Frame):
+    expected = frame.header + frame.header_crc + frame.payload + frame.frame_crc
+    assert frame.frame == expected
+    assert frame.header == struct.pack('<BBHBH', Frame.START, Frame.VERSION, len(expected), frame.CMD_TYPE.value, frame.seq)
+    assert frame.header_crc == crc16(frame.header).to_bytes(2, 'little')
+    assert frame.frame_crc == crc32(frame.header + frame.header_crc + frame.payload).to_bytes(4, 'little')
+    offset = 5
+    buffer = bytearray(offset + Frame.FRAME_MAX_LENGTH)
+    length = frame.encode_into(memoryview(buffer), offset)
+    assert length == len(expected)
+    assert buffer[offset:offset+length] == expected
+    assert buffer[:offset] == bytes(offset)
+    assert type(FrameFrom(bytes(buffer[offset:offset+length]), frame.device_type, frame.device_version)) is type(frame)
+
+
+def test_encode_into_too_big():
+    params = [g.ConfigurationParameter(g.ConfigurationParameter.Key.SLOT_ID_CONFIGURATION, 3)] * 300
+    frame = g.WriteConfigurationParameters(params, 0)
+    with pytest.raises(ValueError):
+        frame.encode_into(bytearray(2 * Frame.FRAME_MAX_LENGTH))
+    with pytest.raises(ValueError):
+        frame.header
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_lazy_view_fields(frame:Frame):
+    buffer = bytearray(frame.frame)
+    view = FrameFrom(buffer, frame.device_type, frame.device_version, lazy=True)
+    assert view.frame_type is type(frame)
+    assert view.seq == frame.seq
+    assert view.payload.obj is buffer
+    assert bytes(view.payload) == frame.payload
+    for name in (type(frame)._FIELDS or ()):
+        assert getattr(view, name) == getattr(frame, name)
+    assert repr(view.to_frame()) == repr(frame)
+
+
+def test_crc32_incremental():
+    frame = FRAMES[1].frame
+    crc = Crc32().update(frame[:7]).update(memoryview(frame)[7:9]).update(bytearray(frame[9:-4]))
+    assert crc.value == crc32(frame[:-4]) == Frame.crc(frame[9:-4], Frame.crc(frame[:9]))
+    assert crc.value.to_bytes(4, 'little') == frame[-4:]
+
+
+def test_crc_header_cached():
+    for frame in FRAMES:
+        data = frame.frame
+        assert crc_header_cached(data) == crc16(data[:7]) == crc_header_cached(bytearray(b'xx' + data), 2)
+
+
+def test_crc_frames_batch():
+    frames = [frame.frame for frame in FRAMES]
+    buffer = bytearray(b''.join(frames))
+    spans = frame_spans(buffer)
+    assert [length for _, length in spans] == [len(frame) for frame in frames]
+    assert crc_frames(buffer, spans) == [crc32(frame[:-4]) for frame in frames]
+    assert all(verify_frames(buffer))
+    offset, length = spans[2]
+    buffer[offset + length - 5] ^= 0xFF
+    assert verify_frames(buffer) == [i != 2 for i in range(len(frames))]
+    assert frame_spans(buffer[:-1]) == spans[:-1]
+
+
+def test_frame_from_malformed():
+    frame = bytearray(FRAMES[2].frame)
+    with pytest.raises(ValueError):
+        FrameFrom(frame[:-1])
+    frame[-1] ^= 0xFF
+    with pytest.raises(ValueError):
+        FrameFrom(frame)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 4096])
+def test_stream_decoder_resync(chunk_size:int):
+    frames = [frame.frame for frame in FRAMES]
+    garbage = [b'', b'\xaa', b'\x00\x11\xaa\x01', b'\xaa\x01\x20\x00\x00\x00\x00\x00\x00']
+    corrupted = bytearray(frames[0])
+    corrupted[12] ^= 0xFF
+    stream = b''.join(garbage[i % len(garbage)] + frame for i, frame in enumerate(frames)) + bytes(corrupted) + frames[-1]
+    decoder = FrameStreamDecoder()
+    decoded = []
+    for i in range(0, len(stream), chunk_size):
+        decoded += decoder.feed(stream[i:i+chunk_size])
+    assert [type(frame) for frame in decoded] == [type(frame) for frame in FRAMES] + [type(FRAMES[-1])]
+    assert decoder.frames_decoded == len(FRAMES) + 1
+    assert decoder.frame_crc_errors == 1
+    assert decoder.bytes_received == len(stream)
+    assert decoder.bytes_discarded == len(stream) - sum(len(frame) for frame in frames) - len(frames[-1])
+    assert decoder.pending == 0
+
+
+def test_stream_decoder_file_lazy():
+    frames = [frame.frame for frame in FRAMES] * 3
+    decoder = FrameStreamDecoder(lazy=True)
+    decoded = list(decoder.decode_stream(io.BytesIO(b''.join(frames)), chunk_size=100))
+    assert [bytes(view.frame) for view in decoded] == frames
+    assert decoder.bytes_discarded == 0
+
+
+@pytest.fixture
+def registry():
+    """Command registry row of general commands restored after test"""
+    types = CMD_TABLE[Frame.Set.GENERAL.value]
+    ids = types[Frame.Type.CMD.value]
+    types[Frame.Type.CMD.value] = list(ids)
+    try:
+        yield
+    finally:
+        types[Frame.Type.CMD.value] = ids
+
+
+def defined_cmds()->set:
+    """Concrete command classes of command modules"""
+    return {T for module in (g, lidar, hub) for T in vars(module).values()
+            if isinstance(T, type) and issubclass(T, Cmd) and T.__module__ == module.__name__
+                and 'CMD_ID' in T.__dict__ and T.CMD_TYPE is not None}
+
+
+def test_registry(registry):
+    assert set(registered_cmds()) == defined_cmds()
+    for T in registered_cmds():
+        assert lookup_cmd(T.CMD_SET.value, T.CMD_TYPE.value, T.CMD_ID.value) is T
+    assert lookup_cmd(0xFF, 0xFF, 0xFF) is None
+    assert lookup_cmd(Frame.Set.HUB.value, Frame.Type.CMD.value, 0) is hub.QueryConnectedLidarDevice
+
+    class TestId(enum.Enum):
+        TEST = 0xF0
+
+    class TestCmd(g.General):
+        CMD_TYPE = Frame.Type.CMD
+        CMD_ID = TestId.TEST
+
+    assert lookup_cmd(0, 0, 0xF0) is TestCmd
+    assert type(FrameFrom(TestCmd(1).frame)) is TestCmd
+
+
+def test_registry_restored():
+    assert lookup_cmd(0, 0, 0xF0) is None
+    assert set(registered_cmds()) == defined_cmds()
+
+
+def test_frame_from_unknown():
+    frame = bytearray(FRAMES[2].frame)
+    frame[10] = 0xEE
+    frame[-4:] = crc32(frame[:-4]).to_bytes(4, 'little')
+    assert FrameFrom(frame) is None
+    decoder = FrameStreamDecoder()
+    assert decoder.feed(bytes(frame)) == []
+    assert decoder.unknown_frames == 1
+
+
+def test_capabilities():
+    assert is_supported(lidar.TurnOnOffRainFogSuppression, DeviceType.MID_40, (0, 0, 0, 0))
+    assert not is_supported(lidar.TurnOnOffRainFogSuppression, DeviceType.HORIZON, (99, 0, 0, 0))
+    assert not is_supported(g.RebootDevice, DeviceType.MID_40, (3, 6, 0, 0))
+    assert is_supported(g.RebootDevice, DeviceType.MID_40, (3, 7, 0, 0))
+    assert is_supported(g.Handshake, DeviceType.HUB, (0, 0, 0, 0))
+    cmds = supported_cmds(DeviceType.HORIZON, (6, 4, 0, 0))
+    assert g.Handshake in cmds and lidar.TurnOnOffRainFogSuppression not in cmds
+    assert set(supported_cmds(DeviceType.MID_40, (99, 0, 0, 0))) > set(supported_cmds(DeviceType.MID_40, (0, 0, 0, 0)))
+
+
+def test_type_restriction():
+    frame = lidar.TurnOnOffRainFogSuppression(True, 1, DeviceType.MID_40, (0, 0, 0, 0)).frame
+    set_ignore_type_restriction(False)
+    try:
+        with pytest.raises(Exception):
+            lidar.TurnOnOffRainFogSuppression(True, 1, DeviceType.HORIZON, (8, 8, 8, 8))
+        with pytest.raises(Exception):
+            FrameFrom(frame, DeviceType.HORIZON, (8, 8, 8, 8))
+        with pytest.raises(Exception):
+            FrameFrom(frame, DeviceType.HORIZON, (8, 8, 8, 8), lazy=True)
+        assert FrameFrom(frame, DeviceType.MID_40, (0, 0, 0, 0)).is_enable
+        cmd = lidar.TurnOnOffRainFogSuppression(True, 1, DeviceType.MID_40, (0, 0, 0, 0))
+        cmd.device_type = DeviceType.AVIA
+        with pytest.raises(Exception):
+            cmd.frame
+    finally:
+        set_ignore_type_restriction(True)
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_trusted_decode(frame):
+    decoded = FrameFrom(frame.frame, frame.device_type, frame.device_version)
+    assert not hasattr(decoded, '__dict__')
+    assert decoded.frame == frame.frame
+    assert repr(decoded) == repr(frame)
+
+
+def test_strict_constructors():
+    with pytest.raises(TypeError):
+        g.StartStopSampling(1, 1)
+    with pytest.raises(ValueError):
+        lidar.SetMode(0x7F, 1)
+    with pytest.raises(OverflowError):
+        g.HeartbeatResponse(g.WorkState.Lidar.Normal, 0x100, 0, 1)
+    decoded = FrameFrom(lidar.SetMode(lidar.PowerMode.standby, 1).frame)
+    assert decoded.power_mode is lidar.PowerMode.standby
+    with pytest.raises(TypeError):
+        decoded.power_mode = 'standby'
+    with pytest.raises(AttributeError):
+        decoded.unknown = 1
+
+
+def test_encode_many():
+    buffer, spans = encode_many(FRAMES)
+    assert [bytes(buffer[offset:offset + length]) for offset, length in spans] == [frame.frame for frame in FRAMES]
+    assert len(buffer) == sum(length for _, length in spans)
+    assert frame_spans(buffer) == spans
+    assert [bytes(view) for view in frame_views(buffer, spans)] == [frame.frame for frame in FRAMES]
+    many = [FRAMES[4]] * 200
+    buffer, spans = encode_many(many, bytearray(16))
+    assert len(spans) == 200 and all(verify_frames(buffer, spans))
+    assert encode_many([]) == (bytearray(), [])
+
+
+def test_device_context():
+    horizon = device_context(DeviceType.HORIZON, (6, 4, 0, 0))
+    mid40 = device_context(DeviceType.MID_40, (3, 7, 0, 0))
+    assert device_context(DeviceType.HORIZON, [6, 4, 0, 0]) is horizon
+    assert device_context(horizon) is horizon
+    assert device_context() is device_context(get_default_device_type(), get_default_device_version())
+    with pytest.raises(ValueError):
+        device_context(DeviceType.HORIZON, (6, 4, 0))
+    with pytest.raises(ValueError):
+        device_context(DeviceType.HORIZON, (6, 4, 0, 256))
+    assert horizon.layout(g.Handshake) == (g.Handshake._STRUCT_IMU, g.Handshake._FIELDS)
+    assert mid40.layout(g.Handshake) == (g.Handshake._STRUCT_NO_IMU, g.Handshake._FIELDS[:3])
+    assert horizon.layout(g.Handshake) is horizon.layout(g.Handshake)
+    assert mid40.layout(g.ConfigureStaticDynamicIp)[0] is g.ConfigureStaticDynamicIp._STRUCT_SHORT
+    assert horizon.layout(g.GetDeviceIpInformationResponse)[0] is g.GetDeviceIpInformationResponse._STRUCT_FULL
+    assert horizon.supports(lidar.SetTurnOnOffFan) and not mid40.supports(lidar.SetImuDataPushFrequency)
+
+
+def test_device_context_mixed_fleet():
+    defaults = get_default_device_type(), get_default_device_version()
+    horizon = device_context(DeviceType.HORIZON, (6, 4, 0, 0))
+    mid40 = device_context(DeviceType.MID_40, (3, 7, 0, 0))
+    handshakes = [g.Handshake('192.168.1.1', 1, 2, 3, 1, context) for context in (horizon, mid40)]
+    assert [len(handshake.frame) for handshake in handshakes] == [25, 23]
+    for handshake, context in zip(handshakes, (horizon, mid40)):
+        assert handshake.context is context
+        decoded = FrameFrom(handshake.frame, context)
+        assert decoded.context is context and decoded.frame == handshake.frame
+        view = FrameFrom(handshake.frame, context, lazy=True)
+        assert view.context is context and view.cmd_port == 2
+    handshake = handshakes[1]
+    handshake.device_version = (3, 8, 0, 0)
+    assert handshake.context is device_context(DeviceType.MID_40, (3, 8, 0, 0))
+    handshake.device_type = DeviceType.HORIZON
+    assert handshake.device_type is DeviceType.HORIZON and handshake.device_version == (3, 8, 0, 0)
+    broadcast = g.BroadcastMsg(g.Broadcast('12345678901234', 0), 1, mid40)
+    assert FrameFrom(broadcast.frame, mid40).context is mid40
+    with pytest.raises(ValueError):
+        FrameFrom(broadcast.frame, horizon)
+    assert (get_default_device_type(), get_default_device_version()) == defaults
@@ -0,0 +1,84 @@
+#libs
+import pytest
+#proj
+from pylivox.control import general as g
+from pylivox.control import hub
+from pylivox.control import lidar
+from pylivox.control.frame import Frame, DeviceType, lookup_cmd, supported_cmds
+from pylivox.control.utils import FrameFrom
+from tests.test_general import cmd_payload
+
+A = g.Broadcast('12345678901234', 1)
+B = g.Broadcast('ABCDEFGHIJKLMN', 2)
+
+FRAMES = [
+    hub.QueryConnectedLidarDevice(1),
+    hub.QueryConnectedLidarDeviceResponse([hub.LidarInfo(A, DeviceType.HORIZON, (6, 4, 0, 0), 1, 2),
+                                           hub.LidarInfo(B, DeviceType.MID_40, (3, 7, 0, 0), 3, 4)], 1),
+    hub.SetLidarMode([hub.LidarMode(A, lidar.PowerMode.normal), hub.LidarMode(B, 3)], 1),
+    hub.SetLidarModeResponse([hub.ReturnCode(False, A), hub.ReturnCode(True, B)], 1, True),
+    hub.TurnOnOffDesignatedSlotPower(5, True, 1),
+    hub.TurnOnOffDesignatedSlotPowerResponse(1),
+    hub.WriteLidarExtrinsicParameters([hub.LidarExtrinsics(A, 1.0, 2.0, 3.0, -4, 5, -6)], 1),
+    hub.WriteLidarExtrinsicParametersResponse([hub.ReturnCode(False, A)], 1),
+    hub.ReadLidarExtrinsicParameters([hub.LidarCode(A), hub.LidarCode(B)], 1),
+    hub.ReadLidarExtrinsicParametersResponse([hub.LidarExtrinsicsResult(False, A, 1.0, 2.0, 3.0, -4, 5, -6)], 1),
+    hub.QueryLidarDeviceStatus(1),
+    hub.QueryLidarDeviceStatusResponse([hub.LidarStatus(A, 100000, g.WorkState.Lidar.Normal, 1, 0x11223344)], 1),
+    hub.TurnOnOffHubCalculationOfExtrinsicParameters(True, 1),
+    hub.TurnOnOffHubCalculationOfExtrinsicParametersResponse(1),
+    hub.TurnOnOffLidarRainFogSuppression([hub.LidarSwitch(A, True)], 1),
+    hub.TurnOnOffLidarRainFogSuppressionResponse([hub.ReturnCode(False, A)], 1),
+    hub.QueryHubSlotPowerStatus(1),
+    hub.QueryHubSlotPowerStatusResponse(0b101010101, 1),
+    hub.SetLidarTurnOnOffFan([hub.LidarSwitch(A, False)], 1),
+    hub.SetLidarTurnOnOffFanResponse([hub.ReturnCode(False, A)], 1),
+    hub.GetLidarTurnOnOffFanState([hub.LidarCode(A)], 1),
+    hub.GetLidarTurnOnOffFanStateResponse([hub.LidarSwitchResult(False, A, True)], 1),
+    hub.SetLidarReturnMode([hub.LidarReturnMode(A, lidar.ReturnMode.DUAL_RETURN)], 1),
+    hub.SetLidarReturnModeResponse([hub.ReturnCode(False, A)], 1),
+    hub.GetLidarReturnMode([hub.LidarCode(A)], 1),
+    hub.GetLidarReturnModeResponse([hub.LidarReturnModeResult(False, A, 1)], 1),
+    hub.SetLidarImuDataPushFrequency([hub.LidarPushFrequency(A, lidar.PushFrequency.FREQ_200HZ)], 1),
+    hub.SetLidarImuDataPushFrequencyResponse([hub.ReturnCode(False, A)], 1),
+    hub.GetLidarImuDataPushFrequency([hub.LidarCode(A)], 1),
+    hub.GetLidarImuDataPushFrequencyResponse([hub.LidarPushFrequencyResult(True, A, 0)], 1),
+]
+
+
+@pytest.mark.parametrize('frame', FRAMES)
+def test_round_trip(frame):
+    decoded = FrameFrom(frame.frame, DeviceType.HUB)
+    assert type(decoded) is type(frame)
+    assert decoded.frame == frame.frame
+    assert lookup_cmd(Frame.Set.HUB.value, frame.CMD_TYPE.value, frame.CMD_ID.value) is type(frame)
+    view = FrameFrom(frame.frame, DeviceType.HUB, lazy=True)
+    assert bytes(view.frame) == frame.frame
+    if hasattr(frame, 'lidar_list'):
+        assert view.lidar_list == frame.lidar_list
+
+
+def test_all_registered():
+    assert len({(type(frame).CMD_TYPE, type(frame).CMD_ID) for frame in FRAMES}) == 30
+    cmds = supported_cmds(DeviceType.HUB, (8, 9, 0, 0))
+    assert all(type(frame) in cmds for frame in FRAMES)
+    assert not [T for T in supported_cmds(DeviceType.HORIZON, (6, 4, 0, 0)) if T.CMD_SET is Frame.Set.HUB]
+
+
+def test_payload():
+    frame = hub.SetLidarMode([hub.LidarMode(A, lidar.PowerMode.normal), hub.LidarMode(B, 3)], 0)
+                                            #start, version, length, type, seq,  head crc, set, id, count, serial,                       ip_range, reserved, mode
+    assert frame.frame == cmd_payload('aa     01       3200    00    0000  0000      02   01  02     3132333435363738393031323334 01        00        01'
+                                      '                                                                4142434445464748494a4b4c4d4e 02        00        03    00000000')
+    response = hub.QueryHubSlotPowerStatusResponse(0x1FF, 0)
+                                               #start, version, length, type, seq, head crc, set, id, is_error, slot_power
+    assert response.frame == cmd_payload('aa     01       1200    01    0000 0000      02   08  00        ff01       00000000')
+
+
+def test_bad_count():
+    frame = bytearray(hub.SetLidarMode([hub.LidarMode(A, 1)], 0).frame)
+    frame[11] = 2
+    with pytest.raises(ValueError):
+        hub.SetLidarMode.from_payload(memoryview(frame)[11:-4], 0)
+    with pytest.raises(TypeError):
+        hub.SetLidarMode([hub.LidarCode(A)], 0)
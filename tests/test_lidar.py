@@ -0,0 +1,56 @@
+#proj
+from pylivox import capture, lidar as emulator_module, scan
+from pylivox.control import general
+from pylivox.control.frame import DeviceType, device_context
+from pylivox.control.utils import FrameFrom
+from pylivox.lidar import Lidar
+
+
+def emulator(monkeypatch, device_type=DeviceType.HORIZON):
+    """Lidar state without sockets and threads of __init__, scan tables kept in memory"""
+    monkeypatch.setattr(emulator_module, 'load_table', lambda device_type, repetitive: scan.load_table(device_type, repetitive, None))
+    lidar = Lidar.__new__(Lidar)
+    lidar.context = device_context(device_type, (6, 4, 0, 0))
+    lidar.device_type = lidar.context.device_type
+    lidar.scene = None
+    lidar.replay = None
+    lidar.config_parameters = {general.ConfigurationParameter.Key.SWITCH_REPETITIVE_NON_REPETITIVE_SCANNING_PATTERN: False}
+    lidar._scan = None
+    lidar._scan_repetitive = None
+    return lidar
+
+
+def dispatch(lidar, frame):
+    frame = FrameFrom(frame.frame, lidar.context)
+    return Lidar.HANDLERS[type(frame)](lidar, frame)
+
+
+def test_write_configuration_parameters(monkeypatch):
+    lidar = emulator(monkeypatch)
+    non_repetitive = lidar._scan_cursor().table
+    key = general.ConfigurationParameter.Key.SWITCH_REPETITIVE_NON_REPETITIVE_SCANNING_PATTERN
+    request = general.WriteConfigurationParameters([general.ConfigurationParameter(key, True)], 7, device_type=lidar.context)
+    response = dispatch(lidar, request)
+    assert type(response) is general.WriteConfigurationParametersResponse and response.seq == 7
+    assert lidar.config_parameters[key] is True
+    repetitive = lidar._scan_cursor().table
+    assert len(repetitive) != len(non_repetitive) or (repetitive != non_repetitive).any()
+    assert lidar._scan_repetitive is True
+
+
+def test_capture(monkeypatch, tmp_path):
+    class Socket:
+        def sendto(self, data, address):
+            pass
+    lidar = emulator(monkeypatch)
+    lidar.s = lidar.s2 = Socket()
+    lidar.master_address = ('127.0.0.1', 50001)
+    lidar.capture = capture.Recorder(str(tmp_path))
+    lidar.send(general.Heartbeat(seq=1, device_type=lidar.context))
+    lidar.capture.close()
+    #closed recorder is dropped by emulator, sending goes on
+    lidar.send(general.Heartbeat(seq=2, device_type=lidar.context))
+    assert lidar.capture is None
+    with capture.CaptureReplay(str(tmp_path), speed=None) as replay:
+        records = [(port, direction, bytes(datagram)) for _, port, direction, datagram in replay.records()]
+    assert records == [(50001, capture.TX, general.Heartbeat(seq=1, device_type=lidar.context).frame)]
@@ -0,0 +1,58 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data, lvx, points
+from pylivox.control.frame import DeviceType
+from pylivox.transform import Extrinsics
+
+
+def record(path, count=10, period=20000000):
+    block = data.PacketBlock(data.DataType2, count).fill(1000, period, data.default_points(data.DataType2))
+    imu = data.PacketBlock(data.DataType6, count).fill(1000, period, data.default_points(data.DataType6))
+    devices = [lvx.device_info('0TFDG3B006H2Z11', DeviceType.HORIZON, Extrinsics(yaw=90, z=1500)),
+               lvx.device_info(b'1HDDG8M00100191', DeviceType.HORIZON)]
+    with lvx.LvxWriter(path, devices) as writer:
+        writer.write(block.buffer[:5 * data.DataType2.PACKET_LENGTH])
+        writer.write([bytes(packet) for packet in block][5:], device_index=1)
+        writer.write(imu[9])
+    return block
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'rec.lvx')
+    block = record(path)
+    with lvx.LvxReader(path) as reader:
+        assert reader.version == lvx.VERSION and reader.frame_duration == lvx.FRAME_DURATION
+        assert reader.devices['lidar_sn'].tolist() == [b'0TFDG3B006H2Z11', b'1HDDG8M00100191']
+        assert reader.devices['device_index'].tolist() == [0, 1] and reader.devices['extrinsic_enable'].tolist() == [1, 0]
+        assert reader.devices[0]['yaw'] == 90 and reader.devices[0]['z'] == pytest.approx(1.5)
+        #packets 20 ms apart, frames of 50 ms aligned to multiples of frame duration
+        assert reader.timestamps.tolist() == [1000, 60001000, 100001000, 160001000]
+        packets = [bytes(packet) for i in range(len(reader)) for packet in reader.packets(i)]
+        assert packets == [bytes(packet) for packet in block] + [packets[-1]] and len(packets[-1]) == 42
+        assert [device for device, _ in reader.packages(1)] == [0, 0] and [device for device, _ in reader.packages(3)] == [1, 1, 0]
+        assert len(reader.packets(3, device_index=1)) == 2
+        cloud = points.decode(reader.packets(0))
+        assert len(cloud) == 3 * 96 and isinstance(reader.packets(0)[0], memoryview)
+
+
+@pytest.mark.parametrize('timestamp, expected', [(0, 0), (1000, 0), (60000999, 0), (60001000, 1), (10 ** 12, 3)])
+def test_seek(tmp_path, timestamp, expected):
+    path = str(tmp_path / 'rec.lvx')
+    record(path)
+    with lvx.LvxReader(path, cache=False) as reader:
+        assert reader.seek(timestamp) == expected
+
+
+def test_index_cache(tmp_path):
+    path = str(tmp_path / 'rec.lvx')
+    record(path)
+    lvx.LvxReader(path).close()
+    cached = np.load(f'{path}.idx.npy')
+    with lvx.LvxReader(path) as reader:
+        assert (reader.index == cached).all()
+    with open(path, 'r+b') as f:
+        f.write(b'livox_tecX')
+    with pytest.raises(ValueError):
+        lvx.LvxReader(path)
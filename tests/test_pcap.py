@@ -0,0 +1,171 @@
+#std
+import ipaddress
+import struct
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data, pcap
+from pylivox.control import general as g
+from pylivox.control.frame import DeviceType
+
+
+LIDAR = ipaddress.ip_address('192.168.1.101')
+OTHER = ipaddress.ip_address('192.168.1.102')
+
+
+def ethernet(payload, source, destination, vlan=False, ipv6=False, address=LIDAR):
+    udp = struct.pack('>HHHH', source, destination, 8 + len(payload), 0) + payload
+    if ipv6:
+        ip = struct.pack('>IHBB16s16s', 6 << 28, len(udp), 17, 64, address.packed, b'\0' * 16)
+        ethertype = 0x86DD
+    else:
+        ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), 0, 0x4000, 64, 17, 0, address.packed, bytes(4))
+        ethertype = 0x0800
+    tag = struct.pack('>HH', 0x8100, 5) if vlan else b''
+    return b'\1' * 12 + tag + struct.pack('>H', ethertype) + ip + udp
+
+
+def traffic(address=LIDAR):
+    heartbeat = g.Heartbeat(seq=3).frame
+    block = data.PacketBlock(data.DataType2, 6).fill(0, 1000, data.default_points(data.DataType2))
+    imu = data.PacketBlock(data.DataType6, 1).fill(0, 0, data.default_points(data.DataType6))
+    packets = [ethernet(heartbeat, 50001, 65000, address=address)]
+    packets += [ethernet(bytes(packet), 65000, 60001, vlan=i % 2, address=address) for i, packet in enumerate(block)]
+    packets += [ethernet(bytes(imu[0]), 65000, 60003, address=address), ethernet(b'dns', 5353, 53, address=address)]
+    return packets
+
+
+def write_pcap(path, packets):
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<IHHiIII', 0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for i, packet in enumerate(packets):
+            f.write(struct.pack('<IIII', 100 + i, 5, len(packet), len(packet)) + packet)
+
+
+def ng_block(kind, body):
+    body += b'\0' * (-len(body) % 4)
+    return struct.pack('<II', kind, 12 + len(body)) + body + struct.pack('<I', 12 + len(body))
+
+
+def ng_interface(tsresol=9, linktype=1):
+    return ng_block(1, struct.pack('<HHI', linktype, 0, 65535) + struct.pack('<HHB3x', 9, 1, tsresol) + struct.pack('<HH', 0, 0))
+
+
+def ng_packet(packet, stamp, interface=0):
+    return ng_block(6, struct.pack('<IIIII', interface, stamp >> 32, stamp & 0xFFFFFFFF, len(packet), len(packet)) + packet)
+
+
+def write_pcapng(path, packets, tsresol=9, stamps=None):
+    with open(path, 'wb') as f:
+        f.write(ng_block(0x0A0D0D0A, struct.pack('<IHHq', 0x1A2B3C4D, 1, 0, -1)))
+        #ns timestamps by default: if_tsresol 9
+        f.write(ng_interface(tsresol))
+        for i, packet in enumerate(packets):
+            f.write(ng_packet(packet, (100 + i) * 1000000000 + 5000 if stamps is None else stamps[i]))
+
+
+@pytest.mark.parametrize('write', [write_pcap, write_pcapng])
+def test_read(tmp_path, write):
+    path = str(tmp_path / 'capture')
+    write(path, traffic())
+    result = pcap.read(path, device_type=DeviceType.HORIZON)
+    assert [(t, address, source, destination, type(frame)) for t, address, source, destination, frame in result.frames] == [
+        (100000005000, LIDAR, 50001, 65000, g.Heartbeat)]
+    assert result.devices == [LIDAR] and len(result.points[LIDAR]) == 6 * 96
+    assert result.imu[LIDAR]['acc_z'].tolist() == [1] and result.skipped == 1
+    times = [t for t, *_ in pcap.datagrams(path, block_size=64)]
+    assert times == [(100 + i) * 1000000000 + 5000 for i in range(9)]
+    with pytest.raises(ValueError):
+        pcap.read_format(__file__)
+
+
+@pytest.mark.parametrize('tsresol, stamp, expected', [
+    (9, 1760800000123456789, 1760800000123456789),
+    (6, 1760800000123456, 1760800000123456000),
+    (0x80 | 30, 1760800000 * 2 ** 30 + 2 ** 29, 1760800000500000000),
+    (0x80 | 10, 1, 976562)])
+def test_ng_timestamp(tmp_path, tsresol, stamp, expected):
+    path = str(tmp_path / 'capture')
+    write_pcapng(path, traffic()[:1], tsresol, [stamp])
+    assert [t for t, *_ in pcap.records(path)] == [expected]
+
+
+@pytest.mark.parametrize('write', [write_pcap, write_pcapng])
+def test_chunks(tmp_path, write):
+    path = str(tmp_path / 'capture')
+    packets = traffic() * 20
+    write(path, packets)
+    fmt = pcap.read_format(path)
+    parts = pcap.chunks(path, fmt, 5000)
+    assert len(parts) > 5 and parts[0][0] == fmt.data
+    counts = [len(list(pcap.records(path, part, start, stop))) for start, stop, part in parts]
+    assert sum(counts) == len(packets)
+    single = pcap.read(path)
+    pooled = pcap.read(path, workers=2, chunk_size=5000)
+    assert len(pooled.frames) == len(single.frames) == 20 and pooled.skipped == single.skipped
+    assert (pooled.points[LIDAR].xyz == single.points[LIDAR].xyz).all() and (pooled.imu[LIDAR] == single.imu[LIDAR]).all()
+
+
+def test_devices(tmp_path):
+    path = str(tmp_path / 'capture')
+    packets = [packet for pair in zip(traffic(), traffic(OTHER)) for packet in pair]
+    packets.append(ethernet(bytes(data.PacketBlock(data.DataType2, 1).fill(0, 0, data.default_points(data.DataType2))[0]),
+                            65000, 60001, ipv6=True, address=ipaddress.ip_address('fd00::1')))
+    write_pcap(path, packets)
+    result = pcap.read(path)
+    assert result.devices == [LIDAR, OTHER, ipaddress.ip_address('fd00::1')]
+    assert [len(result.points[device]) for device in result.devices] == [6 * 96, 6 * 96, 96]
+    assert [address for _, address, *_ in result.frames] == [LIDAR, OTHER]
+    assert [len(result.imu[device]) for device in result.devices] == [1, 1, 0]
+    #time of every device keeps its own order
+    assert all((np.diff(result.points[device].timestamp) >= 0).all() for device in result.devices)
+
+
+def test_late_interface(tmp_path):
+    path = str(tmp_path / 'capture')
+    packets = traffic() * 10
+    with open(path, 'wb') as f:
+        f.write(ng_block(0x0A0D0D0A, struct.pack('<IHHq', 0x1A2B3C4D, 1, 0, -1)))
+        f.write(ng_interface())
+        f.write(ng_block(3, struct.pack('<I', len(packets[0])) + packets[0]))
+        for i, packet in enumerate(packets[:45]):
+            f.write(ng_packet(packet, i))
+        #second interface in microseconds, described after first packets
+        f.write(ng_interface(6))
+        for i, packet in enumerate(packets[45:]):
+            f.write(ng_packet(packet, 45 + i, interface=1))
+        f.write(ng_packet(packets[0], 0, interface=2))
+    fmt = pcap.read_format(path)
+    assert len(fmt.interfaces) == 1
+    parts = pcap.chunks(path, fmt, 5000)
+    assert len(parts) > 3 and len(parts[-1][2].interfaces) == 2
+    single = pcap.read(path)
+    pooled = pcap.read(path, workers=2, chunk_size=5000)
+    times = [t for t, *_ in pcap.records(path)]
+    assert len(times) == 1 + len(packets) and times[-1] == (len(packets) - 1) * 1000
+    assert len(pooled.frames) == len(single.frames) == 11 and pooled.skipped == single.skipped
+    assert (pooled.points[LIDAR].xyz == single.points[LIDAR].xyz).all() and len(single.points[LIDAR]) == 10 * 6 * 96
+
+
+def test_no_interface(tmp_path):
+    path = str(tmp_path / 'capture')
+    packet = traffic()[0]
+    with open(path, 'wb') as f:
+        f.write(ng_block(0x0A0D0D0A, struct.pack('<IHHq', 0x1A2B3C4D, 1, 0, -1)))
+        f.write(ng_block(3, struct.pack('<I', len(packet)) + packet))
+        f.write(ng_packet(packet, 1))
+        f.write(ng_interface())
+        f.write(ng_packet(packet, 2))
+    assert [t for t, *_ in pcap.records(path)] == [2]
+
+
+def test_udp_payload():
+    packet = memoryview(ethernet(b'abc', 1, 2))
+    assert pcap.udp_payload(pcap.ETHERNET, packet)[:3] == (LIDAR.packed, 1, 2)
+    assert bytes(pcap.udp_payload(pcap.ETHERNET, packet)[3]) == b'abc'
+    assert bytes(pcap.udp_payload(101, packet[14:])[3]) == b'abc'
+    address = ipaddress.ip_address('fd00::1')
+    assert pcap.udp_payload(pcap.ETHERNET, memoryview(ethernet(b'abc', 1, 2, vlan=True, ipv6=True, address=address)))[:3] == (address.packed, 1, 2)
+    assert pcap.udp_payload(pcap.ETHERNET, packet[:-1]) is None
+    assert pcap.udp_payload(147, packet) is None
@@ -0,0 +1,90 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data, points
+from pylivox.control.frame import DeviceType
+from pylivox.scene import directions
+
+POINT_TYPES = [data.DataType0, data.DataType1, data.DataType2, data.DataType3,
+               data.DataType4, data.DataType5, data.DataType7, data.DataType8]
+
+
+def packets(data_type, count=3, timestamp=1000, period=400000):
+    block = data.PacketBlock(data_type, count).fill(timestamp, period)
+    angles = np.linspace(0, 1, count * data_type.N).reshape(count, data_type.N)
+    azimuth, zenith = angles, np.pi / 2 + angles / 4
+    depth = 5000 + np.arange(count * data_type.N).reshape(count, data_type.N) * 10
+    data.write_points(block.points, data_type, azimuth, zenith, depth, 77, 3)
+    return block, directions(azimuth, zenith) * depth[..., None] / 1000
+
+
+@pytest.mark.parametrize('data_type', POINT_TYPES)
+def test_decode(data_type):
+    block, expected = packets(data_type)
+    cloud = points.decode(block.buffer, DeviceType.HORIZON)
+    returns = points.point_count(data_type) // data_type.N
+    assert len(cloud) == 3 * data_type.N * returns
+    assert np.allclose(cloud.xyz, np.repeat(expected.reshape(-1, 3), returns, axis=0), atol=0.003)
+    assert (cloud.reflectivity == 77).all()
+    #basic types 0/1 have no tag
+    assert (cloud.tag == (0 if data_type.TYPE < 2 else 3)).all()
+    assert (cloud.return_index == np.tile(np.arange(returns), 3 * data_type.N)).all()
+    timestamps = 1000 + np.arange(3)[:, None] * 400000 + np.arange(data_type.N) * (1000000000 // 240000)
+    assert (cloud.timestamp == np.repeat(timestamps.ravel(), returns)).all()
+
+
+def test_decode_inputs():
+    block, _ = packets(data.DataType2)
+    expected = points.decode(block.buffer, point_rate=100000)
+    listed = points.decode([bytes(packet) for packet in block], point_rate=100000)
+    assert (listed.xyz == expected.xyz).all() and (listed.timestamp == expected.timestamp).all()
+    assert (points.decode(block[1]).timestamp == 1000 + 400000).all()
+    imu = data.PacketBlock(data.DataType6, 2).fill(7, 5, data.default_points(data.DataType6))
+    mixed = bytes(block[0]) + bytes(imu[0]) + bytes(block[1]) + bytes(imu[1])
+    cloud = points.decode(mixed)
+    assert len(cloud) == 2 * 96 and (cloud.xyz == expected.xyz[:2 * 96]).all()
+    assert len(points.decode(b'')) == 0
+    with pytest.raises(ValueError):
+        points.decode([bytes(block[0])[:-1]])
+
+
+def test_decode_imu():
+    imu = data.PacketBlock(data.DataType6, 2).fill(7, 5, data.default_points(data.DataType6))
+    block, _ = packets(data.DataType0, 1)
+    decoded = points.decode_imu([bytes(imu[0]), bytes(block[0]), bytes(imu[1])])
+    assert decoded['timestamp'].tolist() == [7, 12]
+    assert decoded['acc_z'].tolist() == [1, 1] and decoded['gyro_x'].tolist() == [0, 0]
+    assert len(points.decode_imu(block.buffer)) == 0
+
+
+def test_point_cloud():
+    cloud = points.PointCloud.empty(4)
+    cloud.xyz[...] = np.arange(12).reshape(4, 3)
+    cloud.timestamp[...] = np.arange(4)
+    head = cloud[:2]
+    assert head.xyz.base is cloud.xyz and len(head) == 2
+    assert cloud.x.tolist() == [0, 3, 6, 9] and cloud.z.tolist() == [2, 5, 8, 11]
+    selected = cloud[cloud.timestamp % 2 == 1]
+    assert selected.y.tolist() == [4, 10]
+    joined = points.PointCloud.concatenate([head, selected])
+    assert joined.timestamp.tolist() == [0, 1, 1, 3]
+    assert len(points.PointCloud.concatenate([])) == 0
+    built = points.PointCloud.from_columns(np.arange(12).reshape(4, 3), 7, [0, 1, 2, 3], np.arange(4))
+    assert (built.xyz == cloud.xyz).all() and built.xyz.dtype == np.float32
+    assert built.reflectivity.tolist() == [7] * 4 and built.tag.tolist() == [0, 1, 2, 3] and built.return_index.tolist() == [0] * 4
+
+
+def test_decode_mixed_same_length():
+    #return mode switch: single and dual return packets are both 1362 bytes
+    single, _ = packets(data.DataType2, 2)
+    dual, _ = packets(data.DataType4, 2, timestamp=5000)
+    mixed = bytes(single[0]) + bytes(dual[0]) + bytes(single[1]) + bytes(dual[1])
+    groups = points.split(mixed)
+    assert [(data_type, len(array)) for data_type, array in groups] == [(data.DataType2, 2), (data.DataType4, 2)]
+    cloud = points.decode(mixed, point_rate=1000000)
+    expected = points.decode(single.buffer, point_rate=1000000), points.decode(dual.buffer, point_rate=1000000)
+    assert len(cloud) == 2 * 96 + 2 * 96
+    for name in points.PointCloud.__slots__:
+        assert (getattr(cloud, name) == np.concatenate([getattr(part, name) for part in expected])).all()
+    assert cloud.return_index[2 * 96:].tolist() == [0, 1] * 96
@@ -0,0 +1,142 @@
+#std
+import time
+import struct
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data, replay
+from pylivox.data import TimestampType
+from pylivox.scene import Scene, Plane
+
+
+def write_packets(path, *blocks):
+    with open(path, 'wb') as f:
+        for block in blocks:
+            f.write(block.buffer)
+
+
+def test_load_csv(tmp_path):
+    path = tmp_path / 'mid40.csv'
+    path.write_text('time,azimuth,zenith\n0.0,0,90\n0.001,90,80\n0.002,359.5,100\n')
+    recording = replay.load_csv(str(path))
+    assert isinstance(recording, np.memmap) and recording.dtype == replay.RECORDING_DTYPE
+    assert recording['time'].tolist() == [0, 1000000, 2000000]
+    assert np.allclose(np.degrees(recording['azimuth']), [0, 90, 359.5])
+    assert np.allclose(np.degrees(recording['zenith']), [90, 80, 100])
+    assert (recording['depth'] == 0).all()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['mid40.csv', 'mid40.csv.npy']
+    assert (replay.load_csv(str(path), cache=False) == recording).all()
+    path = tmp_path / 'depth.csv'
+    path.write_text('time,azimuth,zenith,depth,reflectivity\n1.5,0,90,12.345,77\n')
+    recording = replay.load_csv(str(path), cache=False)
+    assert recording[['time', 'depth', 'reflectivity']].tolist() == [(1500000000, 12345, 77)]
+    path.write_text('time,azimuth\n1.5,0\n')
+    with pytest.raises(ValueError):
+        replay.load_csv(str(path), cache=False)
+
+
+def test_packet_index():
+    block = data.PacketBlock(data.DataType2, 5).fill(1000, 10)
+    offsets, times = replay.packet_index(block.buffer)
+    assert offsets.tolist() == [i * data.DataType2.PACKET_LENGTH for i in range(5)]
+    assert times.tolist() == [1000, 1010, 1020, 1030, 1040]
+    imu = data.PacketBlock(data.DataType6, 2).fill(1005, 20)
+    mixed = bytes(block[0]) + bytes(imu[0]) + bytes(block[1]) + bytes(imu[1])
+    offsets, times = replay.packet_index(mixed)
+    assert offsets.tolist() == [0, 1362, 1362 + 42, 2 * 1362 + 42]
+    assert times.tolist() == [1000, 1005, 1010, 1025]
+    with pytest.raises(ValueError):
+        replay.packet_index(mixed[:-1])
+    assert len(replay.packet_index(b'')[0]) == 0
+
+
+def test_replay_take():
+    r = replay.Replay(np.array([100, 110, 120, 130, 140, 150]), speed=2)
+    assert r.take(10) == slice(0, 2)
+    assert r.take(10) == slice(2, 4)
+    assert r.take(100) == slice(4, 6)
+    assert r.take(5) == slice(0, 1)
+    r = replay.Replay(np.arange(0, 100, 10), loop=False)
+    assert r.take(35, multiple=3) == slice(0, 3)
+    assert r.take(10, multiple=3) == slice(3, 3)
+    assert r.take(1000) == slice(3, 10)
+    assert r.is_done and r.take(1000) == slice(10, 10)
+    with pytest.raises(ValueError):
+        replay.Replay(np.arange(3), speed=0)
+    with pytest.raises(ValueError):
+        replay.Replay(np.arange(0))
+
+
+def test_packet_replay(tmp_path):
+    path = tmp_path / 'dump.bin'
+    block = data.PacketBlock(data.DataType2, 10).fill(0, 10000000, data.default_points(data.DataType2))
+    write_packets(path, block)
+    r = replay.PacketReplay(str(path), speed=2)
+    packets = r.packets(20000000)
+    assert len(packets) == 4
+    assert all(packet.obj is r._map for packet in packets)
+    assert [bytes(packet) for packet in packets] == [bytes(packet) for packet in block[:4]]
+    assert len(r.packets(1000000000)) == 6
+    #next pass is restamped one recording later
+    looped = r.packets(1)
+    assert r.loops == 1 and r.span == 100000000
+    assert bytes(looped[0][data.HEADER_LENGTH:]) == bytes(block[0])[data.HEADER_LENGTH:]
+    assert data.packet_index(bytes(looped[0]))[1].tolist() == [100000000]
+    del packets, looped
+    r.close()
+
+
+@pytest.mark.parametrize('timestamp_type', [TimestampType.NO_SYNC, TimestampType.GPS])
+def test_packet_replay_loop(tmp_path, monkeypatch, timestamp_type):
+    path = tmp_path / 'dump.bin'
+    start = 1760800000000000000 if timestamp_type is TimestampType.GPS else 0
+    monkeypatch.setattr(time, 'monotonic_ns', lambda: 0)
+    block = data.PacketBlock(data.DataType2, 4)
+    block.stamp(data.PacketClock(0, timestamp_type, start_ns=0, epoch_ns=start), np.arange(4) * 1000000, 4000000)
+    write_packets(path, block)
+    r = replay.PacketReplay(str(path), speed=1.5)
+    times = []
+    for _ in range(10):
+        packets = r.packets(3000000)
+        times += data.packet_index(b''.join(bytes(packet) for packet in packets))[1].tolist()
+        assert isinstance(r.position, int)
+    del packets
+    r.close()
+    assert times == [start + i * 1000000 for i in range(len(times))] and len(times) > 12
+
+
+def test_point_replay(monkeypatch):
+    recording = np.zeros(250, replay.RECORDING_DTYPE)
+    recording['time'] = np.arange(250) * 1000
+    recording['zenith'] = np.pi / 2
+    r = replay.PointReplay(recording, speed=1)
+    clock = data.PacketClock(0, start_ns=0, epoch_ns=0)
+    monkeypatch.setattr(time, 'monotonic_ns', lambda: 5000)
+    packets = r.packets(200000, clock, data.DataType0, Scene([Plane((4, 0, 0), (1, 0, 0), 90)]))
+    assert len(packets) == 2
+    header = struct.unpack_from('<BBBxIBBQ', packets[1])
+    assert header[5:] == (0, 5000 + 100000)
+    x, y, z, reflectivity = struct.unpack_from('<iiiB', packets[0], data.HEADER_LENGTH)
+    assert (x, y, z, reflectivity) == (4000, 0, 0, 90)
+    assert r.index == 200
+    #tail shorter than packet is dropped, then recording starts over
+    assert r.packets(100000, clock, data.DataType0) == []
+    assert r.index == 250
+    assert len(r.packets(100000, clock, data.DataType0)) == 1
+
+
+@pytest.mark.parametrize('speed', [1, 2, 0.5])
+def test_point_replay_stamps(monkeypatch, speed):
+    #epoch ns do not fit float64 exactly: spacing must survive restamping
+    epoch = int(np.datetime64('2025-10-18T12:00:00.123456789', 'ns').astype(np.int64))
+    recording = np.zeros(100 * 10, replay.RECORDING_DTYPE)
+    recording['time'] = epoch + np.repeat(np.arange(10) * 400032, 100)
+    recording['zenith'] = np.pi / 2
+    recording['depth'] = 1000
+    clock = data.PacketClock(0, TimestampType.PTP, start_ns=0, epoch_ns=epoch)
+    monkeypatch.setattr(time, 'monotonic_ns', lambda: 0)
+    packets = replay.PointReplay(recording, speed=speed).packets(int(10 * 400032 / speed), clock, data.DataType0)
+    header = np.frombuffer(b''.join(bytes(packet) for packet in packets), data.DataType0.PACKET_DTYPE)['header']
+    assert (header['timestamp_type'] == TimestampType.PTP.value).all()
+    assert data.timestamps_ns(header).tolist() == (epoch + np.rint(np.arange(10) * 400032 / speed).astype(np.int64)).tolist()
@@ -0,0 +1,73 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox.control.frame import DeviceType
+from pylivox.data import POINT_RATE
+from pylivox import scan
+
+
+@pytest.mark.parametrize('device_type, repetitive', list(scan.PATTERNS))
+def test_table(device_type, repetitive):
+    pattern = scan.pattern_for(device_type, repetitive)
+    table = scan.load_table(device_type, repetitive, None)
+    assert table.dtype == scan.SCAN_DTYPE
+    assert len(table) == int(POINT_RATE[device_type] * pattern.seconds)
+    horizontal = (table['azimuth'] + np.pi) % (2 * np.pi) - np.pi
+    vertical = np.pi / 2 - table['zenith']
+    assert np.abs(horizontal).max() <= np.radians(pattern.h_fov) / 2 + 1e-6
+    assert np.abs(vertical).max() <= np.radians(pattern.v_fov) / 2 + 1e-6
+    assert ((table['azimuth'] >= 0) & (table['azimuth'] < 2 * np.pi)).all()
+
+
+@pytest.mark.parametrize('device_type', [DeviceType.MID_40, DeviceType.HORIZON])
+def test_repetitive(device_type):
+    pattern = scan.pattern_for(device_type, True)
+    rate = POINT_RATE[device_type]
+    #next period starts where table starts
+    t = np.arange(2 * int(rate * pattern.seconds)) / rate
+    horizontal, vertical = pattern.directions(t)
+    half = len(t) // 2
+    assert np.allclose(horizontal[:half], horizontal[half:], atol=1e-6)
+    assert np.allclose(vertical[:half], vertical[half:], atol=1e-6)
+    assert not scan.pattern_for(device_type, False).key == pattern.key
+
+
+@pytest.mark.parametrize('device_type', [DeviceType.MID_40, DeviceType.HORIZON])
+def test_non_repetitive(device_type):
+    pattern = scan.pattern_for(device_type, False)
+    rate = POINT_RATE[device_type]
+    assert pattern.seconds == 30
+    table = scan.load_table(device_type, False, None)
+    #no seam: direction after last row is first row again, rows of later seconds differ from first one
+    horizontal, vertical = pattern.directions(np.array([0.0, len(table) / rate]))
+    assert np.allclose(horizontal[0], horizontal[1], atol=1e-6) and np.allclose(vertical[0], vertical[1], atol=1e-6)
+    assert not (table[rate:2 * rate] == table[:rate]).all()
+
+
+def test_cache(tmp_path):
+    table = scan.load_table(DeviceType.MID_40, True, str(tmp_path))
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1 and files[0].suffix == '.npy'
+    assert isinstance(table, np.memmap) and not table.flags.writeable
+    again = scan.load_table(DeviceType.MID_40, True, str(tmp_path))
+    assert (again == scan.load_table(DeviceType.MID_40, True, None)).all()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_unknown_device():
+    with pytest.raises(ValueError):
+        scan.pattern_for(DeviceType.HUB)
+
+
+def test_cursor():
+    table = np.arange(10)
+    cursor = scan.ScanCursor(table)
+    first = cursor.take(4)
+    assert first.base is table and list(first) == [0, 1, 2, 3]
+    assert list(cursor.take(4)) == [4, 5, 6, 7]
+    assert list(cursor.take(5)) == [8, 9, 0, 1, 2]
+    assert cursor.position == 3
+    assert list(cursor.take(25)) == list(range(3, 10)) + list(range(10)) * 1 + list(range(8))
+    with pytest.raises(ValueError):
+        scan.ScanCursor(table[:0])
@@ -0,0 +1,73 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import scene
+from pylivox.control.frame import DeviceType
+from pylivox.scan import load_table
+
+FORWARD = (0.0, np.pi / 2)
+LEFT = (np.pi / 2, np.pi / 2)
+DOWN = (0.0, np.pi)
+
+
+def cast(scene_, *angles):
+    azimuth, zenith = np.array(angles).T
+    return [list(values) for values in scene_.cast(azimuth, zenith)]
+
+
+def test_directions():
+    rays = scene.directions(np.array([0, np.pi / 2, 0]), np.array([np.pi / 2, np.pi / 2, 0]))
+    assert np.allclose(rays, np.eye(3)[[0, 1, 2]])
+
+
+@pytest.mark.parametrize('shape, angles, depth', [
+    (scene.Plane((5, 0, 0), (1, 0, 0)), FORWARD, 5000),
+    (scene.Plane((5, 0, 0), (-1, 0, 0)), LEFT, 0),
+    (scene.Ground(2), DOWN, 2000),
+    (scene.Ground(2), FORWARD, 0),
+    (scene.Sphere((10, 0, 0), 2), FORWARD, 8000),
+    (scene.Sphere((10, 0, 0), 2), LEFT, 0),
+    (scene.Sphere((0, 0, 0), 3), LEFT, 3000),
+    (scene.Box((4, -1, -1), (6, 1, 1)), FORWARD, 4000),
+    (scene.Box((4, -1, -1), (6, 1, 1)), LEFT, 0),
+    (scene.Box((-1, -1, -1), (1, 2, 1)), LEFT, 2000),
+])
+def test_shapes(shape, angles, depth):
+    depths, reflectivity = cast(scene.Scene([shape]), angles)
+    assert depths == [depth]
+    assert reflectivity == [shape.reflectivity if depth else 0]
+
+
+def test_nearest():
+    scene_ = scene.Scene([scene.Plane((20, 0, 0), (1, 0, 0), 10),
+                          scene.Sphere((10, 0, 0), 1, 200),
+                          scene.Ground(1, 30)], max_range=15)
+    depths, reflectivity = cast(scene_, FORWARD, DOWN, LEFT, (0.3, np.radians(95)))
+    assert depths == [9000, 1000, 0, round(1000 / np.sin(np.radians(5)))]
+    assert reflectivity == [200, 30, 0, 30]
+    depths, reflectivity = cast(scene.Scene(), FORWARD)
+    assert depths == [0] and reflectivity == [0]
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        scene.Sphere((1, 0, 0), 0)
+    with pytest.raises(ValueError):
+        scene.Box((1, 1, 1), (2, 0, 2))
+    with pytest.raises(ValueError):
+        scene.Plane((0, 0, 0), (0, 0, 0))
+    with pytest.raises(ValueError):
+        scene.Ground(reflectivity=256)
+
+
+def test_measure():
+    table = load_table(DeviceType.HORIZON, True, None)
+    scene_ = scene.default_scene()
+    measurements = scene_.measure(table)
+    assert measurements.dtype == scene.MEASUREMENT_DTYPE and len(measurements) == len(table)
+    depth, reflectivity = scene_.cast(table['azimuth'][:100], table['zenith'][:100])
+    assert (measurements['depth'][:100] == depth).all()
+    assert (measurements['reflectivity'][:100] == reflectivity).all()
+    assert set(np.unique(measurements['reflectivity'])) <= {0, 20, 60, 120, 200}
+    assert (measurements['depth'] > 0).mean() > 0.5
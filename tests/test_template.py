@@ -0,0 +1,42 @@
+#libs
+import pytest
+#proj
+from pylivox.control import general as g
+from pylivox.control import lidar
+from pylivox.control.frame import DeviceType
+from pylivox.control.template import FrameTemplate, TemplateCache
+from pylivox.control.utils import FrameFrom
+
+
+@pytest.mark.parametrize('seq', [0, 1, 0x1234, 0xFFFF])
+@pytest.mark.parametrize('state', list(g.WorkState.Lidar))
+def test_heartbeat_template(seq, state):
+    template = FrameTemplate(g.HeartbeatResponse(g.WorkState.Lidar.Standby, 0, 7, 0), fields=('work_state', ))
+    frame = g.HeartbeatResponse(state, 0, 7, seq)
+    assert bytes(template.render(seq, work_state=state)) == frame.frame
+    assert bytes(template.render(seq, work_state=state.value)) == frame.frame
+    assert FrameFrom(template.render(seq + 1 & 0xFFFF, work_state=state)).seq == seq + 1 & 0xFFFF
+
+
+def test_template_memo():
+    template = FrameTemplate(g.BroadcastMsg(g.Broadcast('12345678901234', 0x31), 0, DeviceType.MID_40))
+    first = bytes(template.render(0))
+    assert first == bytes(template.render(0))
+    assert bytes(template.render(5)) == g.BroadcastMsg(g.Broadcast('12345678901234', 0x31), 5, DeviceType.MID_40).frame
+
+
+def test_template_fields():
+    with pytest.raises(TypeError):
+        FrameTemplate(g.WriteConfigurationParameters([], 1), fields=('param_list', ))
+    with pytest.raises(ValueError):
+        FrameTemplate(g.HeartbeatResponse(g.WorkState.Lidar.Normal, 0, 0, 0), fields=('unknown', ))
+
+
+@pytest.mark.parametrize('frame_type', [g.HandshakeResponse, g.StartStopSamplingResponse, g.QueryDeviceInformationResponse,
+                                        lidar.SetTurnOnOffFanResponse, lidar.SetLidarReturnModeResponse])
+def test_cache_ack(frame_type):
+    cache = TemplateCache(DeviceType.HORIZON, (6, 4, 0, 0))
+    for seq in (3, 4, 4, 0):
+        expected = frame_type(seq, False, DeviceType.HORIZON, (6, 4, 0, 0)).frame
+        assert bytes(cache.ack(frame_type, seq)) == expected
+    assert frame_type in cache
@@ -0,0 +1,80 @@
+#std
+import time
+import struct
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox import data
+from pylivox.data import TimestampType
+
+EPOCH = int(np.datetime64('2024-02-29T13:59:59.999', 'ns').astype(np.int64))
+
+
+class FakeMonotonic:
+    def __init__(self, now:int=1000):
+        self.now = now
+
+    def __call__(self)->int:
+        return self.now
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    clock = FakeMonotonic()
+    monkeypatch.setattr(time, 'monotonic_ns', clock)
+    return clock
+
+
+@pytest.mark.parametrize('timestamp_type', [TimestampType.NO_SYNC, TimestampType.PTP, TimestampType.GPS])
+def test_round_trip(timestamp_type):
+    ns = EPOCH + np.arange(5) * 400000
+    header = np.zeros(5, data.HEADER_DTYPE)
+    header['timestamp_type'] = timestamp_type.value
+    data.encode_timestamps(ns, timestamp_type, header['timestamp'])
+    assert data.timestamps_ns(header).tolist() == ns.tolist()
+
+
+def test_encodings():
+    assert data.encode_timestamps([EPOCH], TimestampType.PTP).tolist() == [EPOCH]
+    assert data.encode_timestamps([EPOCH], TimestampType.PPS).tolist() == [999000000]
+    utc = data.encode_timestamps([EPOCH, EPOCH + 1000000], TimestampType.GPS).view(data.UTC_DTYPE)
+    assert utc.tolist() == [(24, 2, 29, 13, 3599999000), (24, 2, 29, 14, 0)]
+    assert int(data.encode_timestamps(EPOCH, TimestampType.PTP)) == EPOCH
+
+
+def test_clock_steps(monotonic):
+    clock = data.PacketClock(1000, TimestampType.PTP, epoch_ns=EPOCH)
+    assert clock.next(3).tolist() == [EPOCH, EPOCH + 1000, EPOCH + 2000]
+    #next block continues exactly although it is stamped a bit late
+    monotonic.now += 3500
+    assert clock.next(2).tolist() == [EPOCH + 3000, EPOCH + 4000]
+    #stream stalled longer than block: resync shows gap
+    monotonic.now += 100000
+    assert clock.next(2).tolist() == [EPOCH + 103500, EPOCH + 104500]
+    clock.timestamp_type = TimestampType.NO_SYNC
+    assert clock.next(1).tolist() == [105500]
+
+
+def test_clock_sync(monotonic):
+    clock = data.PacketClock(5000000, start_ns=0, epoch_ns=0)
+    monotonic.now = 10000
+    clock.sync(EPOCH, TimestampType.GPS)
+    assert clock.timestamp_type is TimestampType.GPS and clock.epoch_ns == EPOCH - 10000
+    utc = clock.next(2).view(data.UTC_DTYPE)
+    assert utc.tolist() == [(24, 2, 29, 13, 3599999000), (24, 2, 29, 14, 4000)]
+
+
+def test_block_stamp(monotonic):
+    block = data.PacketBlock(data.DataType2, 4)
+    clock = data.PacketClock(400000, TimestampType.PPS, start_ns=0, epoch_ns=EPOCH - 1000)
+    block.stamp(clock)
+    headers = [struct.unpack_from('<BBBxIBBQ', packet)[4:] for packet in block]
+    assert headers == [(TimestampType.PPS.value, 2, 999000000 + i * 400000) for i in range(3)] + [(4, 2, 200000)]
+
+
+def test_frame_header():
+    frame = data.Frame(timestamp=EPOCH, timestamp_type=TimestampType.GPS)
+    header = struct.unpack('<BBBxIBBQ', frame.header)
+    assert header[4:6] == (TimestampType.GPS.value, data.DataType1.TYPE)
+    assert np.array([header[6]], np.uint64).view(data.UTC_DTYPE).tolist() == [(24, 2, 29, 13, 3599999000)]
@@ -0,0 +1,57 @@
+#libs
+import numpy as np
+import pytest
+#proj
+from pylivox.points import PointCloud
+from pylivox.control import lidar
+from pylivox.control.utils import FrameFrom
+from pylivox.transform import Extrinsics, Fusion, transform
+
+
+@pytest.mark.parametrize('extrinsics, point, expected', [
+    (Extrinsics(), (1, 2, 3), (1, 2, 3)),
+    (Extrinsics(x=1000, y=-500, z=1500), (1, 0, 0), (2, -0.5, 1.5)),
+    (Extrinsics(yaw=90), (1, 0, 0), (0, 1, 0)),
+    (Extrinsics(pitch=90), (1, 0, 0), (0, 0, -1)),
+    (Extrinsics(roll=90), (0, 1, 0), (0, 0, 1)),
+    (Extrinsics(yaw=90, z=2000), (1, 0, 1), (0, 1, 3)),
+])
+def test_transform(extrinsics, point, expected):
+    xyz = np.array([point], np.float32)
+    assert np.allclose(transform(xyz, extrinsics.matrix), [expected], atol=1e-6)
+    transform(xyz, extrinsics.matrix, xyz)
+    assert np.allclose(xyz, [expected], atol=1e-6)
+
+
+def test_matrix_cache():
+    extrinsics = Extrinsics.from_frame(lidar.WriteLidarExtrinsicParameters(0, 0, 90, 1, 2, 3, 0))
+    matrix = extrinsics.matrix
+    assert extrinsics.matrix is matrix and not matrix.flags.writeable
+    extrinsics.yaw = 0
+    assert extrinsics.matrix is not matrix
+    assert np.allclose(extrinsics.matrix[:3, 3], [0.001, 0.002, 0.003])
+
+
+def test_fusion():
+    fusion = Fusion({'left': Extrinsics(y=1000), 'right': Extrinsics(y=-1000, yaw=180)}, 2)
+    fused = fusion.fuse({'right': PointCloud.from_columns([(1, 0, 0)] * 2, tag=2), 'left': PointCloud.from_columns([(1, 0, 0)], tag=1)})
+    assert np.allclose(fused.xyz, [(1, 1, 0), (-1, -1, 0), (-1, -1, 0)], atol=1e-6)
+    assert fused.tag.tolist() == [1, 2, 2] and fusion.source.tolist() == [0, 1, 1]
+    buffer = fused.xyz.base
+    again = fusion.fuse({'left': PointCloud.from_columns([(0, 0, 0)])})
+    assert again.xyz.base is buffer and again.xyz.tolist() == [[0, 1, 0]]
+    with pytest.raises(ValueError):
+        fusion.fuse({'front': PointCloud.from_columns([(0, 0, 0)])})
+
+
+@pytest.mark.parametrize('T, args', [
+    (lidar.WriteLidarExtrinsicParameters, (0, 0, 180, -1200, -500, 300, 1)),
+    (lidar.ReadLidarExtrinsicParametersResponse, (0, 0, 180, -1200, -500, 300, 1)),
+])
+def test_fusion_of_decoded_frame(T, args):
+    #rig offsets are signed mm on the wire
+    frame = FrameFrom(T(*args).frame)
+    assert type(frame) is T and (frame.x, frame.y, frame.z) == (-1200, -500, 300)
+    fusion = Fusion({'rear': Extrinsics.from_frame(frame), 'front': Extrinsics(x=1000)}, 4)
+    fused = fusion.fuse({'rear': PointCloud.from_columns([(1, 0, 0), (0, 2, 0)]), 'front': PointCloud.from_columns([(0, 0, 0)])})
+    assert np.allclose(fused.xyz, [(-2.2, -0.5, 0.3), (-1.2, -2.5, 0.3), (1, 0, 0)], atol=1e-6)